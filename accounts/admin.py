@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import Category, Event, Service, Workshop
+from .models import BackfillCheckpoint, Category, Event, Service, Workshop
 
 
 @admin.register(Category)
@@ -63,3 +63,11 @@ class EventAdmin(admin.ModelAdmin):
         """Return the first attendee considered as a client."""
         attendee = obj.attendees.select_related("user").first()
         return attendee.user if attendee else None
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    """Read-only view of backfill progress."""
+
+    list_display = ("name", "last_pk", "processed", "completed_at", "updated_at")
+    readonly_fields = ("name", "last_pk", "processed", "completed_at", "updated_at")
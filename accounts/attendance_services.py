@@ -0,0 +1,148 @@
+"""Services for joining and leaving group sessions.
+
+Events carry denormalised ``attendee_count``/``confirmed_count`` columns so the
+planner can display occupancy ("7/10") without loading attendee rows. Every
+change to the attendee list goes through this module, which keeps the counters
+in sync with single conditional ``UPDATE`` statements.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import User
+
+from .client_stats_services import record_booking, refresh_client_stats
+from .models import Event, EventAttendee
+from .portal_services import invalidate_client_portal
+
+
+def adjust_event_counters(
+    event_id: int, *, attendees: int = 0, confirmed: int = 0
+) -> None:
+    """Apply relative changes to the denormalised counters of an event."""
+    changes = {}
+    if attendees:
+        changes["attendee_count"] = F("attendee_count") + attendees
+    if confirmed:
+        changes["confirmed_count"] = F("confirmed_count") + confirmed
+    if changes:
+        Event.objects.filter(pk=event_id).update(**changes)
+
+
+def _attendee_count(extra_filter: Q) -> Coalesce:
+    return Coalesce(
+        Subquery(
+            EventAttendee.objects.filter(event=OuterRef("pk"))
+            .filter(extra_filter)
+            .order_by()
+            .values("event")
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def recount_event_counters(event_ids) -> None:
+    """Recompute the counters of ``event_ids`` from their attendees (one UPDATE).
+
+    Used after set-based attendee changes where relative adjustments would
+    need one statement per event.
+    """
+    Event.objects.filter(pk__in=event_ids).update(
+        attendee_count=_attendee_count(Q(is_waitlisted=False)),
+        confirmed_count=_attendee_count(Q(is_confirmed=True, is_waitlisted=False)),
+    )
+
+
+def _reserve_seat(event_id: int) -> bool:
+    """Atomically take a seat, returning False when the session is full.
+
+    The capacity check and the increment happen in the same ``UPDATE`` so two
+    concurrent bookings can never both take the last seat.
+    """
+    return bool(
+        Event.objects.filter(pk=event_id)
+        .filter(Q(capacity__isnull=True) | Q(attendee_count__lt=F("capacity")))
+        .update(attendee_count=F("attendee_count") + 1)
+    )
+
+
+def join_event(user: User, event_id, client_id):
+    """Register a client on an event owned by the user's calendar.
+
+    Returns (True, attendee) on success or (False, message) on failure. When
+    the session is full the attendee is created on the waitlist.
+    """
+    event = Event.objects.filter(pk=event_id, calendar__owner=user).first()
+    if not event:
+        return False, "Rendez-vous introuvable ou non autorisé."
+    client = User.objects.filter(
+        pk=client_id,
+        linked_professional=user,
+        user_type=User.UserType.INDIVIDUAL,
+    ).first()
+    if not client:
+        return False, "Client invalide."
+
+    with transaction.atomic():
+        if EventAttendee.objects.filter(event=event, user=client).exists():
+            return False, "Ce client est déjà inscrit à ce rendez-vous."
+        seated = _reserve_seat(event.pk)
+        attendee = EventAttendee.objects.create(
+            event=event, user=client, is_waitlisted=not seated
+        )
+        if seated and event.status != "canceled":
+            record_booking(user.pk, client.pk, event.start_at, event.price)
+        invalidate_client_portal([client.pk])
+    return True, attendee
+
+
+def remove_attendee(attendee: EventAttendee) -> None:
+    """Delete ``attendee`` and give its seat to the oldest waitlisted attendee.
+
+    Must run inside a transaction; the caller checks ownership.
+    """
+    event_id = attendee.event_id
+    attendee.delete()
+    invalidate_client_portal([attendee.user_id])
+    if attendee.is_waitlisted:
+        return
+    refresh_client_stats([attendee.user_id])
+
+    confirmed_delta = -1 if attendee.is_confirmed else 0
+    promoted = (
+        EventAttendee.objects.filter(event_id=event_id, is_waitlisted=True)
+        .order_by("created_at", "pk")
+        .first()
+    )
+    if promoted is None:
+        adjust_event_counters(event_id, attendees=-1, confirmed=confirmed_delta)
+        return
+
+    # The freed seat goes to the waitlist: attendee_count is unchanged.
+    EventAttendee.objects.filter(pk=promoted.pk).update(is_waitlisted=False)
+    refresh_client_stats([promoted.user_id])
+    invalidate_client_portal([promoted.user_id])
+    if promoted.is_confirmed:
+        confirmed_delta += 1
+    adjust_event_counters(event_id, confirmed=confirmed_delta)
+
+
+def leave_event(user: User, event_id, client_id) -> tuple[bool, str | None]:
+    """Remove a client from an event, promoting the oldest waitlisted attendee.
+
+    Returns (True, None) on success or (False, message) on failure.
+    """
+    with transaction.atomic():
+        attendee = EventAttendee.objects.filter(
+            event_id=event_id,
+            event__calendar__owner=user,
+            user_id=client_id,
+        ).first()
+        if not attendee:
+            return False, "Participant introuvable ou non autorisé."
+        remove_attendee(attendee)
+    return True, None
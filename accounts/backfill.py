@@ -0,0 +1,231 @@
+"""Chunked, resumable backfills for large tables.
+
+A backfill walks its queryset in primary-key order (keyset pagination, no
+OFFSET), processes each chunk in its own short transaction and stores the
+last processed key in ``BackfillCheckpoint``. Writers are only blocked for
+one chunk at a time, an optional pause between chunks leaves room for other
+requests, and an interrupted run resumes after the last committed chunk.
+
+Backfills are registered with ``register_backfill`` and run with
+``python manage.py run_backfill <name>``.
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from users.models import User, normalize_phone
+
+from .attendance_services import recount_event_counters
+from .client_stats_services import attendee_ids, refresh_client_stats
+from .models import BackfillCheckpoint, Event, Service
+
+DEFAULT_BACKFILL_CHUNK_SIZE = 1000
+
+
+class Backfill(ABC):
+    """Base class describing one backfill.
+
+    Subclasses set ``name`` and implement ``get_queryset`` and
+    ``process_chunk``. ``process_chunk`` receives the primary keys of the
+    chunk and should apply set-based writes limited to them. A subclass
+    missing either hook cannot be instantiated, so ``register_backfill``
+    fails at import time rather than halfway through a run.
+    """
+
+    name = ""
+    description = ""
+
+    @abstractmethod
+    def get_queryset(self) -> models.QuerySet:
+        """Return the rows to walk; ordering is forced to the primary key."""
+
+    @abstractmethod
+    def process_chunk(self, pks: list[int]) -> None:
+        """Apply the backfill to the rows whose primary key is in ``pks``."""
+
+
+BACKFILLS: dict[str, Backfill] = {}
+
+
+def register_backfill(backfill_class: type[Backfill]) -> type[Backfill]:
+    """Class decorator adding a backfill to ``BACKFILLS``."""
+    BACKFILLS[backfill_class.name] = backfill_class()
+    return backfill_class
+
+
+def run_backfill(
+    backfill: Backfill,
+    *,
+    chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE,
+    throttle: float = 0.0,
+    max_chunks: int | None = None,
+    reset: bool = False,
+    on_chunk: Callable[[BackfillCheckpoint], None] | None = None,
+) -> BackfillCheckpoint:
+    """Run ``backfill`` from its checkpoint and return the updated checkpoint.
+
+    Args:
+        backfill: The registered backfill to run.
+        chunk_size: Number of rows per chunk and transaction.
+        throttle: Seconds to sleep between chunks.
+        max_chunks: Stop after this many chunks (the run can be resumed).
+        reset: Restart from the first row instead of the checkpoint.
+        on_chunk: Called with the checkpoint after each committed chunk.
+    """
+    checkpoint, _ = BackfillCheckpoint.objects.get_or_create(name=backfill.name)
+    if reset:
+        checkpoint.last_pk = 0
+        checkpoint.processed = 0
+        checkpoint.completed_at = None
+        checkpoint.save()
+
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        with transaction.atomic():
+            pks = list(
+                backfill.get_queryset()
+                .filter(pk__gt=checkpoint.last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                checkpoint.completed_at = timezone.now()
+                checkpoint.save(update_fields=["completed_at", "updated_at"])
+                break
+            backfill.process_chunk(pks)
+            checkpoint.last_pk = pks[-1]
+            checkpoint.processed += len(pks)
+            checkpoint.completed_at = None
+            checkpoint.save(
+                update_fields=["last_pk", "processed", "completed_at", "updated_at"]
+            )
+        chunks += 1
+        if on_chunk is not None:
+            on_chunk(checkpoint)
+        if throttle:
+            time.sleep(throttle)
+    return checkpoint
+
+
+@register_backfill
+class EventAttendeeCountersBackfill(Backfill):
+    """Recompute ``attendee_count``/``confirmed_count`` from the attendees."""
+
+    name = "event_attendee_counters"
+    description = "Recalcule les compteurs de participants des rendez-vous."
+
+    def get_queryset(self) -> models.QuerySet:
+        """Walk every event."""
+        return Event.objects.all()
+
+    def process_chunk(self, pks: list[int]) -> None:
+        """Rewrite the counters of the chunk with one UPDATE."""
+        recount_event_counters(pks)
+
+
+@register_backfill
+class UserEmailLowercaseBackfill(Backfill):
+    """Lower-case stored emails so they equal their lookup key."""
+
+    name = "user_email_lowercase"
+    description = "Passe en minuscules les adresses e-mail enregistrées."
+
+    def get_queryset(self) -> models.QuerySet:
+        """Walk the users whose email still has upper-case letters.
+
+        Accounts sharing their lower-cased email with another account are
+        skipped: rewriting them would collide on the email column. They are
+        listed by ``report_duplicate_emails`` and must be merged first.
+        """
+        case_variants = (
+            User.objects.alias(email_lower=Lower("email"))
+            .filter(email_lower=Lower(OuterRef("email")))
+            .exclude(pk=OuterRef("pk"))
+        )
+        return (
+            User.objects.alias(email_lower=Lower("email"))
+            .exclude(email=F("email_lower"))
+            .exclude(Exists(case_variants))
+        )
+
+    def process_chunk(self, pks: list[int]) -> None:
+        """Rewrite the chunk's emails with one UPDATE."""
+        User.objects.filter(pk__in=pks).update(email=Lower("email"))
+
+
+@register_backfill
+class UserPhoneKeyBackfill(Backfill):
+    """Fill ``phone_key`` for users saved before it existed."""
+
+    name = "user_phone_keys"
+    description = "Calcule le numéro de téléphone normalisé des utilisateurs."
+
+    def get_queryset(self) -> models.QuerySet:
+        """Walk the users with a phone number but no key yet."""
+        return User.objects.exclude(phone_number="").filter(phone_key="")
+
+    def process_chunk(self, pks: list[int]) -> None:
+        """Normalise the chunk's numbers and write them with ``bulk_update``."""
+        users = list(User.objects.filter(pk__in=pks).only("phone_number"))
+        for user in users:
+            user.phone_key = normalize_phone(user.phone_number)
+        User.objects.bulk_update(users, ["phone_key"])
+
+
+@register_backfill
+class EventPriceBackfill(Backfill):
+    """Price the events booked before ``Event.price`` existed.
+
+    Events created from a service take its name as title, so the source is
+    the current price of the owner's service with that title (the oldest
+    one when several share the name). It is today's price, not necessarily
+    the one at booking time; events matching no priced service stay
+    unpriced and count for 0 in ``ClientStats.total_booked``. The clients of
+    each chunk get their aggregates recomputed.
+    """
+
+    name = "event_prices"
+    description = (
+        "Renseigne le prix des rendez-vous existants à partir de la prestation "
+        "du même nom et recalcule les totaux de leurs clients."
+    )
+
+    def get_queryset(self) -> models.QuerySet:
+        """Walk the events without a price."""
+        return Event.objects.filter(price__isnull=True)
+
+    def process_chunk(self, pks: list[int]) -> None:
+        """Copy the matching service prices with ``bulk_update``."""
+        events = list(
+            Event.objects.filter(pk__in=pks).values_list(
+                "pk", "calendar__owner_id", "title"
+            )
+        )
+        prices: dict[tuple[int, str], Decimal] = {}
+        for owner_id, name, price in (
+            Service.objects.filter(
+                created_by_id__in={owner_id for _, owner_id, _ in events},
+                name__in={title for _, _, title in events},
+                price__isnull=False,
+            )
+            .order_by("-pk")
+            .values_list("created_by_id", "name", "price")
+        ):
+            prices[(owner_id, name)] = price
+        priced = [
+            Event(pk=pk, price=prices[(owner_id, title)])
+            for pk, owner_id, title in events
+            if (owner_id, title) in prices
+        ]
+        if priced:
+            Event.objects.bulk_update(priced, ["price"])
+            refresh_client_stats(attendee_ids(event.pk for event in priced))
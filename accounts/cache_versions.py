@@ -0,0 +1,41 @@
+"""Version numbers shared by every worker for per-process caches.
+
+A worker caching data in its own memory (or in the default per-process
+cache) cannot see writes handled by another worker. Such caches tag each
+entry with the version read from ``CacheVersion`` and treat an entry whose
+version moved as stale. Writers bump the version in the transaction of the
+write itself: the bump commits or rolls back with the data it describes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db.models import F
+
+from .models import CacheVersion
+
+CACHE_VERSION_CHUNK_SIZE = 500
+
+
+def read_version(name: str) -> int:
+    """Return the current version of ``name``, 0 if it was never bumped."""
+    return (
+        CacheVersion.objects.filter(name=name).values_list("version", flat=True).first()
+        or 0
+    )
+
+
+def bump_versions(names: Iterable[str]) -> None:
+    """Move the version of every name in ``names`` forward.
+
+    Call it after the write it describes, inside the same transaction when
+    there is one.
+    """
+    pending = sorted(set(names))
+    for start in range(0, len(pending), CACHE_VERSION_CHUNK_SIZE):
+        chunk = pending[start : start + CACHE_VERSION_CHUNK_SIZE]
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(name=name) for name in chunk], ignore_conflicts=True
+        )
+        CacheVersion.objects.filter(name__in=chunk).update(version=F("version") + 1)
@@ -0,0 +1,97 @@
+"""Import a service catalogue from CSV.
+
+Rows are streamed in chunks: each chunk resolves (or creates) its categories
+and loads the matching services with one query apiece, validates every row
+with the ``ServiceForm`` rules, then writes with ``bulk_create`` and
+``bulk_update``. Services are matched on (created_by, name), so re-importing
+the same file updates prices and durations instead of duplicating rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from users.models import User
+
+from .csv_import import (
+    ChunkOutcome,
+    CsvRow,
+    ImportReport,
+    read_csv_rows,
+    run_chunked_import,
+)
+from .forms import ServiceBatchForm
+from .models import Category, Service
+from .services import SERVICE_BATCH_FIELDS
+
+CATALOGUE_REQUIRED_COLUMNS = ("name", "category")
+
+
+def _resolve_categories(names: set[str]) -> dict[str, Category]:
+    """Return categories keyed by name, creating the missing ones."""
+    names = {name for name in names if name and len(name) <= 100}
+    categories = {
+        category.name: category for category in Category.objects.filter(name__in=names)
+    }
+    missing = names - categories.keys()
+    if missing:
+        Category.objects.bulk_create(
+            [Category(name=name) for name in missing], ignore_conflicts=True
+        )
+        categories.update(
+            (category.name, category)
+            for category in Category.objects.filter(name__in=missing)
+        )
+    return categories
+
+
+def _import_chunk(user: User, chunk: list[CsvRow]) -> ChunkOutcome:
+    categories = _resolve_categories({row.get("category", "") for _, row in chunk})
+    categories_by_pk = {category.pk: category for category in categories.values()}
+    existing: dict[str, Service] = {}
+    for service in Service.objects.filter(
+        created_by=user, name__in={row.get("name", "") for _, row in chunk}
+    ).order_by("-pk"):
+        existing[service.name] = service
+
+    to_create: dict[str, Service] = {}
+    to_update: dict[str, Service] = {}
+    errors: list[dict] = []
+    for line, row in chunk:
+        name = row.get("name", "")
+        category = categories.get(row.get("category", ""))
+        data = {
+            "name": name,
+            "category": category.pk if category else "",
+            "price": row.get("price", "").replace(",", "."),
+            "duration_minutes": row.get("duration_minutes", ""),
+        }
+        instance = to_update.get(name) or to_create.get(name) or existing.get(name)
+        form = ServiceBatchForm(data, instance=instance, categories=categories_by_pk)
+        if not form.is_valid():
+            errors.append({"line": line, "errors": form.errors.get_json_data()})
+            continue
+        service = form.save(commit=False)
+        if service.pk:
+            to_update[service.name] = service
+        else:
+            service.created_by = user
+            to_create[service.name] = service
+
+    Service.objects.bulk_create(to_create.values())
+    Service.objects.bulk_update(to_update.values(), SERVICE_BATCH_FIELDS)
+    return ChunkOutcome(len(to_create), len(to_update), errors)
+
+
+def import_service_catalogue(user: User, lines: Iterable[str]) -> ImportReport:
+    """Create or update the user's services from CSV ``lines``.
+
+    The first line is a header naming at least ``name`` and ``category``;
+    ``price`` and ``duration_minutes`` are optional. Unknown categories are
+    created. Invalid rows are skipped and reported with their line number.
+
+    Raises:
+        ValueError: If the header lacks a required column.
+    """
+    rows = read_csv_rows(lines, CATALOGUE_REQUIRED_COLUMNS)
+    return run_chunked_import(rows, lambda chunk: _import_chunk(user, chunk))
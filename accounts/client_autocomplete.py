@@ -0,0 +1,135 @@
+"""In-memory prefix index answering client autocomplete without queries.
+
+Each worker keeps, per professional, a sorted array of normalised keys
+(first/last name in both orders, email, phone digits) searched with
+``bisect``. Each index carries the professional's ``CacheVersion``, bumped
+in the transaction of every change to their clients; a lookup reads the
+version (one primary-key query) and a worker whose index is older rebuilds
+it with one projected query. The version lives in the database, so a write
+handled by one worker invalidates the indexes of every worker.
+"""
+
+from __future__ import annotations
+
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from users.models import User
+
+from .cache_versions import bump_versions, read_version
+
+AUTOCOMPLETE_LIMIT = 10
+CLIENT_INDEX_MAX_PROFESSIONALS = 256
+_VERSION_NAME = "client-index:{}"
+
+_indexes: OrderedDict[int, tuple[int, ClientPrefixIndex]] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def normalize_search_text(value: str) -> str:
+    """Return ``value`` case-folded, without accents and with single spaces."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _digits(value: str) -> str:
+    return "".join(char for char in value or "" if char.isdigit())
+
+
+class ClientPrefixIndex:
+    """Sorted (key, client id) pairs supporting prefix lookups."""
+
+    def __init__(self, clients: Iterable[tuple[int, str, str, str, str]]):
+        """Index ``(id, first_name, last_name, email, phone_number)`` rows."""
+        entries: list[tuple[str, int]] = []
+        self.labels: dict[int, str] = {}
+        for client_id, first_name, last_name, email, phone in clients:
+            self.labels[client_id] = f"{first_name} {last_name}".strip() or email
+            keys = {
+                normalize_search_text(f"{first_name} {last_name}"),
+                normalize_search_text(f"{last_name} {first_name}"),
+                normalize_search_text(email),
+                _digits(phone),
+            }
+            entries.extend((key, client_id) for key in keys if key)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = [client_id for _, client_id in entries]
+
+    def __len__(self) -> int:
+        """Return the number of indexed clients."""
+        return len(self.labels)
+
+    def search(self, query: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[dict]:
+        """Return up to ``limit`` ``{"id", "label"}`` matches for ``query``."""
+        prefixes = [normalize_search_text(query)]
+        digits = _digits(query)
+        if digits and len(digits) >= len(query.replace(" ", "")) - 1:
+            prefixes.append(digits)
+        matches: dict[int, None] = {}
+        for prefix in filter(None, prefixes):
+            position = bisect_left(self._keys, prefix)
+            while (
+                len(matches) < limit
+                and position < len(self._keys)
+                and self._keys[position].startswith(prefix)
+            ):
+                matches.setdefault(self._ids[position])
+                position += 1
+        return [
+            {"id": client_id, "label": self.labels[client_id]} for client_id in matches
+        ]
+
+
+def invalidate_client_index(professional_id: int | None) -> None:
+    """Mark the professional's index stale in every worker.
+
+    Call it after the client write, inside its transaction when there is
+    one: a rolled-back write then leaves the version, and the indexes, as
+    they were.
+    """
+    if professional_id is None:
+        return
+    bump_versions([_VERSION_NAME.format(professional_id)])
+
+
+def client_index_version(professional_id: int) -> int:
+    """Return the version moved by every write to the professional's clients."""
+    return read_version(_VERSION_NAME.format(professional_id))
+
+
+def get_client_index(professional: User) -> ClientPrefixIndex:
+    """Return the worker's index for ``professional``, rebuilding if stale."""
+    # Read before the rows: an index built from rows committed after this
+    # read is only rebuilt once more, never kept stale.
+    version = client_index_version(professional.pk)
+    with _indexes_lock:
+        cached = _indexes.get(professional.pk)
+        if cached is not None and cached[0] == version:
+            _indexes.move_to_end(professional.pk)
+            return cached[1]
+
+    index = ClientPrefixIndex(
+        User.objects.filter(
+            linked_professional=professional,
+            user_type=User.UserType.INDIVIDUAL,
+            anonymized_at__isnull=True,
+        ).values_list("id", "first_name", "last_name", "email", "phone_number")
+    )
+    with _indexes_lock:
+        _indexes[professional.pk] = (version, index)
+        _indexes.move_to_end(professional.pk)
+        while len(_indexes) > CLIENT_INDEX_MAX_PROFESSIONALS:
+            _indexes.popitem(last=False)
+    return index
+
+
+def autocomplete_clients(
+    professional: User, query: str, limit: int = AUTOCOMPLETE_LIMIT
+) -> list[dict]:
+    """Return the professional's clients whose name, email or phone match."""
+    return get_client_index(professional).search(query, limit)
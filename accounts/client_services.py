@@ -1,13 +1,323 @@
-"""Services for client management (create/update/delete) used by views.
+"""Services for client management (list/create/update/delete) used by views.
 
 These keep business logic out of the views so handlers remain thin.
 """
 
-from django.utils.crypto import get_random_string
+import json
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import NamedTuple
 
-from users.models import User
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, F, FilteredRelation, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
-from .forms import ClientForm
+from users.models import User, email_key, normalize_phone
+
+from .attendance_services import remove_attendee
+from .client_autocomplete import invalidate_client_index
+from .csv_import import (
+    ChunkOutcome,
+    CsvRow,
+    ImportReport,
+    read_csv_rows,
+    run_chunked_import,
+)
+from .forms import ClientBatchForm, ClientForm
+from .models import Event, EventAttendee
+
+CLIENT_IMPORT_REQUIRED_COLUMNS = ("email",)
+CLIENT_PAGE_SIZE = 50
+CLIENT_LIST_ORDERING = ("last_name", "first_name", "id")
+# Client list orders: by name (default) or by one ClientStats aggregate,
+# largest first, clients without bookings last.
+CLIENT_LIST_SORTS = {
+    "name": "Nom",
+    "last_booking": "Dernier rendez-vous réservé",
+    "total_booked": "Total réservé",
+    "booking_count": "Rendez-vous réservés",
+}
+_AGGREGATE_SORT_FIELDS = {
+    "last_booking": "last_booking_at",
+    "total_booked": "total_booked",
+    "booking_count": "booking_count",
+}
+CLIENT_SEGMENTS = {
+    "": "Tous les clients",
+    "booked": "Avec des réservations",
+    "never": "Sans réservation",
+    "dormant": "Sans réservation récente",
+}
+CLIENT_DORMANT_DAYS = 90
+CLIENT_HISTORY_PAGE_SIZE = 20
+
+
+class ClientPage(NamedTuple):
+    """One page of the client list and the cursor of the following page."""
+
+    rows: list[dict]
+    next_cursor: str | None
+
+
+class AppointmentPage(NamedTuple):
+    """One page of a client's appointment history and the next cursor."""
+
+    rows: list[dict]
+    next_cursor: str | None
+
+
+def _pack_cursor(values: list) -> str:
+    return urlsafe_base64_encode(force_bytes(json.dumps(values)))
+
+
+def _unpack_cursor(cursor: str | None) -> list | None:
+    if not cursor:
+        return None
+    try:
+        values = json.loads(urlsafe_base64_decode(cursor))
+    except (TypeError, ValueError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _encode_cursor(row: dict, sort: str) -> str:
+    field = _AGGREGATE_SORT_FIELDS.get(sort)
+    if field is None:
+        return _pack_cursor([row[name] for name in CLIENT_LIST_ORDERING])
+    value = row[field]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    return _pack_cursor([sort, value, row["id"]])
+
+
+def _decode_cursor(cursor: str | None) -> tuple[str, str, int] | None:
+    values = _unpack_cursor(cursor)
+    if values is None or len(values) != 3:
+        return None
+    last_name, first_name, client_id = values
+    if not (
+        isinstance(last_name, str)
+        and isinstance(first_name, str)
+        and isinstance(client_id, int)
+    ):
+        return None
+    return last_name, first_name, client_id
+
+
+def _decode_aggregate_cursor(cursor: str | None, sort: str) -> tuple | None:
+    """Return (aggregate value or None, client id) of a cursor for ``sort``."""
+    values = _unpack_cursor(cursor)
+    if values is None or len(values) != 3 or values[0] != sort:
+        return None
+    _, value, client_id = values
+    if not isinstance(client_id, int):
+        return None
+    if value is None:
+        return None, client_id
+    try:
+        if sort == "last_booking":
+            return datetime.fromisoformat(value), client_id
+        if sort == "total_booked":
+            return Decimal(value), client_id
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+    return (value, client_id) if isinstance(value, int) else None
+
+
+def _client_row(values: dict) -> dict:
+    full_name = f"{values['first_name']} {values['last_name']}".strip()
+    return {
+        "id": values["id"],
+        "full_name": full_name or values["email"],
+        "email": values["email"],
+        "phone": values["phone_number"] or "—",
+        "activated": values["activated"],
+        "booking_count": values["booking_count"] or 0,
+        "last_booking_at": values["last_booking_at"],
+        "total_booked": values["total_booked"] or Decimal("0"),
+    }
+
+
+def _segment_filter(segment: str) -> Q:
+    if segment == "booked":
+        return Q(stats__booking_count__gt=0)
+    if segment == "never":
+        return Q(stats__booking_count__isnull=True) | Q(stats__booking_count=0)
+    if segment == "dormant":
+        since = timezone.now() - timedelta(days=CLIENT_DORMANT_DAYS)
+        return Q(stats__last_booking_at__lt=since)
+    return Q()
+
+
+def list_clients_page(
+    user: User,
+    *,
+    search: str = "",
+    cursor: str | None = None,
+    limit: int = CLIENT_PAGE_SIZE,
+    sort: str = "name",
+    segment: str = "",
+) -> ClientPage:
+    """Return one page of the clients linked to `user`.
+
+    Clients are ordered on (last_name, first_name, id) and paginated with a
+    keyset cursor, so every page costs the same single indexed query no
+    matter how deep it is. ``search`` keeps the clients whose first name,
+    last name or email starts with every whitespace-separated term.
+    ``istartswith`` compiles to ``LIKE`` on SQLite, which no index serves:
+    a search scans the professional's own clients (reached through the
+    ``linked_professional`` prefix of ``user_client_list_idx``), never the
+    whole user table. Typing-speed lookups go through the in-memory
+    ``client_autocomplete`` index instead. Only the displayed columns are
+    selected; the booking count, latest booking and booked total are read
+    from the client's ``ClientStats`` row. Clients anonymised by the
+    retention command are left out.
+
+    ``sort`` (a ``CLIENT_LIST_SORTS`` key) orders the page on one of those
+    aggregates instead, largest first, still with a keyset cursor; no index
+    covers that order, so each page sorts the professional's clients.
+    ``segment`` (a ``CLIENT_SEGMENTS`` key) keeps the clients with bookings,
+    without any, or whose latest booking is older than
+    ``CLIENT_DORMANT_DAYS``. Unknown values fall back to the defaults.
+    """
+    sort_field = _AGGREGATE_SORT_FIELDS.get(sort)
+    queryset = (
+        User.objects.filter(
+            linked_professional=user,
+            user_type=User.UserType.INDIVIDUAL,
+            anonymized_at__isnull=True,
+        )
+        .annotate(
+            activated=ExpressionWrapper(
+                ~Q(password__startswith=UNUSABLE_PASSWORD_PREFIX),
+                output_field=BooleanField(),
+            ),
+            stats=FilteredRelation(
+                "client_stats", condition=Q(client_stats__professional=user)
+            ),
+        )
+        .filter(_segment_filter(segment))
+    )
+    for term in search.split():
+        queryset = queryset.filter(
+            Q(first_name__istartswith=term)
+            | Q(last_name__istartswith=term)
+            | Q(email__istartswith=term)
+        )
+    if sort_field is None:
+        position = _decode_cursor(cursor)
+        if position is not None:
+            last_name, first_name, client_id = position
+            queryset = queryset.filter(
+                Q(last_name__gt=last_name)
+                | Q(last_name=last_name, first_name__gt=first_name)
+                | Q(last_name=last_name, first_name=first_name, id__gt=client_id)
+            )
+        queryset = queryset.order_by(*CLIENT_LIST_ORDERING)
+    else:
+        queryset = queryset.annotate(sort_value=F(f"stats__{sort_field}"))
+        aggregate_position = _decode_aggregate_cursor(cursor, sort)
+        if aggregate_position is not None:
+            value, client_id = aggregate_position
+            if value is None:
+                queryset = queryset.filter(sort_value__isnull=True, id__gt=client_id)
+            else:
+                queryset = queryset.filter(
+                    Q(sort_value__lt=value)
+                    | Q(sort_value=value, id__gt=client_id)
+                    | Q(sort_value__isnull=True)
+                )
+        queryset = queryset.order_by(F("sort_value").desc(nulls_last=True), "id")
+    values = list(
+        queryset.values(
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "phone_number",
+            "activated",
+            booking_count=F("stats__booking_count"),
+            last_booking_at=F("stats__last_booking_at"),
+            total_booked=F("stats__total_booked"),
+        )[: limit + 1]
+    )
+    next_cursor = (
+        _encode_cursor(values[limit - 1], sort) if len(values) > limit else None
+    )
+    return ClientPage([_client_row(row) for row in values[:limit]], next_cursor)
+
+
+def _decode_history_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    values = _unpack_cursor(cursor)
+    if values is None or len(values) != 2 or not isinstance(values[1], int):
+        return None
+    try:
+        start_at = datetime.fromisoformat(values[0])
+    except (TypeError, ValueError):
+        return None
+    return start_at, values[1]
+
+
+def list_client_appointments(
+    user: User,
+    client_id,
+    *,
+    cursor: str | None = None,
+    limit: int = CLIENT_HISTORY_PAGE_SIZE,
+    with_description: bool = False,
+) -> AppointmentPage | None:
+    """Return one page of a client's appointments, newest first.
+
+    Rows are read from ``EventAttendee`` through its user index and joined
+    to the events for their time and title; the event description is only
+    selected when ``with_description`` is set. Pages are keyed on (start,
+    event id) so they stay stable while appointments are added; the start
+    lives on ``Event``, so each page sorts the client's attendances, which
+    is cheap for one client's history. Only the
+    appointments in `user`'s calendars are listed: a client may also book
+    with other professionals.
+
+    Returns None when `client_id` is not one of `user`'s clients.
+    """
+    if not User.objects.filter(
+        pk=client_id, linked_professional=user, user_type=User.UserType.INDIVIDUAL
+    ).exists():
+        return None
+    queryset = EventAttendee.objects.filter(
+        user_id=client_id, event__calendar__owner=user
+    )
+    position = _decode_history_cursor(cursor)
+    if position is not None:
+        start_at, event_id = position
+        queryset = queryset.filter(
+            Q(event__start_at__lt=start_at)
+            | Q(event__start_at=start_at, event_id__lt=event_id)
+        )
+    fields = {
+        "title": F("event__title"),
+        "start_at": F("event__start_at"),
+        "end_at": F("event__end_at"),
+        "status": F("event__status"),
+    }
+    if with_description:
+        fields["description"] = F("event__description")
+    rows = list(
+        queryset.order_by("-event__start_at", "-event_id").values(
+            "event_id", "is_confirmed", "is_waitlisted", **fields
+        )[: limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _pack_cursor([last["start_at"].isoformat(), last["event_id"]])
+    return AppointmentPage(rows[:limit], next_cursor)
 
 
 def create_client(user: User, data) -> tuple[bool, User | ClientForm]:
@@ -29,8 +339,10 @@ def create_client(user: User, data) -> tuple[bool, User | ClientForm]:
         client = form.save(commit=False)
         client.user_type = User.UserType.INDIVIDUAL
         client.linked_professional = user
-        client.set_password(get_random_string(12))
+        # Clients choose their password through an invitation link.
+        client.set_unusable_password()
         client.save()
+        invalidate_client_index(user.pk)
         return True, client
 
     return False, form
@@ -59,6 +371,7 @@ def update_client(user: User, client_id, data) -> tuple[bool, object]:
     form = ClientForm(bound, instance=client)
     if form.is_valid():
         form.save()
+        invalidate_client_index(user.pk)
         return True, client
     return False, form
 
@@ -66,6 +379,9 @@ def update_client(user: User, client_id, data) -> tuple[bool, object]:
 def delete_client(user: User, client_id) -> tuple[bool, str | None]:
     """Delete a client linked to `user`.
 
+    The client's seats are released first through ``remove_attendee``, so
+    event counters stay right and group sessions promote their waitlist.
+
     Returns (True, None) on success, or (False, message) on failure.
     """
     client = User.objects.filter(
@@ -75,5 +391,111 @@ def delete_client(user: User, client_id) -> tuple[bool, str | None]:
     ).first()
     if not client:
         return False, "Client introuvable ou non autorisé."
-    client.delete()
+    with transaction.atomic():
+        for attendee in EventAttendee.objects.filter(user=client).order_by("pk"):
+            remove_attendee(attendee)
+        client.delete()
+    invalidate_client_index(user.pk)
     return True, None
+
+
+def _import_client_chunk(
+    user: User, chunk: list[CsvRow], taken_emails: set[str]
+) -> ChunkOutcome:
+    # Only this chunk's emails are checked, through the Lower(email) index.
+    emails = {email_key(row.get("email", "")) for _, row in chunk} - {""}
+    taken_emails.update(
+        User.objects.alias(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list(Lower("email"), flat=True)
+    )
+    clients: list[User] = []
+    errors: list[dict] = []
+    for line, row in chunk:
+        instance = User(user_type=User.UserType.INDIVIDUAL, linked_professional=user)
+        form = ClientBatchForm(row, instance=instance, taken_emails=taken_emails)
+        if not form.is_valid():
+            errors.append({"line": line, "errors": form.errors.get_json_data()})
+            continue
+        client = form.save(commit=False)
+        client.set_unusable_password()
+        client.phone_key = normalize_phone(client.phone_number)
+        taken_emails.add(client.email)
+        clients.append(client)
+    User.objects.bulk_create(clients)
+    return ChunkOutcome(len(clients), 0, errors)
+
+
+def import_clients(user: User, lines: Iterable[str]) -> ImportReport:
+    """Create clients linked to `user` from CSV ``lines``.
+
+    The header must name ``email``; ``first_name``, ``last_name`` and
+    ``phone_number`` are optional. Each chunk looks up its own emails in
+    one indexed query and rows are inserted with ``bulk_create``, skipping
+    the per-row ``full_clean`` of ``User.save``. Imported clients get an
+    unusable password.
+
+    Raises:
+        PermissionError: If `user` is not a professional.
+        ValueError: If the header lacks the ``email`` column.
+    """
+    if not getattr(user, "is_professional", False):
+        raise PermissionError(
+            "Vous devez être un professionnel pour importer des clients."
+        )
+    rows = read_csv_rows(lines, CLIENT_IMPORT_REQUIRED_COLUMNS)
+    taken_emails: set[str] = set()
+    report = run_chunked_import(
+        rows, lambda chunk: _import_client_chunk(user, chunk, taken_emails)
+    )
+    if report.created:
+        invalidate_client_index(user.pk)
+    return report
+
+
+def find_client_by_phone(user: User, phone: str) -> dict | None:
+    """Identify a caller among the clients of `user` from their number.
+
+    ``phone`` is normalised to E.164 and matched on the indexed
+    ``phone_key``; formatting differences (spaces, ``+33``/``0`` prefix)
+    do not matter. Returns the client and their next non-canceled
+    appointment in the calendars of `user`, or None when no client uses
+    this number.
+    """
+    key = normalize_phone(phone)
+    if not key:
+        return None
+    client = (
+        User.objects.filter(
+            linked_professional=user,
+            phone_key=key,
+            user_type=User.UserType.INDIVIDUAL,
+        )
+        .values("id", "first_name", "last_name", "email", "phone_number")
+        .order_by("id")
+        .first()
+    )
+    if client is None:
+        return None
+    appointment = (
+        Event.objects.filter(
+            calendar__owner=user,
+            attendees__user_id=client["id"],
+            attendees__is_waitlisted=False,
+            start_at__gte=timezone.now(),
+        )
+        .exclude(status="canceled")
+        .order_by("start_at")
+        .values("id", "title", "start_at", "end_at", "status")
+        .first()
+    )
+    full_name = f"{client['first_name']} {client['last_name']}".strip()
+    return {
+        "client": {
+            "id": client["id"],
+            "full_name": full_name or client["email"],
+            "email": client["email"],
+            "phone": client["phone_number"],
+        },
+        "next_appointment": appointment,
+    }
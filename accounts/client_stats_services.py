@@ -0,0 +1,138 @@
+"""Denormalised per-(professional, client) appointment aggregates.
+
+``ClientStats`` rows hold the number of booked appointments, the start of the
+latest one and the sum of their prices, so the client list can display them
+without aggregating events. A booking only counts while its
+event is not canceled and the attendee is not on the waitlist. Upcoming
+appointments are included: the fields count bookings, not past visits, so
+``last_booking_at`` may lie in the future.
+
+Booking a new appointment increments the row in place. Cancelling, deleting,
+moving or re-assigning appointments recomputes the rows of the touched
+clients with one grouped query. ``rebuild_client_stats`` recomputes everything
+with the same aggregation.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Max, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import ClientStats, EventAttendee
+
+CLIENT_STATS_CHUNK_SIZE = 500
+
+
+def _booked_attendances():
+    return EventAttendee.objects.filter(is_waitlisted=False).exclude(
+        event__status="canceled"
+    )
+
+
+def _aggregate(attendances) -> list[ClientStats]:
+    """Group ``attendances`` into unsaved ``ClientStats`` rows."""
+    rows = (
+        attendances.values("user_id", owner_id=F("event__calendar__owner_id"))
+        .annotate(
+            bookings=Count("pk"),
+            last_booking=Max("event__start_at"),
+            spent=Coalesce(
+                Sum("event__price"),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+        .order_by()
+    )
+    return [
+        ClientStats(
+            professional_id=row["owner_id"],
+            client_id=row["user_id"],
+            booking_count=row["bookings"],
+            last_booking_at=row["last_booking"],
+            total_booked=row["spent"],
+        )
+        for row in rows
+    ]
+
+
+def record_booking(
+    professional_id: int,
+    client_id: int,
+    start_at: datetime,
+    price: Decimal | None,
+) -> None:
+    """Add one booked appointment to the client's aggregates."""
+    changes = {
+        "booking_count": F("booking_count") + 1,
+        "total_booked": F("total_booked") + (price or Decimal("0")),
+        "last_booking_at": Greatest(
+            Coalesce("last_booking_at", Value(start_at)), Value(start_at)
+        ),
+    }
+    stats = ClientStats.objects.filter(
+        professional_id=professional_id, client_id=client_id
+    )
+    if stats.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ClientStats.objects.create(
+                professional_id=professional_id,
+                client_id=client_id,
+                booking_count=1,
+                last_booking_at=start_at,
+                total_booked=price or Decimal("0"),
+            )
+    except IntegrityError:
+        # Created concurrently since the UPDATE above: increment it instead.
+        stats.update(**changes)
+
+
+def refresh_client_stats(client_ids: Iterable[int]) -> None:
+    """Recompute the aggregates of ``client_ids`` from their attendances."""
+    client_ids = sorted(set(client_ids))
+    for start in range(0, len(client_ids), CLIENT_STATS_CHUNK_SIZE):
+        chunk = client_ids[start : start + CLIENT_STATS_CHUNK_SIZE]
+        with transaction.atomic():
+            ClientStats.objects.filter(client_id__in=chunk).delete()
+            ClientStats.objects.bulk_create(
+                _aggregate(_booked_attendances().filter(user_id__in=chunk))
+            )
+
+
+def attendee_ids(event_ids: Iterable[int]) -> set[int]:
+    """Return the users attending any of ``event_ids``.
+
+    Call before deleting or cancelling events, then pass the result to
+    ``refresh_client_stats``.
+    """
+    event_ids = list(event_ids)
+    users: set[int] = set()
+    for start in range(0, len(event_ids), CLIENT_STATS_CHUNK_SIZE):
+        users.update(
+            EventAttendee.objects.filter(
+                event_id__in=event_ids[start : start + CLIENT_STATS_CHUNK_SIZE]
+            ).values_list("user_id", flat=True)
+        )
+    return users
+
+
+def rebuild_client_stats(professional_id: int | None = None) -> int:
+    """Recompute every aggregate (of one professional) and return the row count."""
+    attendances = _booked_attendances()
+    existing = ClientStats.objects.all()
+    if professional_id is not None:
+        attendances = attendances.filter(event__calendar__owner_id=professional_id)
+        existing = existing.filter(professional_id=professional_id)
+    with transaction.atomic():
+        existing.delete()
+        rows = ClientStats.objects.bulk_create(
+            _aggregate(attendances), batch_size=CLIENT_STATS_CHUNK_SIZE
+        )
+    return len(rows)
@@ -0,0 +1,232 @@
+"""Signed links letting clients confirm or cancel an appointment.
+
+A link carries the attendee, its event and the action, signed with Django's
+``signing`` (salted and timestamped): no row is stored per link, and a link
+expires after ``CONFIRMATION_LINK_MAX_AGE`` or once the appointment has
+started.
+
+Clicks are not applied one by one. The link page only inserts the verified
+response as an ``AttendanceResponse`` row, a single small write shared by
+every worker; nothing else runs in the request. The pending rows are
+applied outside the HTTP path by
+``python manage.py flush_attendance_responses`` run from cron, in one
+transaction per batch: one ``UPDATE`` per chunk of confirmations plus one
+counter recount, and the cancellations; the applied rows are deleted in the
+same transaction. With ``--if-due`` the command only flushes once
+``RESPONSE_FLUSH_SIZE`` rows are pending or the oldest has waited
+``RESPONSE_FLUSH_INTERVAL`` seconds. Applying a response twice has no
+effect, so concurrent flushes are harmless.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core import signing
+from django.db import transaction
+from django.db.models import Count, Min
+from django.urls import reverse
+from django.utils import timezone
+
+from .attendance_services import recount_event_counters, remove_attendee
+from .client_stats_services import refresh_client_stats
+from .models import AttendanceResponse, Event, EventAttendee
+from .portal_services import invalidate_client_portal
+
+ACTION_CONFIRM = "confirm"
+ACTION_CANCEL = "cancel"
+CONFIRMATION_LINK_MAX_AGE = 60 * 60 * 24 * 30
+RESPONSE_FLUSH_SIZE = 200
+RESPONSE_FLUSH_INTERVAL = 60
+RESPONSE_CHUNK_SIZE = 500
+_SALT = "accounts.attendance-response"
+
+Response = tuple[int, int, str]
+
+
+@dataclass
+class ResponseReport:
+    """Outcome of applying stored responses."""
+
+    confirmed: int = 0
+    canceled: int = 0
+    ignored: int = 0
+
+
+def make_response_token(attendee_id: int, event_id: int, action: str) -> str:
+    """Return the signed token of one confirmation or cancellation link."""
+    return signing.dumps([attendee_id, event_id, action], salt=_SALT, compress=True)
+
+
+def attendance_links(attendee_id: int, event_id: int) -> dict[str, str]:
+    """Return the relative confirmation and cancellation URLs of an attendee."""
+    return {
+        action: reverse(
+            "attendance_response",
+            args=[make_response_token(attendee_id, event_id, action)],
+        )
+        for action in (ACTION_CONFIRM, ACTION_CANCEL)
+    }
+
+
+def read_response_token(token: str) -> Response | None:
+    """Return (attendee id, event id, action) of a valid token, else None."""
+    try:
+        attendee_id, event_id, action = signing.loads(
+            token, salt=_SALT, max_age=CONFIRMATION_LINK_MAX_AGE
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    if action not in (ACTION_CONFIRM, ACTION_CANCEL):
+        return None
+    return int(attendee_id), int(event_id), action
+
+
+def resolve_response(token: str) -> tuple[Response, EventAttendee] | None:
+    """Return the response of a valid link and its upcoming appointment."""
+    response = read_response_token(token)
+    if response is None:
+        return None
+    attendee = (
+        EventAttendee.objects.select_related("event", "event__calendar__owner")
+        .filter(
+            pk=response[0], event_id=response[1], event__start_at__gt=timezone.now()
+        )
+        .first()
+    )
+    if attendee is None:
+        return None
+    return response, attendee
+
+
+def queue_response(response: Response) -> None:
+    """Store a verified response; it is applied by the next flush."""
+    attendee_id, event_id, action = response
+    AttendanceResponse.objects.create(
+        attendee_id=attendee_id, event_id=event_id, action=action
+    )
+
+
+def responses_due() -> bool:
+    """Return whether the pending responses are due a flush.
+
+    The table may have been emptied by a concurrent flush, in which case
+    there is no oldest row and nothing is due.
+    """
+    pending = AttendanceResponse.objects.aggregate(
+        count=Count("pk"), oldest=Min("created_at")
+    )
+    if pending["oldest"] is None:
+        return False
+    due_at = timezone.now() - timedelta(seconds=RESPONSE_FLUSH_INTERVAL)
+    return pending["count"] >= RESPONSE_FLUSH_SIZE or pending["oldest"] <= due_at
+
+
+def _confirm(pairs: list[tuple[int, int]], report: ResponseReport) -> None:
+    now = timezone.now()
+    for start in range(0, len(pairs), RESPONSE_CHUNK_SIZE):
+        chunk = pairs[start : start + RESPONSE_CHUNK_SIZE]
+        expected = set(chunk)
+        rows = [
+            row
+            for row in EventAttendee.objects.filter(
+                pk__in=[attendee_id for attendee_id, _ in chunk],
+                is_confirmed=False,
+                event__start_at__gt=now,
+            )
+            .exclude(event__status="canceled")
+            .values_list("pk", "event_id", "user_id")
+            if (row[0], row[1]) in expected
+        ]
+        if rows:
+            report.confirmed += EventAttendee.objects.filter(
+                pk__in=[pk for pk, _, _ in rows]
+            ).update(is_confirmed=True)
+            recount_event_counters({event_id for _, event_id, _ in rows})
+            invalidate_client_portal(user_id for _, _, user_id in rows)
+        report.ignored += len(chunk) - len(rows)
+
+
+def _cancel(pairs: list[tuple[int, int]], report: ResponseReport) -> None:
+    now = timezone.now()
+    for start in range(0, len(pairs), RESPONSE_CHUNK_SIZE):
+        chunk = pairs[start : start + RESPONSE_CHUNK_SIZE]
+        expected = set(chunk)
+        attendees = [
+            attendee
+            for attendee in EventAttendee.objects.filter(
+                pk__in=[attendee_id for attendee_id, _ in chunk],
+                event__start_at__gt=now,
+            )
+            .exclude(event__status="canceled")
+            .select_related("event")
+            if (attendee.pk, attendee.event_id) in expected
+        ]
+        # A one-to-one appointment is cancelled as a whole with one UPDATE; a
+        # seat in a group session is freed for the waitlist.
+        single = [attendee for attendee in attendees if attendee.event.capacity is None]
+        if single:
+            clients = [attendee.user_id for attendee in single]
+            Event.objects.filter(
+                pk__in=[attendee.event_id for attendee in single]
+            ).update(status="canceled", updated_at=now)
+            refresh_client_stats(clients)
+            invalidate_client_portal(clients)
+        for attendee in attendees:
+            if attendee.event.capacity is not None:
+                remove_attendee(attendee)
+        report.canceled += len(attendees)
+        report.ignored += len(chunk) - len(attendees)
+
+
+def apply_responses(responses: Iterable[Response]) -> ResponseReport:
+    """Apply confirmations and cancellations in one transaction.
+
+    The last response of an attendee wins. Responses for missing attendees,
+    past or canceled appointments, or already confirmed seats are ignored.
+    """
+    latest = {
+        (attendee_id, event_id): action for attendee_id, event_id, action in responses
+    }
+    report = ResponseReport()
+    with transaction.atomic():
+        _confirm(
+            [pair for pair, action in latest.items() if action == ACTION_CONFIRM],
+            report,
+        )
+        _cancel(
+            [pair for pair, action in latest.items() if action == ACTION_CANCEL],
+            report,
+        )
+    return report
+
+
+def flush_responses() -> ResponseReport:
+    """Apply and delete every pending response, oldest first, in batches."""
+    report = ResponseReport()
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                AttendanceResponse.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "attendee_id", "event_id", "action")[
+                    :RESPONSE_FLUSH_SIZE
+                ]
+            )
+            if not rows:
+                break
+            batch = apply_responses(
+                (attendee_id, event_id, action)
+                for _, attendee_id, event_id, action in rows
+            )
+            AttendanceResponse.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        report.confirmed += batch.confirmed
+        report.canceled += batch.canceled
+        report.ignored += batch.ignored
+        if len(rows) < RESPONSE_FLUSH_SIZE:
+            break
+        last_pk = rows[-1][0]
+    return report
@@ -0,0 +1,125 @@
+"""Shared plumbing for streaming CSV imports.
+
+Importers read rows lazily with ``read_csv_rows`` and hand a chunk handler
+to ``run_chunked_import``, which applies each chunk in its own transaction
+and aggregates a bounded error report. A file that stops decoding or
+parsing part-way ends the import; the chunks already written stay
+committed and the report says how many rows they held.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import NamedTuple
+
+from django.db import transaction
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+CsvRow = tuple[int, dict[str, str]]
+
+
+class ImportReport(NamedTuple):
+    """Outcome of a CSV import."""
+
+    created: int
+    updated: int
+    errors: list[dict]
+    error_count: int
+    error: str = ""
+
+    def as_json(self) -> dict:
+        """Return the report as a JSON-serialisable mapping."""
+        data = self._asdict()
+        if not self.error:
+            del data["error"]
+        return data
+
+
+class ChunkOutcome(NamedTuple):
+    """What a chunk handler wrote and which lines it rejected."""
+
+    created: int
+    updated: int
+    errors: list[dict]
+
+
+def _detect_delimiter(header: str) -> str:
+    # Spreadsheets configured in French export with semicolons.
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def read_csv_rows(
+    lines: Iterable[str], required_columns: Iterable[str]
+) -> Iterator[CsvRow]:
+    """Yield (line number, row) pairs keyed by lower-cased column names.
+
+    Blank lines are skipped. The header is checked before the first row is
+    yielded.
+
+    Raises:
+        ValueError: If the header lacks one of ``required_columns``.
+    """
+    lines = iter(lines)
+    header = next(lines, "")
+    delimiter = _detect_delimiter(header)
+    columns = [
+        column.strip().lower()
+        for column in next(csv.reader([header], delimiter=delimiter), [])
+    ]
+    missing = [column for column in required_columns if column not in columns]
+    if missing:
+        raise ValueError(
+            "Colonnes manquantes dans le fichier : " + ", ".join(missing) + "."
+        )
+    reader = csv.reader(lines, delimiter=delimiter)
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield (
+            reader.line_num + 1,
+            {
+                column: (values[position].strip() if position < len(values) else "")
+                for position, column in enumerate(columns)
+            },
+        )
+
+
+def run_chunked_import(
+    rows: Iterator[CsvRow],
+    handle_chunk: Callable[[list[CsvRow]], ChunkOutcome],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportReport:
+    """Feed ``rows`` to ``handle_chunk`` in transactional chunks.
+
+    When the file cannot be decoded or parsed, the import stops at the
+    chunk being read and the returned report carries the reason in
+    ``error`` along with the counts of the chunks already committed.
+
+    Raises:
+        ValueError: If the header lacks a required column.
+    """
+    created = updated = error_count = 0
+    errors: list[dict] = []
+    while True:
+        try:
+            chunk = list(islice(rows, chunk_size))
+        except UnicodeDecodeError:
+            failure = "Le fichier doit être encodé en UTF-8."
+            break
+        except csv.Error as exc:
+            failure = f"Le fichier CSV est mal formé ({exc})."
+            break
+        if not chunk:
+            failure = ""
+            break
+        with transaction.atomic():
+            outcome = handle_chunk(chunk)
+        created += outcome.created
+        updated += outcome.updated
+        error_count += len(outcome.errors)
+        errors.extend(outcome.errors[: IMPORT_MAX_REPORTED_ERRORS - len(errors)])
+    return ImportReport(created, updated, errors, error_count, failure)
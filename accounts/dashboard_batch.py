@@ -0,0 +1,165 @@
+"""Run several dashboard commands in a single transaction.
+
+Actions use the names of ``DASHBOARD_COMMANDS``. Consecutive service edits
+(add/update/delete) are applied set-based: the referenced rows are preloaded
+once and written with ``bulk_create``/``bulk_update``/one ``DELETE``. Other
+actions fall back to their regular command. If any action fails the whole
+batch is rolled back.
+"""
+
+from __future__ import annotations
+
+from itertools import groupby
+
+from django.db import transaction
+
+from users.models import User
+
+from .dashboard_commands import DASHBOARD_COMMANDS, CommandResult
+from .forms import ServiceBatchForm
+from .models import Category, Service
+from .services import SERVICE_BATCH_FIELDS
+
+BATCH_MAX_ACTIONS = 500
+# Commands with side effects a rolled-back batch cannot undo (emails).
+BATCH_EXCLUDED_ACTIONS = {"invite_client"}
+
+
+class _BatchRollback(Exception):
+    """Raised inside the batch transaction to undo every action."""
+
+
+def _safe_int(value) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _preload_categories(items: list[dict]) -> dict[int, Category]:
+    category_ids = {_safe_int(item.get("category")) for item in items}
+    return Category.objects.in_bulk([pk for pk in category_ids if pk is not None])
+
+
+def _preload_owned_services(user: User, items: list[dict]) -> dict[int, Service]:
+    service_ids = {_safe_int(item.get("service_id")) for item in items}
+    return Service.objects.filter(created_by=user).in_bulk(
+        [pk for pk in service_ids if pk is not None]
+    )
+
+
+def _batch_add_services(user: User, items: list[dict]) -> list[CommandResult]:
+    categories = _preload_categories(items)
+    results: list[CommandResult] = []
+    pending: list[Service] = []
+    for item in items:
+        form = ServiceBatchForm(item, categories=categories)
+        if not form.is_valid():
+            results.append(
+                CommandResult(False, "services", errors=form.errors.get_json_data())
+            )
+            continue
+        service = form.save(commit=False)
+        service.created_by = user
+        pending.append(service)
+        results.append(CommandResult(True, "services"))
+    created = iter(Service.objects.bulk_create(pending))
+    return [
+        result._replace(data={"id": next(created).pk}) if result.success else result
+        for result in results
+    ]
+
+
+def _batch_update_services(user: User, items: list[dict]) -> list[CommandResult]:
+    services = _preload_owned_services(user, items)
+    categories = _preload_categories(items)
+    results: list[CommandResult] = []
+    pending: dict[int, Service] = {}
+    for item in items:
+        service = services.get(_safe_int(item.get("service_id")) or 0)
+        if service is None:
+            results.append(
+                CommandResult(False, "services", message="Prestation introuvable.")
+            )
+            continue
+        form = ServiceBatchForm(item, instance=service, categories=categories)
+        if not form.is_valid():
+            results.append(
+                CommandResult(False, "services", errors=form.errors.get_json_data())
+            )
+            continue
+        pending[service.pk] = form.save(commit=False)
+        results.append(CommandResult(True, "services", data={"id": service.pk}))
+    Service.objects.bulk_update(list(pending.values()), SERVICE_BATCH_FIELDS)
+    return results
+
+
+def _batch_delete_services(user: User, items: list[dict]) -> list[CommandResult]:
+    services = _preload_owned_services(user, items)
+    Service.objects.filter(pk__in=list(services)).delete()
+    return [
+        CommandResult(True, "services", data={"id": service_id})
+        if (service_id := _safe_int(item.get("service_id"))) in services
+        else CommandResult(False, "services", message="Prestation introuvable.")
+        for item in items
+    ]
+
+
+SET_BASED_HANDLERS = {
+    "add_service": _batch_add_services,
+    "update_service": _batch_update_services,
+    "delete_service": _batch_delete_services,
+}
+
+
+def _run_group(user: User, action: str, items: list[dict]) -> list[CommandResult]:
+    handler = SET_BASED_HANDLERS.get(action)
+    if handler is not None:
+        return handler(user, items)
+    command = DASHBOARD_COMMANDS[action]
+    return [command(user, item) for item in items]
+
+
+def run_dashboard_batch(user: User, actions: list[dict]) -> tuple[bool, list[dict]]:
+    """Execute ``actions`` atomically and return (committed, per-action results).
+
+    Each action is a mapping with an ``action`` key naming a dashboard
+    command plus that command's fields. Results keep the order of
+    ``actions``; when ``committed`` is False nothing was persisted.
+    """
+    for index, item in enumerate(actions):
+        if not isinstance(item, dict) or item.get("action") not in DASHBOARD_COMMANDS:
+            return False, [
+                {
+                    "index": index,
+                    "success": False,
+                    "message": "Action inconnue.",
+                }
+            ]
+        if item["action"] in BATCH_EXCLUDED_ACTIONS:
+            return False, [
+                {
+                    "index": index,
+                    "success": False,
+                    "message": "Cette action ne peut pas être envoyée dans un lot.",
+                }
+            ]
+
+    results: list[dict] = []
+    try:
+        with transaction.atomic():
+            for action, group in groupby(actions, key=lambda item: item["action"]):
+                items = list(group)
+                for item_result in _run_group(user, action, items):
+                    results.append(
+                        {
+                            "index": len(results),
+                            "action": action,
+                            **item_result.as_json(),
+                        }
+                    )
+            if not all(result["success"] for result in results):
+                raise _BatchRollback
+    except _BatchRollback:
+        return False, results
+    return True, results
@@ -0,0 +1,285 @@
+"""Dashboard actions exposed as commands returning structured results.
+
+Each dashboard action has exactly one command here. The HTML dashboard turns
+a ``CommandResult`` into a redirect (or a re-rendered modal), the JSON
+endpoint into a payload plus the refreshed fragment of the affected section,
+and batches run several commands in one transaction.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from django.contrib import messages
+
+from users.models import User
+
+from .attendance_services import join_event, leave_event
+from .client_services import create_client, delete_client, update_client
+from .event_services import create_event, delete_event
+from .forms import AttendeeForm, CategoryForm, EventForm, ServiceForm
+from .invitation_services import send_client_invitation
+from .models import Service
+from .services import (
+    delete_service,
+    prepare_service_form,
+    save_category_form,
+    save_service_form,
+)
+from .utils import ensure_user_calendar
+
+
+class CommandResult(NamedTuple):
+    """Outcome of a dashboard command."""
+
+    success: bool
+    section: str
+    message: str = ""
+    errors: dict[str, Any] | None = None
+    data: dict[str, Any] | None = None
+    # For the HTML dashboard only: message level and the bound form to
+    # re-display in its modal.
+    level: int = messages.SUCCESS
+    form: Any = None
+
+    def as_json(self) -> dict[str, Any]:
+        """Return the result as a JSON-serialisable mapping."""
+        return {
+            "success": self.success,
+            "section": self.section,
+            "message": self.message,
+            "errors": self.errors or {},
+            "data": self.data or {},
+        }
+
+
+def _safe_int(value) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _form_failure(section: str, form, message: str = "") -> CommandResult:
+    return CommandResult(
+        False, section, message=message, errors=form.errors.get_json_data(), form=form
+    )
+
+
+def _owned_service_id(user: User, data) -> int | None:
+    service_id = _safe_int(data.get("service_id"))
+    if service_id and Service.objects.filter(pk=service_id, created_by=user).exists():
+        return service_id
+    return None
+
+
+def _require_professional(user: User, section: str) -> CommandResult | None:
+    if getattr(user, "is_professional", False):
+        return None
+    return CommandResult(
+        False,
+        section,
+        message="Vous devez être un professionnel pour effectuer cette action.",
+    )
+
+
+def run_add_category(user: User, data) -> CommandResult:
+    """Create a category."""
+    success, form = save_category_form(CategoryForm(data))
+    if not success:
+        return _form_failure("services", form)
+    category = form.instance
+    return CommandResult(
+        True, "services", data={"id": category.pk, "name": category.name}
+    )
+
+
+def run_add_service(user: User, data) -> CommandResult:
+    """Create a service owned by the user."""
+    success, form = save_service_form(ServiceForm(data), user=user)
+    if not success:
+        return _form_failure("services", form)
+    return CommandResult(True, "services", data={"id": form.instance.pk})
+
+
+def run_update_service(user: User, data) -> CommandResult:
+    """Update one of the user's services."""
+    service_id = _owned_service_id(user, data)
+    if service_id is None:
+        return CommandResult(False, "services", message="Prestation introuvable.")
+    form, _ = prepare_service_form(service_id, data=data)
+    success, form = save_service_form(form)
+    if not success:
+        return _form_failure("services", form)
+    return CommandResult(True, "services", data={"id": service_id})
+
+
+def run_delete_service(user: User, data) -> CommandResult:
+    """Delete one of the user's services."""
+    service_id = _owned_service_id(user, data)
+    if service_id is None:
+        return CommandResult(False, "services", message="Prestation introuvable.")
+    delete_service(service_id)
+    return CommandResult(True, "services", data={"id": service_id})
+
+
+def run_add_client(user: User, data) -> CommandResult:
+    """Create a client linked to the professional."""
+    success, result = create_client(user, data)
+    if not success:
+        return _form_failure("clients", result)
+    return CommandResult(True, "clients", data={"id": result.pk})
+
+
+def run_update_client(user: User, data) -> CommandResult:
+    """Update a client linked to the professional."""
+    client_id = _safe_int(data.get("client_id"))
+    success, result = update_client(user, client_id, data)
+    if success:
+        return CommandResult(True, "clients", data={"id": client_id})
+    if result is None:
+        return CommandResult(
+            False, "clients", message="Client introuvable ou non autorisé."
+        )
+    return _form_failure("clients", result)
+
+
+def run_delete_client(user: User, data) -> CommandResult:
+    """Delete a client linked to the professional."""
+    client_id = _safe_int(data.get("client_id"))
+    success, message = delete_client(user, client_id)
+    if not success:
+        return CommandResult(
+            False, "clients", message=message or "Client introuvable ou non autorisé."
+        )
+    return CommandResult(
+        True, "clients", message="Le client a été supprimé.", data={"id": client_id}
+    )
+
+
+def run_invite_client(user: User, data, *, base_url: str) -> CommandResult:
+    """Email an activation link to a passwordless client.
+
+    ``base_url`` (scheme and host of the site) prefixes the activation path;
+    it comes from the request, never from the submitted data.
+    """
+    client_id = _safe_int(data.get("client_id"))
+    success, message = send_client_invitation(user, client_id, base_url)
+    return CommandResult(
+        success, "clients", message=message, data={"id": client_id} if success else None
+    )
+
+
+def run_add_event(user: User, data) -> CommandResult:
+    """Create an appointment on the professional's calendar."""
+    denied = _require_professional(user, "planning")
+    if denied:
+        return denied
+    form = EventForm(data)
+    if not form.is_valid():
+        return _form_failure(
+            "planning",
+            form,
+            "Veuillez sélectionner un horaire, une prestation et un client.",
+        )
+    success, result = create_event(
+        user,
+        ensure_user_calendar(user),
+        form.cleaned_data["start_at"],
+        form.cleaned_data["end_at"],
+        form.cleaned_data["service_id"],
+        form.cleaned_data["client_id"],
+        capacity=form.cleaned_data.get("capacity"),
+    )
+    if not success:
+        return CommandResult(
+            False,
+            "planning",
+            message=result
+            or "Impossible de créer le rendez-vous. Vérifiez les informations fournies.",
+        )
+    return CommandResult(True, "planning", data={"id": result.pk})
+
+
+def run_delete_event(user: User, data) -> CommandResult:
+    """Delete an appointment owned by the professional."""
+    denied = _require_professional(user, "planning")
+    if denied:
+        return denied
+    event_id = _safe_int(data.get("event_id"))
+    success, message = delete_event(user, event_id)
+    if not success:
+        return CommandResult(
+            False,
+            "planning",
+            message=message
+            or "Vous ne pouvez supprimer que les rendez-vous appartenant à votre agenda.",
+        )
+    return CommandResult(
+        True,
+        "planning",
+        message="Le rendez-vous a été supprimé.",
+        data={"id": event_id},
+    )
+
+
+def _run_attendee_command(user: User, data, service, message: str) -> CommandResult:
+    denied = _require_professional(user, "planning")
+    if denied:
+        return denied
+    form = AttendeeForm(data)
+    if not form.is_valid():
+        return _form_failure(
+            "planning", form, "Veuillez sélectionner un rendez-vous et un client."
+        )
+    success, result = service(
+        user, form.cleaned_data["event_id"], form.cleaned_data["client_id"]
+    )
+    if not success:
+        return CommandResult(False, "planning", message=result)
+    waitlisted = bool(getattr(result, "is_waitlisted", False))
+    if waitlisted:
+        return CommandResult(
+            True,
+            "planning",
+            message="La séance est complète : client placé en liste d'attente.",
+            data={"event_id": form.cleaned_data["event_id"], "waitlisted": True},
+            level=messages.INFO,
+        )
+    return CommandResult(
+        True,
+        "planning",
+        message=message,
+        data={"event_id": form.cleaned_data["event_id"], "waitlisted": False},
+    )
+
+
+def run_add_attendee(user: User, data) -> CommandResult:
+    """Register a client on a group session, waitlisting them when full."""
+    return _run_attendee_command(
+        user, data, join_event, "Le client a été inscrit à la séance."
+    )
+
+
+def run_remove_attendee(user: User, data) -> CommandResult:
+    """Remove a client from a group session and free their seat."""
+    return _run_attendee_command(
+        user, data, leave_event, "Le client a été désinscrit de la séance."
+    )
+
+
+DASHBOARD_COMMANDS: dict[str, Callable[..., CommandResult]] = {
+    "add_category": run_add_category,
+    "add_service": run_add_service,
+    "update_service": run_update_service,
+    "delete_service": run_delete_service,
+    "add_client": run_add_client,
+    "update_client": run_update_client,
+    "delete_client": run_delete_client,
+    "invite_client": run_invite_client,
+    "add_event": run_add_event,
+    "delete_event": run_delete_event,
+    "add_attendee": run_add_attendee,
+    "remove_attendee": run_remove_attendee,
+}
@@ -1,11 +1,19 @@
 """Services for assembling dashboard data."""
 
 from datetime import timedelta
+from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
 from django.db.models import Prefetch
+from django.template.loader import render_to_string
 from django.utils import timezone
 
+from .client_services import (
+    CLIENT_LIST_ORDERING,
+    CLIENT_LIST_SORTS,
+    CLIENT_SEGMENTS,
+    list_clients_page,
+)
 from .forms import CategoryForm, ClientForm, ServiceForm
 from .models import Category, Service
 from .planning import PLANNER_HOURS, build_calendar_events
@@ -14,6 +22,10 @@ from .utils import ensure_user_calendar
 
 User = get_user_model()
 
+# The booking modal lists clients in a <select>; past this size the list is
+# truncated and clients are reached through search instead.
+CLIENT_OPTIONS_LIMIT = 500
+
 
 def _safe_int(value: str | None) -> int | None:
     """Return an int for the provided string, or None when invalid."""
@@ -58,55 +70,103 @@ def initialize_dashboard_state(request) -> dict:
         "show_service_form": show_service_form,
         "show_client_modal": False,
         "calendar": None,
+        "client_search": request.GET.get("q", "").strip()[:100],
+        "client_cursor": request.GET.get("after") or None,
+        "client_sort": request.GET.get("sort", "name"),
+        "client_segment": request.GET.get("segment", ""),
     }
 
 
-def build_dashboard_context(user, state, week_offset: int) -> dict:
-    """Aggregate all data needed to render the dashboard."""
-    calendar = state.get("calendar")
-    clients: list[dict[str, str]] = []
-    client_options: list[dict[str, str]] = []
-    user_services = []
+def build_services_context(user) -> dict:
+    """Return the categories and services owned by the user."""
+    if not user.is_authenticated:
+        return {"categories": Category.objects.none(), "user_services": []}
+    user_service_qs = Service.objects.filter(created_by=user).order_by("name")
+    categories = (
+        Category.objects.filter(services__created_by=user)
+        .prefetch_related(Prefetch("services", queryset=user_service_qs))
+        .distinct()
+    )
+    return {"categories": categories, "user_services": list(user_service_qs)}
+
+
+def _client_options(user) -> list[dict]:
+    """Return the booking select options, capped to keep the page small."""
+    options = []
+    for client_id, first_name, last_name, email in (
+        User.objects.filter(
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=user,
+            anonymized_at__isnull=True,
+        )
+        .order_by(*CLIENT_LIST_ORDERING)
+        .values_list("id", "first_name", "last_name", "email")[:CLIENT_OPTIONS_LIMIT]
+    ):
+        label = f"{first_name} {last_name}".strip() or email
+        options.append({"id": client_id, "label": label})
+    return options
+
+
+def build_clients_context(
+    user,
+    search: str = "",
+    cursor: str | None = None,
+    sort: str = "name",
+    segment: str = "",
+    *,
+    deferred: bool = False,
+) -> dict:
+    """Return one page of client rows for a professional.
+
+    With ``deferred`` the rows are not queried and ``clients_deferred`` is
+    set, so the page loads the section on demand.
+    """
+    if sort not in CLIENT_LIST_SORTS:
+        sort = "name"
+    if segment not in CLIENT_SEGMENTS:
+        segment = ""
+    # Query string keeping the search, sort and segment across pages.
+    filters = urlencode(
+        {
+            key: value
+            for key, value in (("q", search), ("sort", sort), ("segment", segment))
+            if value and value != "name"
+        }
+    )
+    context = {
+        "client_search": search,
+        "client_cursor": cursor,
+        "client_sort": sort,
+        "client_segment": segment,
+        "client_sorts": CLIENT_LIST_SORTS,
+        "client_segments": CLIENT_SEGMENTS,
+        "client_filters": filters,
+    }
     is_professional = (
         user.is_authenticated and user.user_type == User.UserType.PROFESSIONAL
     )
+    if not is_professional or deferred:
+        return {
+            **context,
+            "is_professional": is_professional,
+            "clients": [],
+            "client_next_cursor": None,
+            "clients_deferred": is_professional,
+        }
+    page = list_clients_page(
+        user, search=search, cursor=cursor, sort=sort, segment=segment
+    )
+    return {
+        **context,
+        "is_professional": True,
+        "clients": page.rows,
+        "client_next_cursor": page.next_cursor,
+        "clients_deferred": False,
+    }
 
-    if user.is_authenticated:
-        if calendar is None:
-            calendar = ensure_user_calendar(user)
-            state["calendar"] = calendar
-        user_service_qs = Service.objects.filter(created_by=user).order_by("name")
-        categories = (
-            Category.objects.filter(services__created_by=user)
-            .prefetch_related(Prefetch("services", queryset=user_service_qs))
-            .distinct()
-        )
-        user_services = list(user_service_qs)
-        if is_professional:
-            client_queryset = User.objects.filter(
-                user_type=User.UserType.INDIVIDUAL,
-                linked_professional=user,
-            ).order_by("first_name", "last_name", "email")
-            for client in client_queryset:
-                full_name = (
-                    f"{client.first_name} {client.last_name}".strip()
-                ) or client.email
-                client_data = {
-                    "id": client.pk,
-                    "full_name": full_name,
-                    "email": client.email,
-                    "phone": getattr(client, "phone_number", "") or "—",
-                }
-                clients.append(client_data)
-                client_options.append(
-                    {
-                        "id": client.pk,
-                        "label": full_name,
-                    }
-                )
-    else:
-        categories = Category.objects.none()
 
+def build_planning_context(calendar, week_offset: int) -> dict:
+    """Return the planner week (days, hours and summary) for a calendar."""
     today = timezone.localdate()
     start_of_week = (
         today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
@@ -116,12 +176,40 @@ def build_dashboard_context(user, state, week_offset: int) -> dict:
         f"Semaine {start_of_week.isocalendar().week} · "
         f"{start_of_week.strftime('%d/%m')} → {end_of_week.strftime('%d/%m')}"
     )
+    return {
+        "planner_hours": PLANNER_HOURS,
+        "planning_days": build_calendar_events(calendar, week_offset=week_offset),
+        "week_offset": week_offset,
+        "planner_week_summary": planner_week_summary,
+    }
+
+
+def build_dashboard_context(user, state, week_offset: int) -> dict:
+    """Aggregate all data needed to render the dashboard.
 
-    planning_days = build_calendar_events(calendar, week_offset=week_offset)
+    Every section is rendered in the page, but the client list and the
+    booking options of the planner are only queried when their section is
+    the active one; the others are marked deferred and fetched by loading
+    the page on that section.
+    """
+    calendar = state.get("calendar")
+    if user.is_authenticated and calendar is None:
+        calendar = ensure_user_calendar(user)
+        state["calendar"] = calendar
+    section = state["section"]
+    clients_context = build_clients_context(
+        user,
+        state.get("client_search", ""),
+        state.get("client_cursor"),
+        state.get("client_sort", "name"),
+        state.get("client_segment", ""),
+        deferred=section != "clients",
+    )
+    is_professional = clients_context["is_professional"]
+    planning_loaded = section == "planning" and is_professional
 
     return {
-        "section": state["section"],
-        "categories": categories,
+        "section": section,
         "category_form": state["category_form"],
         "show_category_form": state["show_category_form"],
         "show_category_modal": state["show_category_form"]
@@ -133,12 +221,36 @@ def build_dashboard_context(user, state, week_offset: int) -> dict:
         "client_form": state["client_form"],
         "show_client_modal": state["show_client_modal"]
         or bool(state["client_form"].errors),
-        "is_professional": is_professional,
-        "planner_hours": PLANNER_HOURS,
-        "planning_days": planning_days,
-        "week_offset": week_offset,
-        "planner_week_summary": planner_week_summary,
-        "user_services": user_services,
-        "clients": clients,
-        "client_options": client_options,
+        **build_services_context(user),
+        **clients_context,
+        **build_planning_context(calendar, week_offset),
+        "client_options": _client_options(user) if planning_loaded else [],
+        "planning_deferred": is_professional and not planning_loaded,
     }
+
+
+DASHBOARD_FRAGMENT_TEMPLATES = {
+    "services": "accounts/components/services_board.html",
+    "clients": "accounts/components/clients_table.html",
+    "planning": "accounts/components/planner_columns.html",
+}
+
+
+def render_dashboard_fragment(request, section: str, week_offset: int = 0) -> str:
+    """Render only the part of the dashboard that a write to ``section`` changes.
+
+    Each section computes its own context, so refreshing the services board
+    does not rebuild the planner week or the clients table.
+    """
+    user = request.user
+    if section == "services":
+        context = build_services_context(user)
+    elif section == "clients":
+        context = build_clients_context(user)
+    elif section == "planning":
+        context = build_planning_context(ensure_user_calendar(user), week_offset)
+    else:
+        raise ValueError(f"Unknown dashboard section: {section}")
+    return render_to_string(
+        DASHBOARD_FRAGMENT_TEMPLATES[section], context, request=request
+    )
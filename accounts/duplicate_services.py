@@ -0,0 +1,322 @@
+"""Find clients recorded several times and merge them in bulk.
+
+Comparing every pair of a professional's clients is quadratic. Instead each
+client gets a few blocking keys (normalised full name, email local part,
+phone key); only clients sharing a key are compared, and keys shared by more
+than ``DUPLICATE_BLOCK_MAX_SIZE`` clients (a common name, ``contact@``) are
+too generic to be useful and are ignored. Matching pairs are joined with a
+union-find into duplicate groups. The scan still reads every client of the
+professional, so it runs offline: the ``find_client_duplicates`` command
+stores its groups in ``ClientDuplicateReport`` and the dashboard pages
+through the stored report, flagged stale once a client write moved the
+client-index version.
+
+Merging is set-based: attendances are loaded once, re-pointed with
+``bulk_update`` and the leftover rows and accounts are deleted in chunks,
+all in one transaction.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterator
+
+from django.db import transaction
+
+from users.models import User, normalize_phone
+
+from .attendance_services import recount_event_counters
+from .client_autocomplete import (
+    client_index_version,
+    invalidate_client_index,
+    normalize_search_text,
+)
+from .client_stats_services import refresh_client_stats
+from .models import ClientDuplicateReport, EventAttendee, WeekTemplateSlot
+from .portal_services import invalidate_client_portal
+
+DUPLICATE_BLOCK_MAX_SIZE = 50
+DUPLICATE_CLIENT_FIELDS = ("id", "first_name", "last_name", "email", "phone_key")
+DUPLICATE_GROUPS_PAGE_SIZE = 50
+MERGE_CHUNK_SIZE = 500
+MERGE_FILLED_FIELDS = ("first_name", "last_name", "phone_number")
+
+
+def _chunks(values: list[int], size: int = MERGE_CHUNK_SIZE) -> Iterator[list[int]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _email_local_part(email: str) -> str:
+    local = email.rsplit("@", 1)[0].split("+", 1)[0]
+    return local.replace(".", "").lower()
+
+
+def _blocking_keys(client: dict) -> Iterator[tuple[str, str]]:
+    if client["name"]:
+        yield "name", client["name"]
+    if client["email_local"]:
+        yield "email", client["email_local"]
+    if client["phone_key"]:
+        yield "phone", client["phone_key"]
+
+
+def _is_duplicate(first: dict, second: dict) -> bool:
+    """Decide whether two candidates sharing a blocking key are one person.
+
+    Different names or different phone numbers rule a match out, so
+    relatives sharing a phone or a mailbox stay separate clients.
+    """
+    if (
+        first["phone_key"]
+        and second["phone_key"]
+        and first["phone_key"] != second["phone_key"]
+    ):
+        return False
+    if first["name"] and second["name"]:
+        return first["name"] == second["name"]
+    return bool(
+        (first["phone_key"] and first["phone_key"] == second["phone_key"])
+        or (first["email_local"] and first["email_local"] == second["email_local"])
+    )
+
+
+def find_duplicate_clients(user: User) -> list[list[dict]]:
+    """Return groups of clients of `user` that look like the same person.
+
+    Each group is ordered by id; the first (oldest) client is the suggested
+    merge target. Groups are ordered by their first id.
+    """
+    clients: dict[int, dict] = {}
+    blocks: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for client_id, first_name, last_name, email, phone_key in (
+        User.objects.filter(
+            linked_professional=user, user_type=User.UserType.INDIVIDUAL
+        )
+        .order_by("id")
+        .values_list("id", "first_name", "last_name", "email", "phone_key")
+        .iterator(chunk_size=2000)
+    ):
+        client = {
+            "id": client_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "phone_key": phone_key,
+            "name": normalize_search_text(f"{first_name} {last_name}"),
+            "email_local": _email_local_part(email),
+        }
+        clients[client_id] = client
+        for key in _blocking_keys(client):
+            blocks[key].append(client_id)
+
+    parents: dict[int, int] = {}
+
+    def find(client_id: int) -> int:
+        root = client_id
+        while parents.get(root, root) != root:
+            root = parents[root]
+        parents[client_id] = root
+        return root
+
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > DUPLICATE_BLOCK_MAX_SIZE:
+            continue
+        for index, first_id in enumerate(members):
+            for second_id in members[index + 1 :]:
+                if find(first_id) != find(second_id) and _is_duplicate(
+                    clients[first_id], clients[second_id]
+                ):
+                    root, other = sorted((find(first_id), find(second_id)))
+                    parents[root] = root
+                    parents[other] = root
+
+    groups: dict[int, list[dict]] = defaultdict(list)
+    for client_id in parents:
+        groups[find(client_id)].append(clients[client_id])
+    return [
+        [
+            {field: client[field] for field in DUPLICATE_CLIENT_FIELDS}
+            for client in sorted(members, key=lambda client: client["id"])
+        ]
+        for _, members in sorted(groups.items())
+        if len(members) > 1
+    ]
+
+
+def refresh_duplicate_report(user: User) -> ClientDuplicateReport:
+    """Scan the clients of `user` and store their duplicate groups."""
+    # Read before the rows: a client written during the scan leaves the
+    # report stale rather than silently incomplete.
+    version = client_index_version(user.pk)
+    report, _ = ClientDuplicateReport.objects.update_or_create(
+        professional=user,
+        defaults={"version": version, "groups": find_duplicate_clients(user)},
+    )
+    return report
+
+
+def professionals_with_stale_duplicates() -> Iterator[User]:
+    """Yield the professionals whose report is missing or out of date."""
+    versions = dict(
+        ClientDuplicateReport.objects.values_list("professional", "version")
+    )
+    for professional in User.objects.filter(
+        user_type=User.UserType.PROFESSIONAL
+    ).order_by("pk"):
+        version = versions.get(professional.pk)
+        if version is None or version != client_index_version(professional.pk):
+            yield professional
+
+
+def get_duplicate_report(
+    user: User, *, offset: int = 0, limit: int = DUPLICATE_GROUPS_PAGE_SIZE
+) -> dict:
+    """Return one page of the stored duplicate groups of `user`.
+
+    The mapping holds the ``groups`` of the page, their ``total``, the
+    ``next_offset`` (None on the last page), ``computed_at`` and ``stale``,
+    set when no report exists yet or a client was written since the scan.
+    """
+    report = ClientDuplicateReport.objects.filter(professional=user).first()
+    if report is None:
+        return {
+            "groups": [],
+            "total": 0,
+            "next_offset": None,
+            "computed_at": None,
+            "stale": True,
+        }
+    end = offset + limit
+    return {
+        "groups": report.groups[offset:end],
+        "total": len(report.groups),
+        "next_offset": end if end < len(report.groups) else None,
+        "computed_at": report.computed_at.isoformat(),
+        "stale": report.version != client_index_version(user.pk),
+    }
+
+
+def _validate_merges(user: User, merges: dict[int, list[int]]) -> dict[int, int] | str:
+    """Return the duplicate -> target mapping, or an error message."""
+    targets: dict[int, int] = {}
+    for primary_id, duplicate_ids in merges.items():
+        for duplicate_id in duplicate_ids:
+            if duplicate_id == primary_id or duplicate_id in targets:
+                return "Un client ne peut être fusionné qu'une seule fois."
+            targets[duplicate_id] = primary_id
+    if not targets:
+        return "Aucun doublon à fusionner."
+    if set(targets) & set(merges):
+        return "Un client fusionné ne peut pas servir de cible."
+
+    all_ids = sorted(set(targets) | set(merges))
+    owned = 0
+    for chunk in _chunks(all_ids):
+        owned += User.objects.filter(
+            pk__in=chunk,
+            linked_professional=user,
+            user_type=User.UserType.INDIVIDUAL,
+        ).count()
+    if owned != len(all_ids):
+        return "Client introuvable."
+    return targets
+
+
+def _move_attendances(targets: dict[int, int]) -> tuple[int, int]:
+    """Re-point the duplicates' attendances; return (moved, dropped)."""
+    primary_ids = sorted(set(targets.values()))
+    rows: list[tuple[int, int, int]] = []
+    for chunk in _chunks(primary_ids + sorted(targets)):
+        rows.extend(
+            EventAttendee.objects.filter(user_id__in=chunk).values_list(
+                "pk", "event_id", "user_id"
+            )
+        )
+    # Targets keep their own rows; among duplicates the oldest row wins.
+    rows.sort(key=lambda row: (row[2] in targets, row[0]))
+
+    taken: set[tuple[int, int]] = set()
+    moved: list[EventAttendee] = []
+    dropped: list[int] = []
+    touched_events: set[int] = set()
+    for pk, event_id, user_id in rows:
+        target = targets.get(user_id, user_id)
+        if (event_id, target) in taken:
+            dropped.append(pk)
+            touched_events.add(event_id)
+            continue
+        taken.add((event_id, target))
+        if target != user_id:
+            moved.append(EventAttendee(pk=pk, user_id=target))
+
+    EventAttendee.objects.bulk_update(moved, ["user"], batch_size=MERGE_CHUNK_SIZE)
+    for chunk in _chunks(dropped):
+        EventAttendee.objects.filter(pk__in=chunk).delete()
+    for chunk in _chunks(sorted(touched_events)):
+        recount_event_counters(chunk)
+    return len(moved), len(dropped)
+
+
+def _fill_primary_fields(targets: dict[int, int]) -> None:
+    """Copy missing names and phone numbers from duplicates to targets."""
+    primaries: dict[int, User] = {}
+    donors: dict[int, list[User]] = defaultdict(list)
+    for chunk in _chunks(sorted(set(targets) | set(targets.values()))):
+        for client in User.objects.filter(pk__in=chunk).only(*MERGE_FILLED_FIELDS):
+            if client.pk in targets:
+                donors[targets[client.pk]].append(client)
+            else:
+                primaries[client.pk] = client
+
+    changed: list[User] = []
+    for primary_id, primary in primaries.items():
+        updated = False
+        for donor in sorted(donors[primary_id], key=lambda client: client.pk):
+            for field in MERGE_FILLED_FIELDS:
+                if not getattr(primary, field) and getattr(donor, field):
+                    setattr(primary, field, getattr(donor, field))
+                    updated = True
+        if updated:
+            primary.phone_key = normalize_phone(primary.phone_number)
+            changed.append(primary)
+    User.objects.bulk_update(
+        changed, [*MERGE_FILLED_FIELDS, "phone_key"], batch_size=MERGE_CHUNK_SIZE
+    )
+
+
+def merge_clients(user: User, merges: dict[int, list[int]]) -> tuple[bool, dict | str]:
+    """Merge each list of duplicates into its target client.
+
+    ``merges`` maps a target client id to the ids of its duplicates. In one
+    transaction, attendances are moved to the target (a duplicate's row is
+    dropped when the target already attends the event), week-template slots
+    are re-pointed, blank target fields are filled from the duplicates and
+    the duplicates are deleted.
+
+    Returns (True, {"merged", "moved", "dropped"}) on success or
+    (False, message) on failure.
+    """
+    targets = _validate_merges(user, merges)
+    if isinstance(targets, str):
+        return False, targets
+
+    with transaction.atomic():
+        moved, dropped = _move_attendances(targets)
+        slots: list[WeekTemplateSlot] = []
+        for chunk in _chunks(sorted(targets)):
+            slots.extend(
+                WeekTemplateSlot.objects.filter(client_id__in=chunk).only("client")
+            )
+        for slot in slots:
+            slot.client_id = targets[slot.client_id]
+        WeekTemplateSlot.objects.bulk_update(
+            slots, ["client"], batch_size=MERGE_CHUNK_SIZE
+        )
+        _fill_primary_fields(targets)
+        refresh_client_stats(targets.values())
+        invalidate_client_portal(targets.values())
+        for chunk in _chunks(sorted(targets)):
+            User.objects.filter(pk__in=chunk).delete()
+    invalidate_client_index(user.pk)
+    return True, {"merged": len(targets), "moved": moved, "dropped": dropped}
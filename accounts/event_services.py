@@ -3,13 +3,16 @@
 Extracted from views to keep handlers thin and testable.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
+from django.db import transaction
 from django.utils import timezone
 
 from users.models import User
 
+from .client_stats_services import attendee_ids, record_booking, refresh_client_stats
 from .models import Event, EventAttendee, Service
+from .portal_services import invalidate_client_portal
 
 
 def _parse_iso_datetime(value: str | None) -> datetime | None:
@@ -26,11 +29,28 @@ def _parse_iso_datetime(value: str | None) -> datetime | None:
     return timezone.make_aware(naive_local, timezone.get_current_timezone())
 
 
+def _resolve_end_at(start_at: datetime, end_at: datetime, service) -> datetime:
+    """Default an empty or inverted range to the service duration."""
+    if end_at <= start_at:
+        duration = service.duration_minutes or 60
+        return start_at + timedelta(minutes=duration)
+    return end_at
+
+
 def create_event(
-    user: User, calendar, start_at_raw: str, end_at_raw: str, service_id, client_id
+    user: User,
+    calendar,
+    start_at_raw: str,
+    end_at_raw: str,
+    service_id,
+    client_id,
+    capacity: int | None = None,
 ):
     """Create an Event and EventAttendee if valid.
 
+    A ``capacity`` turns the event into a group session that other clients
+    can join through ``accounts.attendance_services``.
+
     Returns (True, event) on success or (False, message) on failure.
     """
     if not calendar:
@@ -51,20 +71,77 @@ def create_event(
     if not (service and client):
         return False, "Prestation ou client invalide."
 
+    end_at = _resolve_end_at(start_at, end_at, service)
+
+    with transaction.atomic():
+        event = Event.objects.create(
+            calendar=calendar,
+            title=service.name,
+            description=service.description or "",
+            start_at=start_at,
+            end_at=end_at,
+            created_by=user,
+            status="planned",
+            capacity=capacity,
+            price=service.price,
+            attendee_count=1,
+        )
+        EventAttendee.objects.create(event=event, user=client)
+        record_booking(user.pk, client.pk, start_at, service.price)
+        invalidate_client_portal([client.pk])
+    return True, event
+
+
+def find_overlapping_events(
+    calendar_id: int,
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    exclude_id: int | None = None,
+):
+    """Return the non-canceled events of a calendar overlapping a time range."""
+    queryset = Event.objects.filter(
+        calendar_id=calendar_id, start_at__lt=end_at, end_at__gt=start_at
+    ).exclude(status="canceled")
+    if exclude_id is not None:
+        queryset = queryset.exclude(pk=exclude_id)
+    return queryset
+
+
+def move_event(user: User, event_id, start_at_raw: str, end_at_raw: str | None):
+    """Move and/or resize an event owned by the user's calendar.
+
+    When no end is provided the event keeps its duration. Only the time
+    columns are written, so the rest of the row (and its attendees) is
+    untouched.
+
+    Returns (True, event) on success or (False, message) on failure.
+    """
+    event = Event.objects.filter(pk=event_id, calendar__owner=user).first()
+    if not event:
+        return False, "Rendez-vous introuvable ou non autorisé."
+    start_at = _parse_iso_datetime(start_at_raw)
+    if start_at is None:
+        return False, "Date de début invalide."
+    end_at = _parse_iso_datetime(end_at_raw)
+    if end_at is None:
+        end_at = start_at + (event.end_at - event.start_at)
     if end_at <= start_at:
-        duration = service.duration_minutes or 60
-        end_at = start_at + timedelta(minutes=duration)
+        return False, "L'heure de fin doit suivre l'heure de début."
 
-    event = Event.objects.create(
-        calendar=calendar,
-        title=service.name,
-        description=service.description or "",
-        start_at=start_at,
-        end_at=end_at,
-        created_by=user,
-        status="planned",
+    overlapping = find_overlapping_events(
+        event.calendar_id, start_at, end_at, exclude_id=event.pk
     )
-    EventAttendee.objects.create(event=event, user=client)
+    if overlapping.exists():
+        return False, "Ce créneau chevauche un autre rendez-vous."
+
+    event.start_at = start_at
+    event.end_at = end_at
+    with transaction.atomic():
+        event.save(update_fields=["start_at", "end_at", "updated_at"])
+        clients = attendee_ids([event.pk])
+        refresh_client_stats(clients)
+        invalidate_client_portal(clients)
     return True, event
 
 
@@ -80,5 +157,169 @@ def delete_event(user: User, event_id):
     )
     if not event:
         return False, "Rendez-vous introuvable ou non autorisé."
-    event.delete()
+    with transaction.atomic():
+        clients = attendee_ids([event.pk])
+        event.delete()
+        refresh_client_stats(clients)
+        invalidate_client_portal(clients)
     return True, None
+
+
+BULK_CREATE_BATCH_SIZE = 500
+
+
+def _build_bulk_event(user: User, calendar, item, services, clients):
+    """Validate one bulk payload item against preloaded lookups.
+
+    Returns (event, client) on success or (None, message) on failure.
+    """
+    if not isinstance(item, dict):
+        return None, "Format de rendez-vous invalide."
+    start_at = _parse_iso_datetime(item.get("start_at"))
+    if start_at is None:
+        return None, "Date de début invalide."
+    end_at = _parse_iso_datetime(item.get("end_at")) or start_at
+    service = services.get(_coerce_id(item.get("service_id")))
+    client = clients.get(_coerce_id(item.get("client_id")))
+    if not (service and client):
+        return None, "Prestation ou client invalide."
+    capacity = item.get("capacity")
+    if capacity is not None and (_coerce_id(capacity) or 0) < 1:
+        return None, "Nombre de places invalide."
+
+    event = Event(
+        calendar=calendar,
+        title=service.name,
+        description=service.description or "",
+        start_at=start_at,
+        end_at=_resolve_end_at(start_at, end_at, service),
+        price=service.price,
+        created_by=user,
+        status="planned",
+        capacity=_coerce_id(capacity),
+        attendee_count=1,
+    )
+    return event, client
+
+
+def _coerce_id(value) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def bulk_create_events(user: User, calendar, items) -> tuple[list[Event], list[dict]]:
+    """Create many events (and their client attendee) in one transaction.
+
+    Services and clients referenced by the batch are preloaded with two
+    queries, every item is validated in memory, and the valid rows are
+    written with ``bulk_create``. Invalid items do not abort the batch.
+
+    Returns (created_events, errors) where each error is
+    ``{"index": position_in_items, "error": message}``.
+    """
+    if not calendar:
+        return [], [{"index": None, "error": "Calendrier introuvable."}]
+
+    items = list(items)
+    dict_items = [item for item in items if isinstance(item, dict)]
+    service_ids = {_coerce_id(item.get("service_id")) for item in dict_items}
+    client_ids = {_coerce_id(item.get("client_id")) for item in dict_items}
+    services = Service.objects.filter(created_by=user).in_bulk(
+        [pk for pk in service_ids if pk is not None]
+    )
+    clients = User.objects.filter(
+        linked_professional=user,
+        user_type=User.UserType.INDIVIDUAL,
+    ).in_bulk([pk for pk in client_ids if pk is not None])
+
+    events: list[Event] = []
+    event_clients: list[User] = []
+    errors: list[dict] = []
+    for index, item in enumerate(items):
+        event, result = _build_bulk_event(user, calendar, item, services, clients)
+        if event is None:
+            errors.append({"index": index, "error": result})
+            continue
+        events.append(event)
+        event_clients.append(result)
+
+    with transaction.atomic():
+        created = Event.objects.bulk_create(events, batch_size=BULK_CREATE_BATCH_SIZE)
+        EventAttendee.objects.bulk_create(
+            [
+                EventAttendee(event=event, user=client)
+                for event, client in zip(created, event_clients, strict=True)
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        booked = [client.pk for client in event_clients]
+        refresh_client_stats(booked)
+        invalidate_client_portal(booked)
+    return created, errors
+
+
+BULK_STATUS_TRANSITIONS = {
+    "confirm": "confirmed",
+    "cancel": "canceled",
+}
+
+
+def bulk_event_operation(
+    user: User,
+    operation: str,
+    date_from: date,
+    date_to: date,
+    *,
+    calendar_id: int | None = None,
+    status: str | None = None,
+) -> list[int]:
+    """Confirm, cancel or delete every matching event owned by the user.
+
+    Events are matched on the owner's calendars (optionally a single one),
+    a start date within ``[date_from, date_to]`` and an optional status. The
+    matching rows are locked first and the change is applied to exactly those
+    IDs with one set-based ``UPDATE``/``DELETE``; the IDs are returned so
+    clients can be notified.
+    """
+    if operation not in {*BULK_STATUS_TRANSITIONS, "delete"}:
+        raise ValueError(f"Unsupported bulk operation: {operation}")
+
+    tz = timezone.get_current_timezone()
+    start_dt = timezone.make_aware(datetime.combine(date_from, time.min), tz)
+    end_dt = timezone.make_aware(
+        datetime.combine(date_to + timedelta(days=1), time.min), tz
+    )
+    queryset = Event.objects.filter(
+        calendar__owner=user, start_at__gte=start_dt, start_at__lt=end_dt
+    )
+    if calendar_id is not None:
+        queryset = queryset.filter(calendar_id=calendar_id)
+    if status:
+        queryset = queryset.filter(status=status)
+
+    new_status = BULK_STATUS_TRANSITIONS.get(operation)
+    if new_status is not None:
+        # Canceled events stay canceled, and rows already in the target
+        # status are left untouched so they are not reported as changed.
+        queryset = queryset.exclude(status__in={"canceled", new_status})
+
+    with transaction.atomic():
+        event_ids = list(
+            queryset.select_for_update().order_by().values_list("pk", flat=True)
+        )
+        if not event_ids:
+            return []
+        clients = attendee_ids(event_ids)
+        # Write to the locked rows only: re-running the range filter could
+        # pick up events created or moved into it since the lock was taken.
+        locked = Event.objects.filter(pk__in=event_ids)
+        if new_status is None:
+            locked.delete()
+        else:
+            locked.update(status=new_status, updated_at=timezone.now())
+        if operation != "confirm":
+            refresh_client_stats(clients)
+        invalidate_client_portal(clients)
+    return event_ids
@@ -21,6 +21,7 @@ class EventView(NamedTuple):
     status: str
     created_by: str
     client: str
+    occupancy: str
     start: str
     end: str
     top_pct: float
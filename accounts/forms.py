@@ -1,9 +1,13 @@
 """Forms for manipulating categories, services, and clients."""
 
+from typing import Any
+
 from django import forms
 from django.contrib.auth import get_user_model
 
-from .models import Category, Service
+from users.models import email_key
+
+from .models import Category, Event, Service
 
 User = get_user_model()
 
@@ -102,6 +106,65 @@ class ServiceForm(forms.ModelForm):
         return duration
 
 
+class PreloadedModelChoiceField(forms.ModelChoiceField):
+    """Model choice field resolving values from an in-memory mapping.
+
+    Bulk paths validate many rows against the same few related objects; the
+    mapping avoids one lookup query per row.
+    """
+
+    def __init__(self, instances: dict[int, Any], **kwargs):
+        """Store the mapping of primary keys to preloaded instances."""
+        super().__init__(queryset=None, **kwargs)
+        self.instances = instances
+
+    def to_python(self, value):
+        """Return the preloaded instance matching ``value``."""
+        if value in self.empty_values:
+            return None
+        try:
+            return self.instances[int(value)]
+        except (KeyError, TypeError, ValueError) as exc:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice"
+            ) from exc
+
+
+class ServiceBatchForm(ServiceForm):
+    """ServiceForm resolving categories from a preloaded mapping.
+
+    Applies the same validation rules as ``ServiceForm`` without querying the
+    category of every row, which keeps batch edits and imports to a constant
+    number of queries.
+    """
+
+    def __init__(self, *args, categories: dict[int, Category], **kwargs):
+        """Swap the category field for one backed by ``categories``."""
+        super().__init__(*args, **kwargs)
+        self.fields["category"] = PreloadedModelChoiceField(
+            categories, label=self.fields["category"].label
+        )
+
+    def _get_validation_exclusions(self):
+        exclusions = super()._get_validation_exclusions()
+        # The category was resolved against rows loaded from the database.
+        exclusions.add("category")
+        return exclusions
+
+
+class CsvImportForm(forms.Form):
+    """Upload of a CSV file for the bulk imports."""
+
+    file = forms.FileField(label="Fichier CSV")
+
+    def clean_file(self):
+        """Reject uploads that are obviously not CSV files."""
+        upload = self.cleaned_data["file"]
+        if not upload.name.lower().endswith((".csv", ".txt")):
+            raise forms.ValidationError("Veuillez fournir un fichier CSV.")
+        return upload
+
+
 class ClientForm(forms.ModelForm):
     """Form used to create customers linked to a professional."""
 
@@ -133,8 +196,8 @@ class ClientForm(forms.ModelForm):
 
     def clean_email(self):
         """Reject duplicate email addresses."""
-        email = self.cleaned_data["email"].lower()
-        qs = User.objects.filter(email=email)
+        email = email_key(self.cleaned_data["email"])
+        qs = User.objects.filter_email(email)
         if self.instance and getattr(self.instance, "pk", None):
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -142,6 +205,35 @@ class ClientForm(forms.ModelForm):
         return email
 
 
+class ClientBatchForm(ClientForm):
+    """ClientForm validating rows of a bulk import without per-row queries.
+
+    The professional link is set on the instance by the caller and checked
+    once for the whole import, and email uniqueness is checked against
+    ``taken_emails`` (lower-cased), which is updated as rows are accepted.
+    """
+
+    def __init__(self, *args, taken_emails: set[str], **kwargs):
+        """Drop the professional field and keep the preloaded email set."""
+        super().__init__(*args, **kwargs)
+        del self.fields["linked_professional"]
+        self.taken_emails = taken_emails
+
+    def clean_email(self):
+        """Reject emails already registered or seen earlier in the import."""
+        email = email_key(self.cleaned_data["email"])
+        if email in self.taken_emails:
+            raise forms.ValidationError("Un utilisateur avec cet email existe déjà.")
+        return email
+
+    def validate_unique(self):
+        """Skip the per-row query; ``clean_email`` covered uniqueness."""
+
+    def _get_validation_exclusions(self):
+        # Keep the model's Lower(email) constraint from querying per row too.
+        return super()._get_validation_exclusions() | {"email"}
+
+
 class EventForm(forms.Form):
     """Form used to validate event creation payloads."""
 
@@ -149,3 +241,67 @@ class EventForm(forms.Form):
     end_at = forms.CharField(required=True)
     service_id = forms.IntegerField(required=True)
     client_id = forms.IntegerField(required=True)
+    capacity = forms.IntegerField(required=False, min_value=1)
+
+
+class BulkEventActionForm(forms.Form):
+    """Form used to validate bulk status transitions over a date range."""
+
+    MAX_RANGE_DAYS = 366
+
+    operation = forms.ChoiceField(
+        choices=(
+            ("confirm", "Confirmer"),
+            ("cancel", "Annuler"),
+            ("delete", "Supprimer"),
+        )
+    )
+    calendar_id = forms.IntegerField(required=False)
+    date_from = forms.DateField()
+    date_to = forms.DateField()
+    status = forms.ChoiceField(
+        required=False,
+        choices=(("", "Tous"), *Event._meta.get_field("status").choices),
+    )
+
+    def clean(self):
+        """Ensure the date range is ordered and bounded."""
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to:
+            if date_to < date_from:
+                raise forms.ValidationError(
+                    "La date de fin doit suivre la date de début."
+                )
+            if (date_to - date_from).days >= self.MAX_RANGE_DAYS:
+                raise forms.ValidationError("La période ne peut pas dépasser un an.")
+        return cleaned_data
+
+
+class WeekTemplateCaptureForm(forms.Form):
+    """Form used to save a planner week as a reusable template."""
+
+    name = forms.CharField(max_length=100)
+    week_offset = forms.IntegerField(required=False)
+
+    def clean_name(self):
+        """Ensure the template name is not empty after trimming."""
+        name = self.cleaned_data["name"].strip()
+        if not name:
+            raise forms.ValidationError("Veuillez saisir un nom de modèle.")
+        return name
+
+
+class WeekTemplateApplyForm(forms.Form):
+    """Form used to stamp a template onto consecutive future weeks."""
+
+    week_offset = forms.IntegerField(min_value=1)
+    weeks = forms.IntegerField(min_value=1, max_value=52)
+
+
+class AttendeeForm(forms.Form):
+    """Form used to validate join/leave requests on group sessions."""
+
+    event_id = forms.IntegerField(required=True)
+    client_id = forms.IntegerField(required=True)
@@ -0,0 +1,120 @@
+"""Idempotency-key helpers shielding dashboard writes from double submits.
+
+The browser attaches a random token to every write form. The first request
+carrying a token claims it by inserting a pending row in its own short,
+committed transaction, before the write starts; the write then records its
+outcome on the row inside its own transaction. A concurrent request with the
+same token sees the committed claim and gets a 409 instead of queuing on the
+unique (user, key) index, a later one replays the recorded outcome, and a
+token reused for another action is refused with a 422. A claim left pending
+by a crashed request expires after ``IDEMPOTENCY_CLAIM_TTL``; expired rows
+are taken over on conflict and purged out of band.
+"""
+
+import re
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# Lifetime of a pending claim, after which a retry may take it over.
+IDEMPOTENCY_CLAIM_TTL = timedelta(minutes=1)
+# ``response_status`` of a claimed key whose write has not completed yet.
+IDEMPOTENCY_PENDING = 0
+_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def normalize_idempotency_key(value: str | None) -> str | None:
+    """Return the submitted key when well-formed, otherwise None."""
+    if not value:
+        return None
+    value = value.strip()
+    return value if _KEY_PATTERN.match(value) else None
+
+
+def claim_idempotency_key(user, key: str, action: str) -> IdempotencyKey | None:
+    """Reserve ``key`` for a write, or return the row already holding it.
+
+    Call outside the transaction of the write: the pending row is committed
+    at once, so concurrent duplicates see it. Returns None when the key was
+    claimed (or an expired row was taken over) and the write may run.
+    """
+    now = timezone.now()
+    claim = {
+        "action": action,
+        "response_status": IDEMPOTENCY_PENDING,
+        "response_location": "",
+        "expires_at": now + IDEMPOTENCY_CLAIM_TTL,
+    }
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(user=user, key=key, **claim)
+            return None
+        except IntegrityError:
+            pass
+        if IdempotencyKey.objects.filter(
+            user=user, key=key, expires_at__lte=now
+        ).update(**claim):
+            return None
+        record = (
+            IdempotencyKey.objects.filter(user=user, key=key)
+            .only("action", "response_status", "response_location")
+            .first()
+        )
+        if record is not None:
+            return record
+        # Released between the INSERT and the SELECT: claim it again.
+    return None
+
+
+def idempotency_conflict(record: IdempotencyKey, action: str) -> tuple[int, str] | None:
+    """Return the (status, message) refusing to replay ``record``, if any."""
+    if record.action != action:
+        return 422, "Cette clé a déjà servi pour une autre action."
+    if record.response_status == IDEMPOTENCY_PENDING:
+        return 409, "Cette action est déjà en cours de traitement."
+    return None
+
+
+def replay_idempotent_response(record: IdempotencyKey, action: str) -> HttpResponse:
+    """Return the recorded outcome of ``record`` for a resubmitted ``action``."""
+    conflict = idempotency_conflict(record, action)
+    if conflict is not None:
+        status, message = conflict
+        return HttpResponse(message, status=status)
+    if record.response_location:
+        return redirect(record.response_location)
+    return HttpResponse(status=record.response_status)
+
+
+def record_idempotent_response(user, key: str, response: HttpResponse | None) -> None:
+    """Store the outcome of the write that claimed ``key``.
+
+    Call inside the transaction of the write, so the outcome commits with
+    it. Only redirects are recorded: a write that re-renders the dashboard,
+    or fails, did not persist anything, so its claim is released and a
+    retry runs again.
+    """
+    claimed = IdempotencyKey.objects.filter(user=user, key=key)
+    location = response.get("Location", "") if response is not None else ""
+    if response is None or not location:
+        claimed.delete()
+        return
+    claimed.update(
+        response_status=response.status_code,
+        response_location=location[:255],
+        expires_at=timezone.now() + IDEMPOTENCY_KEY_TTL,
+    )
+
+
+def purge_expired_idempotency_keys(now=None) -> int:
+    """Delete expired keys and return how many rows were removed."""
+    now = now or timezone.now()
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now).delete()
+    return deleted
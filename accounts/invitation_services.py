@@ -0,0 +1,71 @@
+"""Invitation links letting passwordless clients activate their account.
+
+Clients are created with an unusable password. The professional sends an
+invitation carrying a one-time token from Django's password-reset token
+generator; the token embeds the password hash and last login, so it stops
+working as soon as the client has chosen a password. No row is stored.
+"""
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from users.models import User
+
+
+def build_activation_path(client: User) -> str:
+    """Return the relative activation URL for ``client``."""
+    uidb64 = urlsafe_base64_encode(force_bytes(client.pk))
+    token = default_token_generator.make_token(client)
+    return reverse("client_activate", args=[uidb64, token])
+
+
+def send_client_invitation(user: User, client_id, base_url: str) -> tuple[bool, str]:
+    """Email an activation link to a client linked to `user`.
+
+    Returns (True, message) once the email is sent, or (False, message) if
+    the client is unknown, not linked to `user`, anonymised by the retention
+    command, or already activated.
+    """
+    client = User.objects.filter(
+        pk=client_id,
+        linked_professional=user,
+        user_type=User.UserType.INDIVIDUAL,
+        anonymized_at__isnull=True,
+    ).first()
+    if client is None:
+        return False, "Client introuvable ou non autorisé."
+    if client.has_usable_password():
+        return False, "Ce client a déjà activé son compte."
+
+    professional = f"{user.first_name} {user.last_name}".strip() or user.email
+    send_mail(
+        "Activez votre espace client Kitlast",
+        (
+            f"Bonjour,\n\n{professional} vous invite à activer votre espace client "
+            "pour suivre vos rendez-vous.\n\n"
+            f"Choisissez votre mot de passe ici : {base_url}{build_activation_path(client)}\n"
+        ),
+        settings.DEFAULT_FROM_EMAIL,
+        [client.email],
+    )
+    return True, f"Invitation envoyée à {client.email}."
+
+
+def resolve_activation_client(uidb64: str, token: str) -> User | None:
+    """Return the client targeted by a valid, unused activation link."""
+    try:
+        client_id = int(urlsafe_base64_decode(uidb64).decode())
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None
+    client = User.objects.filter(
+        pk=client_id, user_type=User.UserType.INDIVIDUAL, is_active=True
+    ).first()
+    if client is None or client.has_usable_password():
+        return None
+    if not default_token_generator.check_token(client, token):
+        return None
+    return client
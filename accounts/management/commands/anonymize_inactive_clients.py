@@ -0,0 +1,78 @@
+"""Anonymise clients inactive for the retention period, in throttled chunks."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.retention_services import (
+    CLIENT_RETENTION_YEARS,
+    RETENTION_CHUNK_SIZE,
+    run_retention,
+)
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Erase the personal data of clients without recent activity."""
+
+    help = (
+        "Anonymise les clients sans connexion ni rendez-vous depuis N années, "
+        "par petits paquets transactionnels."
+    )
+
+    def add_arguments(self, parser):
+        """Register the retention period and tuning options."""
+        parser.add_argument("--years", type=int, default=CLIENT_RETENTION_YEARS)
+        parser.add_argument("--chunk-size", type=int, default=RETENTION_CHUNK_SIZE)
+        parser.add_argument(
+            "--throttle",
+            type=float,
+            default=0.0,
+            help="Pause en secondes entre deux paquets.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Liste le nombre de clients concernés sans rien modifier.",
+        )
+
+    def handle(self, *args, **options):
+        """Run the retention pass and print its report."""
+        if options["years"] < 1:
+            raise CommandError("--years doit être positif.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size doit être positif.")
+
+        def _report(report):
+            self.stdout.write(f"{report.anonymized} client(s) anonymisé(s)…")
+
+        report = run_retention(
+            years=options["years"],
+            chunk_size=options["chunk_size"],
+            throttle=options["throttle"],
+            dry_run=options["dry_run"],
+            on_chunk=_report if options["verbosity"] > 1 else None,
+        )
+        candidates = sum(report.per_professional.values())
+        if report.dry_run:
+            emails = dict(
+                User.objects.filter(pk__in=list(report.per_professional)).values_list(
+                    "pk", "email"
+                )
+            )
+            for professional_id, count in report.per_professional.most_common():
+                label = emails.get(professional_id, "sans professionnel")
+                self.stdout.write(f"{label} : {count} client(s)")
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Simulation : {candidates} client(s) inactif(s) depuis le "
+                    f"{report.cutoff:%d/%m/%Y} seraient anonymisé(s)."
+                )
+            )
+            return
+        logger.info("Anonymised %s inactive clients", report.anonymized)
+        self.stdout.write(
+            self.style.SUCCESS(f"{report.anonymized} client(s) anonymisé(s).")
+        )
@@ -0,0 +1,54 @@
+"""Compute the duplicate-client groups served by the dashboard."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.duplicate_services import (
+    professionals_with_stale_duplicates,
+    refresh_duplicate_report,
+)
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Scan the clients of each professional and store their duplicates."""
+
+    help = (
+        "Recherche les clients en double et enregistre les groupes affichés "
+        "dans le tableau de bord (à lancer régulièrement, par exemple via cron)."
+    )
+
+    def add_arguments(self, parser):
+        """Register the optional professional filter."""
+        parser.add_argument(
+            "--professional",
+            help=(
+                "Email du professionnel à analyser ; par défaut, tous ceux dont "
+                "les clients ont changé depuis la dernière analyse."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Refresh the requested or out-of-date reports."""
+        if options["professional"]:
+            professional = User.objects.filter_email(options["professional"]).first()
+            if professional is None or not professional.is_professional:
+                raise CommandError("Professionnel introuvable.")
+            professionals = [professional]
+        else:
+            professionals = professionals_with_stale_duplicates()
+        refreshed = 0
+        for professional in professionals:
+            report = refresh_duplicate_report(professional)
+            logger.info(
+                "Found %s duplicate groups for professional %s",
+                len(report.groups),
+                professional.pk,
+            )
+            refreshed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"{refreshed} professionnel(s) analysé(s).")
+        )
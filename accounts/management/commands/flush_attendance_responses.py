@@ -0,0 +1,48 @@
+"""Apply the pending appointment confirmations and cancellations."""
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from accounts.confirmation_services import flush_responses, responses_due
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Write the responses received through signed links in one batch."""
+
+    help = (
+        "Enregistre en une seule transaction les confirmations et annulations "
+        "reçues par lien signé (à lancer régulièrement, par exemple via cron)."
+    )
+
+    def add_arguments(self, parser):
+        """Register the option skipping a flush that is not due yet."""
+        parser.add_argument(
+            "--if-due",
+            action="store_true",
+            help=(
+                "N’applique les réponses que si le lot est plein ou si la plus "
+                "ancienne attend depuis assez longtemps."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Apply the pending responses and print the outcome."""
+        if options["if_due"] and not responses_due():
+            self.stdout.write("Aucune réponse à appliquer pour l’instant.")
+            return
+        report = flush_responses()
+        logger.info(
+            "Applied %s confirmations and %s cancellations (%s ignored)",
+            report.confirmed,
+            report.canceled,
+            report.ignored,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.confirmed} confirmation(s), {report.canceled} "
+                f"annulation(s) enregistrée(s), {report.ignored} ignorée(s)."
+            )
+        )
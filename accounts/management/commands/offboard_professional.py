@@ -0,0 +1,91 @@
+"""Delete a professional account in throttled chunks instead of one cascade."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.offboarding_services import OFFBOARDING_CHUNK_SIZE, offboard_professional
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Deactivate a professional, then remove its data chunk by chunk."""
+
+    help = (
+        "Clôture un compte professionnel : désactivation immédiate puis "
+        "suppression des données par petits paquets transactionnels "
+        "(relancer la commande reprend une clôture interrompue)."
+    )
+
+    def add_arguments(self, parser):
+        """Register the account email and tuning options."""
+        parser.add_argument("email", help="Email du professionnel à clôturer.")
+        parser.add_argument(
+            "--transfer-to",
+            help="Email du professionnel qui reprend les clients et rendez-vous.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=OFFBOARDING_CHUNK_SIZE)
+        parser.add_argument(
+            "--throttle",
+            type=float,
+            default=0.0,
+            help="Pause en secondes entre deux paquets.",
+        )
+
+    def _user(self, email):
+        user = User.objects.filter_email(email).first()
+        if user is None:
+            raise CommandError(f"Utilisateur introuvable : {email}.")
+        return user
+
+    def handle(self, *args, **options):
+        """Run the offboarding and report its progress."""
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size doit être positif.")
+        professional = self._user(options["email"])
+        transfer_to = None
+        if options["transfer_to"]:
+            transfer_to = self._user(options["transfer_to"])
+
+        def _report(report):
+            self.stdout.write(
+                ", ".join(
+                    f"{label} : {count}" for label, count in report.processed.items()
+                )
+            )
+
+        success, report = offboard_professional(
+            professional,
+            transfer_to=transfer_to,
+            chunk_size=options["chunk_size"],
+            throttle=options["throttle"],
+            on_chunk=_report if options["verbosity"] > 1 else None,
+        )
+        if not success:
+            raise CommandError(report)
+
+        if report.reassignment is not None:
+            for conflict in report.reassignment.conflicts:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Conflit : {conflict['title']} ({conflict['start_at']}) "
+                        "n'a pas pu être transféré et a été supprimé."
+                    )
+                )
+            self.stdout.write(
+                f"{report.reassignment.clients} client(s) et "
+                f"{report.reassignment.events_moved} rendez-vous transféré(s)."
+            )
+        logger.info(
+            "Offboarded professional %s (%s rows)",
+            report.professional_id,
+            sum(report.processed.values()),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compte {professional.email} clôturé : "
+                f"{sum(report.processed.values())} ligne(s) traitée(s)."
+            )
+        )
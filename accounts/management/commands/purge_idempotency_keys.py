@@ -0,0 +1,23 @@
+"""Delete expired idempotency keys so the table stays compact."""
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from accounts.idempotency_services import purge_expired_idempotency_keys
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Purge idempotency keys whose TTL has elapsed."""
+
+    help = "Supprime les clés d'idempotence expirées."
+
+    def handle(self, *args, **options):
+        """Run the purge and report how many keys were removed."""
+        deleted = purge_expired_idempotency_keys()
+        logger.info("Purged %s expired idempotency keys", deleted)
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} clé(s) expirée(s) supprimée(s).")
+        )
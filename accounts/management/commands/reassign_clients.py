@@ -0,0 +1,79 @@
+"""Move a professional's clients and upcoming appointments to a colleague."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Calendar
+from accounts.reassignment_services import reassign_professional
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Reassign clients and future events in a single transaction."""
+
+    help = (
+        "Transfère les clients et les rendez-vous à venir d'un professionnel "
+        "vers un autre."
+    )
+
+    def add_arguments(self, parser):
+        """Register the source/target emails and options."""
+        parser.add_argument("source", help="Email du professionnel qui part.")
+        parser.add_argument("target", help="Email du professionnel qui reprend.")
+        parser.add_argument(
+            "--calendar", help="Slug du calendrier cible (par défaut le premier)."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Affiche le résultat sans rien enregistrer.",
+        )
+
+    def _professional(self, email):
+        user = User.objects.filter_email(email).first()
+        if user is None:
+            raise CommandError(f"Utilisateur introuvable : {email}.")
+        return user
+
+    def handle(self, *args, **options):
+        """Run the reassignment and print its report."""
+        source = self._professional(options["source"])
+        target = self._professional(options["target"])
+        calendar = None
+        if options["calendar"]:
+            calendar = Calendar.objects.filter(
+                slug=options["calendar"], owner=target
+            ).first()
+            if calendar is None:
+                raise CommandError("Calendrier cible introuvable.")
+
+        success, report = reassign_professional(
+            source, target, calendar=calendar, dry_run=options["dry_run"]
+        )
+        if not success:
+            raise CommandError(report)
+
+        for conflict in report.conflicts:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Conflit : {conflict['title']} ({conflict['start_at']}) "
+                    "reste sur le calendrier d'origine."
+                )
+            )
+        prefix = "Simulation : " if options["dry_run"] else ""
+        logger.info(
+            "Reassigned %s clients and %s events from %s to %s",
+            report.clients,
+            report.events_moved,
+            source.pk,
+            target.pk,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{report.clients} client(s) et {report.events_moved} "
+                f"rendez-vous transféré(s), {len(report.conflicts)} conflit(s)."
+            )
+        )
@@ -0,0 +1,35 @@
+"""Recompute the denormalised per-client appointment aggregates."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.client_stats_services import rebuild_client_stats
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Rebuild ``ClientStats`` from the attendances with one grouped query."""
+
+    help = "Recalcule les statistiques de rendez-vous des clients."
+
+    def add_arguments(self, parser):
+        """Register the optional professional filter."""
+        parser.add_argument(
+            "--professional",
+            help="Email du professionnel dont les statistiques sont recalculées.",
+        )
+
+    def handle(self, *args, **options):
+        """Rebuild the aggregates and report how many rows were written."""
+        professional_id = None
+        if options["professional"]:
+            professional = User.objects.filter_email(options["professional"]).first()
+            if professional is None or not professional.is_professional:
+                raise CommandError("Professionnel introuvable.")
+            professional_id = professional.pk
+        rows = rebuild_client_stats(professional_id)
+        logger.info("Rebuilt %s client stats rows", rows)
+        self.stdout.write(self.style.SUCCESS(f"{rows} ligne(s) recalculée(s)."))
@@ -0,0 +1,92 @@
+"""Run a registered backfill in resumable, throttled chunks."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.backfill import BACKFILLS, DEFAULT_BACKFILL_CHUNK_SIZE, run_backfill
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Walk a backfill from its checkpoint, one transaction per chunk."""
+
+    help = (
+        "Exécute un backfill par paquets (pagination par clé, une transaction "
+        "par paquet) et reprend au dernier point de contrôle."
+    )
+
+    def add_arguments(self, parser):
+        """Register the backfill name and tuning options."""
+        parser.add_argument("name", nargs="?", help="Nom du backfill à exécuter.")
+        parser.add_argument(
+            "--list", action="store_true", help="Liste les backfills disponibles."
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=DEFAULT_BACKFILL_CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--throttle",
+            type=float,
+            default=0.0,
+            help="Pause en secondes entre deux paquets.",
+        )
+        parser.add_argument(
+            "--max-chunks",
+            type=int,
+            default=None,
+            help="Arrête après ce nombre de paquets (reprise possible).",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Repart du début au lieu du point de contrôle.",
+        )
+
+    def handle(self, *args, **options):
+        """Run the requested backfill and report its progress."""
+        if options["list"] or not options["name"]:
+            for name, backfill in sorted(BACKFILLS.items()):
+                self.stdout.write(f"{name} — {backfill.description}")
+            return
+        backfill = BACKFILLS.get(options["name"])
+        if backfill is None:
+            raise CommandError(f"Backfill inconnu : {options['name']}.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size doit être positif.")
+
+        def _report(checkpoint):
+            self.stdout.write(
+                f"{checkpoint.processed} ligne(s) traitée(s), "
+                f"dernière clé {checkpoint.last_pk}"
+            )
+
+        checkpoint = run_backfill(
+            backfill,
+            chunk_size=options["chunk_size"],
+            throttle=options["throttle"],
+            max_chunks=options["max_chunks"],
+            reset=options["reset"],
+            on_chunk=_report if options["verbosity"] > 1 else None,
+        )
+        logger.info(
+            "Backfill %s at pk %s (%s rows)",
+            backfill.name,
+            checkpoint.last_pk,
+            checkpoint.processed,
+        )
+        if checkpoint.completed_at is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Backfill {backfill.name} interrompu après "
+                    f"{checkpoint.processed} ligne(s) ; relancez pour reprendre."
+                )
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfill {backfill.name} terminé : "
+                f"{checkpoint.processed} ligne(s) traitée(s)."
+            )
+        )
@@ -0,0 +1,52 @@
+# pylint: disable=invalid-name
+"""Add group capacity, attendee counters and waitlist support to events."""
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# Schema only: the counters of existing events are filled in afterwards by
+# ``python manage.py run_backfill event_attendee_counters``, in short
+# resumable chunks, instead of one UPDATE over the whole events table here.
+
+
+class Migration(migrations.Migration):
+    """Migration adding capacity and counter columns for group sessions."""
+
+    dependencies = [
+        ("accounts", "0008_alter_calendar_options_alter_event_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Nombre maximum de participants (vide pour un rendez-vous individuel).",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="attendee_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="confirmed_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="eventattendee",
+            name="is_waitlisted",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="eventattendee",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
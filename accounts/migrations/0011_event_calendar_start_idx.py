@@ -0,0 +1,25 @@
+# pylint: disable=invalid-name
+"""Index events by calendar and start time for range and overlap queries."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration adding the calendar/start index on events."""
+
+    dependencies = [
+        ("accounts", "0010_idempotencykey"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["calendar", "start_at"], name="event_calendar_start_idx"
+            ),
+        ),
+    ]
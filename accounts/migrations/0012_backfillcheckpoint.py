@@ -0,0 +1,40 @@
+# pylint: disable=invalid-name
+"""Add the checkpoint table used by chunked backfills."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration creating the BackfillCheckpoint model."""
+
+    dependencies = [
+        ("accounts", "0011_event_calendar_start_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackfillCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("last_pk", models.BigIntegerField(default=0)),
+                ("processed", models.PositiveBigIntegerField(default=0)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "backfill checkpoint",
+                "verbose_name_plural": "backfill checkpoints",
+            },
+        ),
+    ]
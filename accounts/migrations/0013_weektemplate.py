@@ -0,0 +1,99 @@
+# pylint: disable=invalid-name
+"""Add week templates and their recurring slots."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration creating the WeekTemplate and WeekTemplateSlot models."""
+
+    dependencies = [
+        ("accounts", "0012_backfillcheckpoint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeekTemplate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="week_templates",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="WeekTemplateSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weekday",
+                    models.PositiveSmallIntegerField(
+                        help_text="0 = lundi, 6 = dimanche."
+                    ),
+                ),
+                ("start_time", models.TimeField()),
+                ("duration_minutes", models.PositiveIntegerField()),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True)),
+                ("capacity", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "template",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="accounts.weektemplate",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["weekday", "start_time"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="weektemplate",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "name"), name="unique_week_template_name_per_owner"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# pylint: disable=invalid-name
+"""Index attendees by user for the client appointment history."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add the (user, event) index on EventAttendee."""
+
+    dependencies = [
+        ("accounts", "0013_weektemplate"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventattendee",
+            index=models.Index(
+                fields=["user", "event"], name="attendee_user_event_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# pylint: disable=invalid-name
+"""Add per-client appointment aggregates and the event price snapshot."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Create ClientStats and add Event.price."""
+
+    dependencies = [
+        ("accounts", "0014_attendee_user_event_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=8, null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="ClientStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("visit_count", models.PositiveIntegerField(default=0)),
+                ("last_visit_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "total_spent",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="client_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "professional",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "client stats",
+                "verbose_name_plural": "client stats",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("client", "professional"), name="client_stats_unique"
+                    )
+                ],
+            },
+        ),
+    ]
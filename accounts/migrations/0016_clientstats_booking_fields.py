@@ -0,0 +1,32 @@
+# pylint: disable=invalid-name
+"""Rename the client aggregates after bookings."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Rename the ClientStats fields."""
+
+    dependencies = [
+        ("accounts", "0015_clientstats"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="clientstats",
+            old_name="visit_count",
+            new_name="booking_count",
+        ),
+        migrations.RenameField(
+            model_name="clientstats",
+            old_name="last_visit_at",
+            new_name="last_booking_at",
+        ),
+        migrations.RenameField(
+            model_name="clientstats",
+            old_name="total_spent",
+            new_name="total_booked",
+        ),
+    ]
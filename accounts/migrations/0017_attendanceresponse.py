@@ -0,0 +1,45 @@
+# pylint: disable=invalid-name
+"""Store the responses received through signed links until they are applied."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Create AttendanceResponse."""
+
+    dependencies = [
+        ("accounts", "0016_clientstats_booking_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("attendee_id", models.BigIntegerField()),
+                ("event_id", models.BigIntegerField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("confirm", "Confirmation"), ("cancel", "Annulation")],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "attendance response",
+                "verbose_name_plural": "attendance responses",
+            },
+        ),
+    ]
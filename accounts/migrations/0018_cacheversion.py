@@ -0,0 +1,31 @@
+# pylint: disable=invalid-name
+"""Store the shared versions of per-process caches."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Create CacheVersion."""
+
+    dependencies = [
+        ("accounts", "0017_attendanceresponse"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "cache version",
+                "verbose_name_plural": "cache versions",
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# pylint: disable=invalid-name
+"""Price the week template slots like the events they create."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add WeekTemplateSlot.price."""
+
+    dependencies = [
+        ("accounts", "0018_cacheversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="weektemplateslot",
+            name="price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=8, null=True
+            ),
+        ),
+    ]
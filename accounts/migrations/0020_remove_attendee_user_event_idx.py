@@ -0,0 +1,21 @@
+# pylint: disable=invalid-name
+"""Drop the (user, event) attendee index, redundant with the user FK index."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Remove attendee_user_event_idx from EventAttendee."""
+
+    dependencies = [
+        ("accounts", "0019_weektemplateslot_price"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="eventattendee",
+            name="attendee_user_event_idx",
+        ),
+    ]
@@ -0,0 +1,42 @@
+# pylint: disable=invalid-name
+"""Store the duplicate-client groups computed offline."""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add ClientDuplicateReport."""
+
+    dependencies = [
+        ("accounts", "0020_remove_attendee_user_event_idx"),
+        ("users", "0009_user_email_lower_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientDuplicateReport",
+            fields=[
+                (
+                    "professional",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("groups", models.JSONField(default=list)),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "client duplicate report",
+                "verbose_name_plural": "client duplicate reports",
+            },
+        ),
+    ]
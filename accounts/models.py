@@ -134,6 +134,18 @@ class Event(models.Model):
         default="planned",
     )
 
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Nombre maximum de participants (vide pour un rendez-vous individuel).",
+    )
+    # Service price at booking time, summed into ClientStats.total_booked.
+    price = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+    # Denormalised counters maintained by accounts.attendance_services so the
+    # planner can display occupancy without loading attendee rows.
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -148,6 +160,11 @@ class Event(models.Model):
         """Meta options for Event model."""
 
         ordering = ["start_at"]
+        indexes = [
+            models.Index(
+                fields=["calendar", "start_at"], name="event_calendar_start_idx"
+            )
+        ]
         verbose_name = "event"
         verbose_name_plural = "events"
 
@@ -155,6 +172,16 @@ class Event(models.Model):
         """Return a string representation of the user."""
         return f"{self.title} – {self.start_at} → {self.end_at}"
 
+    @property
+    def is_group(self) -> bool:
+        """Return whether the event is a group session with a capacity."""
+        return self.capacity is not None
+
+    @property
+    def is_full(self) -> bool:
+        """Return whether every seat of a group session is taken."""
+        return self.capacity is not None and self.attendee_count >= self.capacity
+
 
 class EventAttendee(models.Model):
     """Association between an event and a participant."""
@@ -177,6 +204,8 @@ class EventAttendee(models.Model):
         default="required",
     )
     is_confirmed = models.BooleanField(default=False)
+    is_waitlisted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         """Meta options for EventAttendee model."""
@@ -184,3 +213,255 @@ class EventAttendee(models.Model):
         unique_together = ("event", "user")
         verbose_name = "event attendee"
         verbose_name_plural = "event attendees"
+
+
+class ClientStats(models.Model):
+    """Appointment aggregates of a client with a professional.
+
+    Maintained by ``accounts.client_stats_services`` and rebuilt with the
+    ``rebuild_client_stats`` management command.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    professional = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="client_stats",
+    )
+    booking_count = models.PositiveIntegerField(default=0)
+    last_booking_at = models.DateTimeField(null=True, blank=True)
+    total_booked = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta options for ClientStats model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["client", "professional"], name="client_stats_unique"
+            )
+        ]
+        verbose_name = "client stats"
+        verbose_name_plural = "client stats"
+
+    def __str__(self):
+        """Return a string representation of the aggregates."""
+        return f"{self.client_id} · {self.booking_count} rendez-vous"
+
+
+class IdempotencyKey(models.Model):
+    """Outcome of a dashboard write, replayed when the same key is resubmitted.
+
+    Rows are short-lived: they expire after ``IDEMPOTENCY_KEY_TTL`` and are
+    purged by the ``purge_idempotency_keys`` management command.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    key = models.CharField(max_length=64)
+    action = models.CharField(max_length=50)
+    response_status = models.PositiveSmallIntegerField()
+    response_location = models.CharField(max_length=255, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        """Meta options for IdempotencyKey model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key_per_user"
+            )
+        ]
+        verbose_name = "idempotency key"
+        verbose_name_plural = "idempotency keys"
+
+    def __str__(self):
+        """Return a string representation of the key."""
+        return f"{self.action} ({self.key})"
+
+
+class WeekTemplate(models.Model):
+    """Reusable weekly schedule captured from a planner week."""
+
+    # pylint: disable=too-few-public-methods
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="week_templates",
+    )
+    name = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for WeekTemplate model."""
+
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "name"], name="unique_week_template_name_per_owner"
+            )
+        ]
+
+    def __str__(self):
+        """Return a string representation of the template."""
+        return str(self.name)
+
+
+class WeekTemplateSlot(models.Model):
+    """One recurring block of a week template, in local wall-clock time."""
+
+    # pylint: disable=too-few-public-methods
+
+    template = models.ForeignKey(
+        WeekTemplate,
+        on_delete=models.CASCADE,
+        related_name="slots",
+    )
+    weekday = models.PositiveSmallIntegerField(help_text="0 = lundi, 6 = dimanche.")
+    start_time = models.TimeField()
+    duration_minutes = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    # Price of the captured event, copied onto the events the slot creates.
+    price = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        """Meta options for WeekTemplateSlot model."""
+
+        ordering = ["weekday", "start_time"]
+
+    def __str__(self):
+        """Return a string representation of the slot."""
+        return f"{self.title} ({self.weekday} {self.start_time:%H:%M})"
+
+
+class BackfillCheckpoint(models.Model):
+    """Progress of a chunked backfill, so an interrupted run can resume.
+
+    ``last_pk`` is the keyset cursor: the next chunk starts after it.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    name = models.CharField(max_length=100, unique=True)
+    last_pk = models.BigIntegerField(default=0)
+    processed = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta options for BackfillCheckpoint model."""
+
+        verbose_name = "backfill checkpoint"
+        verbose_name_plural = "backfill checkpoints"
+
+    def __str__(self):
+        """Return a string representation of the checkpoint."""
+        return f"{self.name} (> {self.last_pk})"
+
+
+class CacheVersion(models.Model):
+    """Shared version number of a per-process cache entry.
+
+    Workers tag what they keep in memory with the version they read here and
+    rebuild it once the version moves, so a write committed by one worker
+    invalidates the copies held by every other worker.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        """Meta options for CacheVersion model."""
+
+        verbose_name = "cache version"
+        verbose_name_plural = "cache versions"
+
+    def __str__(self):
+        """Return a string representation of the version."""
+        return f"{self.name} (v{self.version})"
+
+
+class AttendanceResponse(models.Model):
+    """A confirmation or cancellation received through a signed link.
+
+    Rows are inserted by the link page and applied, then deleted, in batches
+    by ``accounts.confirmation_services.flush_responses``. The attendee and
+    event are plain ids: a response for a seat deleted meanwhile is ignored.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    class Action(models.TextChoices):
+        """Answers a client can give."""
+
+        CONFIRM = "confirm", "Confirmation"
+        CANCEL = "cancel", "Annulation"
+
+    attendee_id = models.BigIntegerField()
+    event_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=Action.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for AttendanceResponse model."""
+
+        verbose_name = "attendance response"
+        verbose_name_plural = "attendance responses"
+
+    def __str__(self):
+        """Return a string representation of the response."""
+        return f"{self.action} ({self.attendee_id})"
+
+
+class ClientDuplicateReport(models.Model):
+    """Duplicate-client groups of a professional, computed offline.
+
+    Written by the ``find_client_duplicates`` command. ``version`` is the
+    professional's client-index ``CacheVersion`` read before the scan: once
+    a client write moves it, the report is known to be out of date.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    professional = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    groups = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta options for ClientDuplicateReport model."""
+
+        verbose_name = "client duplicate report"
+        verbose_name_plural = "client duplicate reports"
+
+    def __str__(self):
+        """Return a string representation of the report."""
+        return f"{self.professional_id} · {len(self.groups)} groupe(s)"
@@ -0,0 +1,227 @@
+"""Remove a professional account without one huge cascading transaction.
+
+``User.delete`` on a large professional walks ``Calendar`` → ``Event`` →
+``EventAttendee``, ``Service`` and every linked client in a single
+transaction that holds the SQLite write lock until it ends. Offboarding
+deactivates the account at once, then empties each dependent table leaf
+first, in chunks of primary keys deleted (or unlinked) in their own short
+transaction, with an optional pause between chunks. Processed rows leave
+the queryset, so an interrupted run simply resumes when started again; the
+account itself is deleted last, when nothing large is left to cascade.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from django.db import models, transaction
+
+from users.models import User
+
+from .attendance_services import recount_event_counters
+from .client_autocomplete import invalidate_client_index
+from .models import (
+    Calendar,
+    ClientStats,
+    Event,
+    EventAttendee,
+    IdempotencyKey,
+    Service,
+    WeekTemplate,
+    WeekTemplateSlot,
+)
+from .portal_services import invalidate_client_portal
+from .reassignment_services import (
+    ReassignmentReport,
+    check_reassignment,
+    reassign_professional,
+)
+
+OFFBOARDING_CHUNK_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OffboardingReport:
+    """Progress of an offboarding; ``processed`` counts rows per step."""
+
+    professional_id: int
+    processed: Counter = field(default_factory=Counter)
+    reassignment: ReassignmentReport | None = None
+    completed: bool = False
+
+
+def _delete_chunk(queryset: models.QuerySet, size: int) -> int:
+    pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:size])
+    if pks:
+        queryset.model.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def _unlink_chunk(queryset: models.QuerySet, field_name: str, size: int) -> int:
+    pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:size])
+    if pks:
+        queryset.model.objects.filter(pk__in=pks).update(**{field_name: None})
+    return len(pks)
+
+
+def _delete_participations(professional: User, size: int) -> int:
+    """Drop the professional's seats in other calendars and fix the counters."""
+    rows = list(
+        EventAttendee.objects.filter(user=professional)
+        .exclude(event__calendar__owner=professional)
+        .order_by("pk")
+        .values_list("pk", "event_id")[:size]
+    )
+    if rows:
+        EventAttendee.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+        recount_event_counters({event_id for _, event_id in rows})
+    return len(rows)
+
+
+def _delete_attendees(professional: User, size: int) -> int:
+    """Drop the seats in the professional's events and the clients' portals."""
+    rows = list(
+        EventAttendee.objects.filter(event__calendar__owner=professional)
+        .order_by("pk")
+        .values_list("pk", "user_id")[:size]
+    )
+    if rows:
+        EventAttendee.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+        invalidate_client_portal(user_id for _, user_id in rows)
+    return len(rows)
+
+
+# (label, chunk function) in dependency order: children before parents.
+_STEPS: list[tuple[str, Callable[[User, int], int]]] = [
+    ("participations", _delete_participations),
+    ("attendees", _delete_attendees),
+    (
+        "events",
+        lambda pro, size: _delete_chunk(
+            Event.objects.filter(calendar__owner=pro), size
+        ),
+    ),
+    (
+        "calendars",
+        lambda pro, size: _delete_chunk(Calendar.objects.filter(owner=pro), size),
+    ),
+    (
+        "week_template_slots",
+        lambda pro, size: _delete_chunk(
+            WeekTemplateSlot.objects.filter(template__owner=pro), size
+        ),
+    ),
+    (
+        "week_templates",
+        lambda pro, size: _delete_chunk(WeekTemplate.objects.filter(owner=pro), size),
+    ),
+    (
+        "client_stats",
+        lambda pro, size: _delete_chunk(
+            ClientStats.objects.filter(professional=pro), size
+        ),
+    ),
+    (
+        "idempotency_keys",
+        lambda pro, size: _delete_chunk(IdempotencyKey.objects.filter(user=pro), size),
+    ),
+    (
+        "services",
+        lambda pro, size: _delete_chunk(Service.objects.filter(created_by=pro), size),
+    ),
+    (
+        "created_events",
+        lambda pro, size: _unlink_chunk(
+            Event.objects.filter(created_by=pro), "created_by", size
+        ),
+    ),
+    (
+        "clients",
+        lambda pro, size: _unlink_chunk(
+            User.objects.filter(linked_professional=pro), "linked_professional", size
+        ),
+    ),
+]
+
+
+def offboard_professional(
+    professional: User,
+    *,
+    transfer_to: User | None = None,
+    chunk_size: int = OFFBOARDING_CHUNK_SIZE,
+    throttle: float = 0.0,
+    on_chunk: Callable[[OffboardingReport], None] | None = None,
+) -> tuple[bool, OffboardingReport | str]:
+    """Deactivate ``professional`` and delete the account in bounded chunks.
+
+    The transfer target is validated first: a rejected ``transfer_to``
+    leaves the account untouched. The account is then deactivated, before
+    the transfer and any deletion, so it cannot book new appointments that
+    would escape either.
+    Upcoming appointments that conflict with the colleague's calendar stay
+    behind and are deleted with the account: they are listed in
+    ``report.reassignment.conflicts`` and logged as warnings.
+
+    Args:
+        professional: The professional account to remove.
+        transfer_to: Colleague who takes over the clients and upcoming
+            appointments first (see ``reassign_professional``); without it
+            clients are only unlinked and keep their account.
+        chunk_size: Rows per chunk and transaction.
+        throttle: Seconds to sleep between chunks.
+        on_chunk: Called with the running report after each chunk.
+
+    Returns (True, report) on success or (False, message) on failure.
+    """
+    if not professional.is_professional:
+        return False, "Seuls les comptes professionnels peuvent être clôturés."
+    calendar = None
+    if transfer_to is not None:
+        _, checked = check_reassignment(professional, transfer_to)
+        if isinstance(checked, str):
+            return False, checked
+        calendar = checked
+
+    # Logged-out from the next request on (ModelBackend rejects inactive users).
+    User.objects.filter(pk=professional.pk).update(is_active=False)
+    report = OffboardingReport(professional_id=professional.pk)
+    if transfer_to is not None:
+        _, reassignment = reassign_professional(
+            professional, transfer_to, calendar=calendar
+        )
+        if isinstance(reassignment, str):
+            return False, reassignment
+        report.reassignment = reassignment
+        for conflict in reassignment.conflicts:
+            logger.warning(
+                "Offboarding professional %s: event %s (%s, %s) conflicts with "
+                "professional %s and will be deleted",
+                professional.pk,
+                conflict["id"],
+                conflict["title"],
+                conflict["start_at"],
+                transfer_to.pk,
+            )
+
+    for label, process_chunk in _STEPS:
+        while True:
+            with transaction.atomic():
+                count = process_chunk(professional, chunk_size)
+            if not count:
+                break
+            report.processed[label] += count
+            if on_chunk is not None:
+                on_chunk(report)
+            if throttle:
+                time.sleep(throttle)
+
+    invalidate_client_index(professional.pk)
+    User.objects.filter(pk=professional.pk).delete()
+    report.completed = True
+    return True, report
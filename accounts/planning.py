@@ -5,7 +5,7 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import date, datetime, time, timedelta
 
-from django.db.models import Prefetch
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils import timezone
 
 from .constants import (
@@ -17,7 +17,7 @@ from .constants import (
     PLANNER_HOURS as _PLANNER_HOURS,
 )
 from .event_view import EventView
-from .models import Calendar, EventAttendee, Service
+from .models import Calendar, Event, EventAttendee, Service
 
 PLANNER_HOURS = _PLANNER_HOURS
 
@@ -50,7 +50,7 @@ def _weekday_label(value: datetime) -> str:
     return ["Lun.", "Mar.", "Mer.", "Jeu.", "Ven.", "Sam.", "Dim."][value.weekday()]
 
 
-def _start_of_week(week_offset: int) -> date:
+def week_start_for_offset(week_offset: int) -> date:
     """Return the date for the Monday of the requested week offset."""
     today = timezone.localdate()
     current_week_start = today - timedelta(days=today.weekday())
@@ -134,7 +134,13 @@ def _event_colour(index: int) -> str:
 
 
 def _resolve_event_client(event) -> str:
-    """Return the display name for the first attendee if available."""
+    """Return the display name for the first attendee if available.
+
+    Group sessions are summarised by their occupancy instead, so their
+    attendees are never prefetched.
+    """
+    if getattr(event, "capacity", None) is not None:
+        return ""
     attendees = getattr(event, "attendees", None)
     if attendees is None:
         return ""
@@ -146,6 +152,13 @@ def _resolve_event_client(event) -> str:
     return ""
 
 
+def _format_occupancy(event) -> str:
+    """Return the "booked/capacity" label for group sessions."""
+    if getattr(event, "capacity", None) is None:
+        return ""
+    return f"{event.attendee_count}/{event.capacity}"
+
+
 def _build_event_view(
     event, index: int, service_lookup: dict[str, Service]
 ) -> EventView:
@@ -182,6 +195,7 @@ def _build_event_view(
         status=event.get_status_display(),
         created_by=author,
         client=client_name,
+        occupancy=_format_occupancy(event),
         start=start_local.isoformat(),
         end=end_local.isoformat(),
         **_compute_block(start_local, end_local),
@@ -212,11 +226,44 @@ def _group_event_views(
     return merged
 
 
+def _attendee_prefetch() -> Prefetch:
+    """Prefetch client attendees, skipping group sessions shown by occupancy."""
+    return Prefetch(
+        "attendees",
+        queryset=EventAttendee.objects.filter(
+            event__capacity__isnull=True
+        ).select_related("user"),
+    )
+
+
+def build_event_view(event: Event) -> EventView:
+    """Return the planner block of a single event as its week would render it.
+
+    Used after in-place edits (drag-and-drop) so the client can patch one
+    block instead of reloading the whole week.
+    """
+    start_local = timezone.localtime(event.start_at)
+    week_start = timezone.make_aware(
+        datetime.combine(
+            start_local.date() - timedelta(days=start_local.weekday()), time.min
+        ),
+        timezone.get_current_timezone(),
+    )
+    # The colour follows the event's rank within its week, as in the full view.
+    index = Event.objects.filter(
+        calendar_id=event.calendar_id,
+        start_at__gte=week_start,
+        start_at__lt=event.start_at,
+    ).count()
+    prefetch_related_objects([event], "created_by", _attendee_prefetch())
+    return _build_event_view(event, index, _build_service_lookup([event]))
+
+
 def build_calendar_events(
     calendar: Calendar | None, week_offset: int = 0
 ) -> list[dict[str, object]]:
     """Generate planner data either from the database or fallback sample data."""
-    start_of_week = _start_of_week(week_offset)
+    start_of_week = week_start_for_offset(week_offset)
 
     if calendar is None:
         return _fallback_sample_week(start_of_week)
@@ -225,12 +272,9 @@ def build_calendar_events(
     start_dt = timezone.make_aware(datetime.combine(start_of_week, time.min), tz)
     end_dt = start_dt + timedelta(days=7)
 
-    attendee_prefetch = Prefetch(
-        "attendees", queryset=EventAttendee.objects.select_related("user")
-    )
     queryset = list(
         calendar.events.select_related("created_by")
-        .prefetch_related(attendee_prefetch)
+        .prefetch_related(_attendee_prefetch())
         .filter(start_at__gte=start_dt, start_at__lt=end_dt)
         .order_by("start_at")
     )
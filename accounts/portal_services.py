@@ -0,0 +1,93 @@
+"""Appointments of one client across every professional, for the client portal.
+
+The portal is served from one projected query over ``EventAttendee(user)``
+(the foreign key index) joined to the events, their calendar and its owner. The rows are cached per client in Django's cache, under a
+key carrying the client's ``CacheVersion``; the services that add, remove
+or change attendances call ``invalidate_client_portal`` with the clients
+they touched, which bumps those versions in the same transaction. The
+version lives in the database, so a write handled by one worker retires the
+rows cached by every worker, whichever cache backend is configured; a page
+view costs one primary-key query for the version. Upcoming and past
+appointments are split when the page is rendered, so the cache never holds
+a stale "now".
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import User
+
+from .cache_versions import bump_versions, read_version
+from .models import EventAttendee
+
+PORTAL_CACHE_TIMEOUT = 60 * 15
+PORTAL_HISTORY_DAYS = 365
+PORTAL_PAST_LIMIT = 20
+_PORTAL_KEY = "accounts:client-portal:{}:{}"
+_VERSION_NAME = "client-portal:{}"
+
+
+@dataclass
+class ClientPortal:
+    """A client's upcoming appointments (soonest first) and past ones."""
+
+    upcoming: list[dict]
+    past: list[dict]
+
+
+def invalidate_client_portal(client_ids: Iterable[int]) -> None:
+    """Retire the cached portal of ``client_ids`` in every worker.
+
+    Call it inside the transaction of the attendance write, so the bump
+    commits or rolls back with it.
+    """
+    bump_versions(_VERSION_NAME.format(client_id) for client_id in client_ids)
+
+
+def _load_appointments(client_id: int) -> list[dict]:
+    since = timezone.now() - timedelta(days=PORTAL_HISTORY_DAYS)
+    rows = list(
+        EventAttendee.objects.filter(user_id=client_id, event__start_at__gte=since)
+        .order_by("event__start_at", "event_id")
+        .values(
+            "id",
+            "event_id",
+            "is_confirmed",
+            "is_waitlisted",
+            title=F("event__title"),
+            start_at=F("event__start_at"),
+            end_at=F("event__end_at"),
+            status=F("event__status"),
+            first_name=F("event__calendar__owner__first_name"),
+            last_name=F("event__calendar__owner__last_name"),
+            email=F("event__calendar__owner__email"),
+            phone_number=F("event__calendar__owner__phone_number"),
+        )
+    )
+    for row in rows:
+        name = f"{row.pop('first_name')} {row.pop('last_name')}".strip()
+        row["professional"] = name or row["email"]
+    return rows
+
+
+def client_portal(client: User) -> ClientPortal:
+    """Return the appointments of ``client`` over the last year and to come."""
+    # Read before the rows, so rows loaded after a concurrent write are
+    # stored under the old version and never served again.
+    version = read_version(_VERSION_NAME.format(client.pk))
+    key = _PORTAL_KEY.format(client.pk, version)
+    rows = cache.get(key)
+    if rows is None:
+        rows = _load_appointments(client.pk)
+        cache.set(key, rows, PORTAL_CACHE_TIMEOUT)
+    now = timezone.now()
+    upcoming = [row for row in rows if row["end_at"] > now]
+    past = [row for row in reversed(rows) if row["end_at"] <= now]
+    return ClientPortal(upcoming=upcoming, past=past[:PORTAL_PAST_LIMIT])
@@ -0,0 +1,139 @@
+"""Hand a professional's clients and upcoming appointments to a colleague.
+
+Everything happens in one transaction with set-based writes: clients are
+re-linked with one ``UPDATE`` (no per-row ``User.save``/``full_clean``) and
+upcoming events are moved to the colleague's calendar in chunks of
+``UPDATE ... WHERE id IN (...)``. Conflicts are detected with one range
+query on the target calendar per day that has appointments to move; a
+conflicting event stays on the source calendar and is reported.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import User
+
+from .client_autocomplete import invalidate_client_index
+from .client_stats_services import attendee_ids, refresh_client_stats
+from .models import Calendar, Event
+from .portal_services import invalidate_client_portal
+
+REASSIGN_CHUNK_SIZE = 500
+
+
+@dataclass
+class ReassignmentReport:
+    """Outcome of a reassignment; ``conflicts`` lists the events left behind."""
+
+    clients: int = 0
+    events_moved: int = 0
+    conflicts: list[dict] = field(default_factory=list)
+
+
+def _overlaps(start: datetime, end: datetime, busy: list[tuple[datetime, datetime]]):
+    return any(start < busy_end and end > busy_start for busy_start, busy_end in busy)
+
+
+def _movable_events(
+    events: list[tuple[int, str, datetime, datetime]], calendar: Calendar
+) -> tuple[list[int], list[dict]]:
+    """Split ``events`` into movable ids and conflicts, one query per day."""
+    by_day: dict[date, list[tuple[int, str, datetime, datetime]]] = defaultdict(list)
+    for event in events:
+        by_day[timezone.localdate(event[2])].append(event)
+
+    movable: list[int] = []
+    conflicts: list[dict] = []
+    for day_events in by_day.values():
+        busy = list(
+            Event.objects.filter(
+                calendar=calendar,
+                start_at__lt=max(end_at for _, _, _, end_at in day_events),
+                end_at__gt=min(start_at for _, _, start_at, _ in day_events),
+            )
+            .exclude(status="canceled")
+            .values_list("start_at", "end_at")
+        )
+        for event_id, title, start_at, end_at in day_events:
+            if _overlaps(start_at, end_at, busy):
+                conflicts.append(
+                    {"id": event_id, "title": title, "start_at": start_at.isoformat()}
+                )
+                continue
+            movable.append(event_id)
+            busy.append((start_at, end_at))
+    return movable, conflicts
+
+
+def check_reassignment(
+    source: User, target: User, calendar: Calendar | None = None
+) -> tuple[bool, Calendar | str]:
+    """Validate a reassignment from `source` to `target` without writing.
+
+    Returns (True, calendar receiving the events) or (False, message).
+    """
+    if not (source.is_professional and target.is_professional):
+        return False, "Les deux comptes doivent être professionnels."
+    if source.pk == target.pk:
+        return False, "Choisissez un professionnel différent."
+    if calendar is None:
+        calendar = Calendar.objects.filter(owner=target).order_by("pk").first()
+    if calendar is None or calendar.owner_id != target.pk:
+        return False, "Le professionnel cible n'a pas de calendrier."
+    return True, calendar
+
+
+def reassign_professional(
+    source: User,
+    target: User,
+    *,
+    calendar: Calendar | None = None,
+    dry_run: bool = False,
+) -> tuple[bool, ReassignmentReport | str]:
+    """Move the clients and upcoming events of `source` to `target`.
+
+    Upcoming non-canceled events go to ``calendar`` (default: the target's
+    first calendar). Past events stay where they are, as the history of
+    `source`. With ``dry_run`` the work is done and then rolled back, so the
+    report shows exactly what would change.
+
+    Returns (True, report) on success or (False, message) on failure.
+    """
+    _, checked = check_reassignment(source, target, calendar)
+    if isinstance(checked, str):
+        return False, checked
+    calendar = checked
+
+    report = ReassignmentReport()
+    with transaction.atomic():
+        report.clients = User.objects.filter(
+            linked_professional=source, user_type=User.UserType.INDIVIDUAL
+        ).update(linked_professional=target)
+
+        events = list(
+            Event.objects.filter(calendar__owner=source, start_at__gte=timezone.now())
+            .exclude(status="canceled")
+            .order_by("start_at")
+            .values_list("pk", "title", "start_at", "end_at")
+        )
+        movable, report.conflicts = _movable_events(events, calendar)
+        for start in range(0, len(movable), REASSIGN_CHUNK_SIZE):
+            chunk = movable[start : start + REASSIGN_CHUNK_SIZE]
+            report.events_moved += Event.objects.filter(pk__in=chunk).update(
+                calendar=calendar, updated_at=timezone.now()
+            )
+        clients = attendee_ids(movable)
+        refresh_client_stats(clients)
+        # Rolled back with the rest on a dry run.
+        invalidate_client_portal(clients)
+        invalidate_client_index(source.pk)
+        invalidate_client_index(target.pk)
+        if dry_run:
+            transaction.set_rollback(True)
+    return True, report
@@ -0,0 +1,143 @@
+"""Anonymise clients without activity for a retention period.
+
+Deleting users would cascade through their attendances row by row and hold
+the SQLite write lock for the whole run. Clients are anonymised in place
+instead: candidates are read in primary-key order (keyset, no OFFSET) and
+each chunk is rewritten with one ``UPDATE`` in its own short transaction,
+with an optional pause between chunks. Appointment history and aggregates
+stay attached to the anonymous row. Rows are never purged: anonymised
+clients are left out of the client list, the booking options, the
+autocomplete index and the invitations instead.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import CharField, Exists, OuterRef, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from users.models import User
+
+from .client_autocomplete import invalidate_client_index
+from .models import EventAttendee
+
+CLIENT_RETENTION_YEARS = 3
+RETENTION_CHUNK_SIZE = 200
+ANONYMIZED_EMAIL_DOMAIN = "anonyme.invalid"
+
+
+@dataclass
+class RetentionReport:
+    """Outcome of a retention run; ``per_professional`` counts candidates."""
+
+    cutoff: datetime
+    dry_run: bool
+    anonymized: int = 0
+    per_professional: Counter = field(default_factory=Counter)
+
+
+def retention_cutoff(years: int = CLIENT_RETENTION_YEARS) -> datetime:
+    """Return the instant before which a client counts as inactive."""
+    return timezone.now() - timedelta(days=365 * years)
+
+
+def inactive_clients(cutoff: datetime):
+    """Return the clients with no login nor appointment since ``cutoff``."""
+    recent_attendance = EventAttendee.objects.filter(
+        user=OuterRef("pk"), event__start_at__gte=cutoff
+    )
+    return (
+        User.objects.filter(
+            user_type=User.UserType.INDIVIDUAL,
+            anonymized_at__isnull=True,
+            date_joined__lt=cutoff,
+        )
+        .filter(Q(last_login__isnull=True) | Q(last_login__lt=cutoff))
+        .exclude(Exists(recent_attendance))
+    )
+
+
+def _candidate_chunks(
+    cutoff: datetime, chunk_size: int
+) -> Iterator[list[tuple[int, int | None]]]:
+    last_pk = 0
+    while True:
+        chunk = list(
+            inactive_clients(cutoff)
+            .filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "linked_professional_id")[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def anonymize_clients(pks: list[int], cutoff: datetime) -> int:
+    """Erase the personal fields of ``pks`` with one UPDATE; return the count.
+
+    The inactivity conditions are checked again by the UPDATE itself, so a
+    client who logged in or booked since the chunk was read is skipped. The
+    email becomes ``anonyme-<id>@anonyme.invalid`` so it stays unique, the
+    password is made unusable and the account is deactivated.
+    """
+    return (
+        inactive_clients(cutoff)
+        .filter(pk__in=pks)
+        .update(
+            email=Concat(
+                Value("anonyme-"),
+                Cast("pk", CharField()),
+                Value(f"@{ANONYMIZED_EMAIL_DOMAIN}"),
+            ),
+            first_name="",
+            last_name="",
+            phone_number="",
+            phone_key="",
+            password="!",
+            is_active=False,
+            anonymized_at=timezone.now(),
+        )
+    )
+
+
+def run_retention(
+    *,
+    years: int = CLIENT_RETENTION_YEARS,
+    chunk_size: int = RETENTION_CHUNK_SIZE,
+    throttle: float = 0.0,
+    dry_run: bool = False,
+    on_chunk: Callable[[RetentionReport], None] | None = None,
+) -> RetentionReport:
+    """Anonymise every client inactive for ``years`` years.
+
+    Args:
+        years: Retention period without login nor appointment.
+        chunk_size: Clients per chunk and transaction.
+        throttle: Seconds to sleep between chunks.
+        dry_run: Only count the candidates, per professional.
+        on_chunk: Called with the running report after each chunk.
+    """
+    report = RetentionReport(cutoff=retention_cutoff(years), dry_run=dry_run)
+    for chunk in _candidate_chunks(report.cutoff, chunk_size):
+        report.per_professional.update(professional_id for _, professional_id in chunk)
+        if not dry_run:
+            with transaction.atomic():
+                report.anonymized += anonymize_clients(
+                    [pk for pk, _ in chunk], report.cutoff
+                )
+            for professional_id in {professional_id for _, professional_id in chunk}:
+                invalidate_client_index(professional_id)
+        if on_chunk is not None:
+            on_chunk(report)
+        if throttle and not dry_run:
+            time.sleep(throttle)
+    return report
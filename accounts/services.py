@@ -8,6 +8,9 @@ from django.shortcuts import get_object_or_404
 from .forms import CategoryForm, ServiceForm
 from .models import Service
 
+# Columns written by the set-based service edits (dashboard batches, imports).
+SERVICE_BATCH_FIELDS = ["name", "category", "price", "duration_minutes"]
+
 
 def prepare_service_form(
     service_id: int | None = None, *, data: dict[str, Any] | None = None
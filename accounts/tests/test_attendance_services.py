@@ -0,0 +1,122 @@
+"""Tests for group session attendance and denormalised counters."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.attendance_services import join_event, leave_event
+from accounts.client_services import delete_client
+from accounts.models import Calendar, Event, EventAttendee
+from accounts.planning import build_calendar_events
+
+User = get_user_model()
+
+
+class AttendanceServicesTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="coach@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.professional, name="Cours", slug="cours"
+        )
+        start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        self.event = self.calendar.events.create(
+            title="Yoga collectif",
+            start_at=start,
+            end_at=start + timedelta(hours=1),
+            capacity=2,
+        )
+        self.clients = [
+            User.objects.create_user(
+                email=f"member{index}@example.com",
+                password="safe-password",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.professional,
+            )
+            for index in range(3)
+        ]
+
+    def test_join_event_waitlists_when_full(self):
+        for client in self.clients:
+            success, _ = join_event(self.professional, self.event.pk, client.pk)
+            self.assertTrue(success)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 2)
+        self.assertTrue(self.event.is_full)
+        waitlisted = EventAttendee.objects.get(event=self.event, is_waitlisted=True)
+        self.assertEqual(waitlisted.user, self.clients[2])
+
+    def test_deleting_a_seated_client_promotes_the_waitlist(self):
+        for client in self.clients:
+            join_event(self.professional, self.event.pk, client.pk)
+
+        success, _ = delete_client(self.professional, self.clients[0].pk)
+
+        self.assertTrue(success)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 2)
+        self.assertFalse(
+            EventAttendee.objects.filter(event=self.event, is_waitlisted=True).exists()
+        )
+
+    def test_join_event_rejects_duplicate_and_foreign_event(self):
+        join_event(self.professional, self.event.pk, self.clients[0].pk)
+        success, message = join_event(
+            self.professional, self.event.pk, self.clients[0].pk
+        )
+        self.assertFalse(success)
+        self.assertIn("déjà inscrit", message)
+
+        other_pro = User.objects.create_user(
+            email="other@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        success, _ = join_event(other_pro, self.event.pk, self.clients[1].pk)
+        self.assertFalse(success)
+
+    def test_leave_event_promotes_oldest_waitlisted_attendee(self):
+        for client in self.clients:
+            join_event(self.professional, self.event.pk, client.pk)
+        EventAttendee.objects.filter(user=self.clients[0]).update(is_confirmed=True)
+        Event.objects.filter(pk=self.event.pk).update(confirmed_count=1)
+
+        success, _ = leave_event(self.professional, self.event.pk, self.clients[0].pk)
+
+        self.assertTrue(success)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 2)
+        self.assertEqual(self.event.confirmed_count, 0)
+        self.assertFalse(
+            EventAttendee.objects.get(user=self.clients[2]).is_waitlisted
+        )
+
+    def test_leave_event_frees_seat_without_waitlist(self):
+        join_event(self.professional, self.event.pk, self.clients[0].pk)
+
+        leave_event(self.professional, self.event.pk, self.clients[0].pk)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 0)
+        success, message = leave_event(
+            self.professional, self.event.pk, self.clients[0].pk
+        )
+        self.assertFalse(success)
+        self.assertIsNotNone(message)
+
+    def test_planner_shows_occupancy_without_client_name(self):
+        join_event(self.professional, self.event.pk, self.clients[0].pk)
+
+        data = build_calendar_events(self.calendar)
+        event_data = next(event for day in data for event in day["events"])
+
+        self.assertEqual(event_data["occupancy"], "1/2")
+        self.assertEqual(event_data["client"], "")
@@ -0,0 +1,150 @@
+"""Tests for the chunked backfill framework."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.backfill import BACKFILLS, Backfill, register_backfill, run_backfill
+from accounts.models import (
+    BackfillCheckpoint,
+    Calendar,
+    Category,
+    ClientStats,
+    Event,
+    EventAttendee,
+    Service,
+)
+
+User = get_user_model()
+
+
+class EventCountersBackfillTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="backfill-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        client = User.objects.create_user(
+            email="backfill-client@example.com",
+            password="safe-password",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        calendar = Calendar.objects.create(
+            owner=self.professional, name="Agenda", slug="backfill-agenda"
+        )
+        start = timezone.now()
+        self.events = [
+            Event.objects.create(
+                calendar=calendar,
+                title=f"RDV {index}",
+                start_at=start + timedelta(hours=index),
+                end_at=start + timedelta(hours=index, minutes=30),
+            )
+            for index in range(5)
+        ]
+        for event in self.events:
+            EventAttendee.objects.create(event=event, user=client, is_confirmed=True)
+        # Drop the demo events seeded by migrations to keep counts exact.
+        Event.objects.exclude(pk__in=[event.pk for event in self.events]).delete()
+        Event.objects.update(attendee_count=0, confirmed_count=0)
+        self.backfill = BACKFILLS["event_attendee_counters"]
+
+    def test_backfill_resumes_from_checkpoint(self):
+        checkpoint = run_backfill(self.backfill, chunk_size=2, max_chunks=1)
+
+        self.assertIsNone(checkpoint.completed_at)
+        self.assertEqual(checkpoint.processed, 2)
+        self.assertEqual(Event.objects.filter(attendee_count=1).count(), 2)
+
+        checkpoint = run_backfill(self.backfill, chunk_size=2)
+
+        self.assertIsNotNone(checkpoint.completed_at)
+        self.assertEqual(checkpoint.processed, 5)
+        self.assertEqual(checkpoint.last_pk, self.events[-1].pk)
+        self.assertEqual(
+            Event.objects.filter(attendee_count=1, confirmed_count=1).count(), 5
+        )
+
+    def test_each_chunk_costs_a_bounded_number_of_queries(self):
+        # Checkpoint creation, then per chunk: savepoint, key SELECT, one
+        # UPDATE, checkpoint UPDATE, release; plus the final empty chunk.
+        with self.assertNumQueries(4 + 5 * 5 + 4):
+            run_backfill(self.backfill, chunk_size=1)
+
+    def test_command_reports_completion_and_reset(self):
+        out = StringIO()
+        call_command("run_backfill", "event_attendee_counters", stdout=out)
+        self.assertIn("terminé", out.getvalue())
+
+        call_command(
+            "run_backfill",
+            "event_attendee_counters",
+            "--reset",
+            "--max-chunks=1",
+            "--chunk-size=3",
+            stdout=out,
+        )
+        checkpoint = BackfillCheckpoint.objects.get(name="event_attendee_counters")
+        self.assertEqual(checkpoint.processed, 3)
+        self.assertIn("interrompu", out.getvalue())
+
+
+class EventPriceBackfillTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="price-pro@example.com", user_type=User.UserType.PROFESSIONAL
+        )
+        self.other = User.objects.create_user(
+            email="price-other@example.com", user_type=User.UserType.PROFESSIONAL
+        )
+        self.client_user = User.objects.create_user(
+            email="price-client@example.com",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        category = Category.objects.create(name="Soins")
+        Service.objects.create(category=category, name="Massage", price="60.00", created_by=self.professional)
+        Service.objects.create(category=category, name="Yoga", price="15.00", created_by=self.other)
+        calendar = Calendar.objects.create(owner=self.professional, name="Agenda", slug="price-agenda")
+        start = timezone.now() - timedelta(days=30)
+        self.massage, self.yoga = [
+            Event.objects.create(
+                calendar=calendar, title=title, start_at=start, end_at=start + timedelta(hours=1), attendee_count=1
+            )
+            for title in ("Massage", "Yoga")
+        ]
+        for event in (self.massage, self.yoga):
+            EventAttendee.objects.create(event=event, user=self.client_user)
+
+    def test_prices_events_from_the_owner_service_and_refreshes_totals(self):
+        checkpoint = run_backfill(BACKFILLS["event_prices"], chunk_size=1)
+
+        self.assertIsNotNone(checkpoint.completed_at)
+        self.massage.refresh_from_db()
+        self.yoga.refresh_from_db()
+        self.assertEqual(str(self.massage.price), "60.00")
+        # Another professional's service never prices this calendar.
+        self.assertIsNone(self.yoga.price)
+        stats = ClientStats.objects.get(client=self.client_user)
+        self.assertEqual((stats.booking_count, str(stats.total_booked)), (2, "60.00"))
+
+
+class BackfillRegistryTests(TestCase):
+    def test_incomplete_backfill_cannot_be_registered(self):
+        class Incomplete(Backfill):
+            name = "incomplete"
+
+            def get_queryset(self):
+                return Event.objects.all()
+
+        with self.assertRaises(TypeError):
+            register_backfill(Incomplete)
+        self.assertNotIn("incomplete", BACKFILLS)
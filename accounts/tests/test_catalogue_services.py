@@ -0,0 +1,135 @@
+"""Tests for the CSV service catalogue import."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.catalogue_services import import_service_catalogue
+from accounts.models import Category, Service
+
+User = get_user_model()
+
+
+class ImportServiceCatalogueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="catalogue@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+    def test_import_creates_and_updates_services_by_name(self):
+        category = Category.objects.create(name="Coiffure")
+        existing = Service.objects.create(
+            category=category, name="Coupe", price=20, created_by=self.user
+        )
+        lines = [
+            "name;category;price;duration_minutes\n",
+            "Coupe;Coiffure;25,50;30\n",
+            "Pose gel;Onglerie;40;60\n",
+            "\n",
+            ";Onglerie;10;\n",
+            "Vernis;Onglerie;-3;\n",
+        ]
+
+        report = import_service_catalogue(self.user, lines)
+
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.assertEqual([error["line"] for error in report.errors], [5, 6])
+        self.assertIn("price", report.errors[1]["errors"])
+        existing.refresh_from_db()
+        self.assertEqual(str(existing.price), "25.50")
+        self.assertEqual(existing.duration_minutes, 30)
+        gel = Service.objects.get(name="Pose gel")
+        self.assertEqual(gel.category.name, "Onglerie")
+        self.assertEqual(gel.created_by, self.user)
+
+    def test_reimport_does_not_duplicate(self):
+        lines = ["name,category\n", "Retouche,Couture\n", "Retouche,Couture\n"]
+
+        import_service_catalogue(self.user, lines)
+        report = import_service_catalogue(self.user, lines)
+
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(Service.objects.filter(name="Retouche").count(), 1)
+
+    def test_missing_required_column_is_rejected(self):
+        with self.assertRaises(ValueError):
+            import_service_catalogue(self.user, ["name,price\n", "Coupe,20\n"])
+
+    def test_malformed_row_stops_the_import_after_committed_chunks(self):
+        lines = ["name,category\n"] + [f"Soin {index},Soins\n" for index in range(600)]
+        lines.append('"' + "x" * 200_000 + '",Soins\n')
+
+        report = import_service_catalogue(self.user, lines)
+
+        self.assertEqual(report.created, 500)
+        self.assertIn("mal formé", report.error)
+        self.assertEqual(Service.objects.filter(created_by=self.user).count(), 500)
+
+    def test_large_import_uses_chunked_queries(self):
+        lines = ["name,category,price\n"] + [
+            f"Prestation {index},Catégorie {index % 20},{index % 90}\n"
+            for index in range(2000)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = import_service_catalogue(self.user, lines)
+
+        self.assertEqual(report.created, 2000)
+        self.assertEqual(report.error_count, 0)
+        # A handful of statements per 500-row chunk instead of one per row.
+        self.assertLess(len(queries), 100)
+
+
+class ImportServicesViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="catalogue-view@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.url = reverse("services_import")
+        self.client.login(email=self.user.email, password="safe-password")
+
+    def test_upload_returns_report(self):
+        upload = SimpleUploadedFile(
+            "catalogue.csv",
+            "\ufeffname;category;price\nBrushing;Coiffure;18\n".encode(),
+            content_type="text/csv",
+        )
+
+        response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertTrue(
+            Service.objects.filter(name="Brushing", created_by=self.user).exists()
+        )
+
+    def test_undecodable_upload_reports_the_committed_rows(self):
+        rows = "".join(f"Soin {index};Soins\n" for index in range(1200))
+        upload = SimpleUploadedFile(
+            "catalogue.csv", ("name;category\n" + rows).encode() + b"Caf\xe9;Soins\n"
+        )
+
+        response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 400)
+        payload = response.json()
+        self.assertIn("UTF-8", payload["error"])
+        self.assertEqual(payload["created"], 1000)
+        self.assertEqual(Service.objects.filter(created_by=self.user).count(), 1000)
+
+    def test_upload_with_bad_header_is_rejected(self):
+        upload = SimpleUploadedFile("catalogue.csv", b"nom;tarif\nBrushing;18\n")
+
+        response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("category", response.json()["error"])
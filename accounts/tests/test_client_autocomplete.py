@@ -0,0 +1,113 @@
+"""Tests for the in-memory client autocomplete index."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.client_autocomplete import (
+    ClientPrefixIndex,
+    autocomplete_clients,
+    get_client_index,
+    invalidate_client_index,
+    normalize_search_text,
+)
+from accounts.client_services import create_client, delete_client
+from accounts.models import CacheVersion
+
+User = get_user_model()
+
+
+class ClientPrefixIndexTests(TestCase):
+    def setUp(self):
+        self.index = ClientPrefixIndex(
+            [
+                (1, "Élodie", "Martin", "elodie@example.com", "06 12 34 56 78"),
+                (2, "Marc", "Durand", "marc.d@example.com", ""),
+                (3, "", "", "zoe@example.com", ""),
+            ]
+        )
+
+    def test_normalization_drops_accents_and_case(self):
+        self.assertEqual(normalize_search_text("  ÉLODIE   Martin "), "elodie martin")
+
+    def test_matches_names_in_both_orders_email_and_phone(self):
+        self.assertEqual(self.index.search("elo"), [{"id": 1, "label": "Élodie Martin"}])
+        self.assertEqual([m["id"] for m in self.index.search("martin e")], [1])
+        self.assertEqual([m["id"] for m in self.index.search("mar")], [2, 1])
+        self.assertEqual([m["id"] for m in self.index.search("0612")], [1])
+        self.assertEqual(self.index.search("zoe"), [{"id": 3, "label": "zoe@example.com"}])
+
+    def test_empty_query_and_limit(self):
+        self.assertEqual(self.index.search("  "), [])
+        self.assertEqual(len(self.index.search("m", limit=1)), 1)
+
+
+class AutocompleteClientsTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="complete-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        _, self.client_user = create_client(
+            self.professional,
+            {"email": "nadia@example.com", "first_name": "Nadia", "last_name": "Roux"},
+        )
+
+    def test_lookups_are_served_from_memory(self):
+        autocomplete_clients(self.professional, "nad")
+
+        # Only the shared version is read.
+        with self.assertNumQueries(1):
+            results = autocomplete_clients(self.professional, "rou")
+
+        self.assertEqual(results, [{"id": self.client_user.pk, "label": "Nadia Roux"}])
+
+    def test_client_writes_invalidate_the_index(self):
+        self.assertEqual(autocomplete_clients(self.professional, "noe"), [])
+
+        create_client(self.professional, {"email": "noe@example.com", "first_name": "Noé"})
+        self.assertEqual(len(autocomplete_clients(self.professional, "noe")), 1)
+
+        delete_client(self.professional, self.client_user.pk)
+        self.assertEqual(autocomplete_clients(self.professional, "nadia"), [])
+
+    def test_rolled_back_write_keeps_the_index(self):
+        index = get_client_index(self.professional)
+
+        try:
+            with transaction.atomic():
+                invalidate_client_index(self.professional.pk)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertIs(get_client_index(self.professional), index)
+
+    def test_a_write_committed_by_another_worker_invalidates_the_index(self):
+        index = get_client_index(self.professional)
+        # Another worker added a client and bumped the shared version.
+        User.objects.create_user(
+            email="lea@example.com",
+            first_name="Léa",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        CacheVersion.objects.filter(name=f"client-index:{self.professional.pk}").update(
+            version=F("version") + 1
+        )
+
+        self.assertIsNot(get_client_index(self.professional), index)
+        self.assertEqual(len(autocomplete_clients(self.professional, "lea")), 1)
+
+    def test_endpoint_returns_matches(self):
+        self.client.login(email=self.professional.email, password="safe-password")
+
+        response = self.client.get(reverse("client_autocomplete"), {"q": "nadia r"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["id"], self.client_user.pk)
@@ -1,10 +1,27 @@
 """Unit tests for accounts.client_services."""
 from mixer.backend.django import mixer
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
 
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from accounts.client_services import create_client, update_client, delete_client
+from accounts.client_services import (
+    create_client,
+    delete_client,
+    find_client_by_phone,
+    import_clients,
+    list_client_appointments,
+    list_clients_page,
+    update_client,
+)
+
+from accounts.models import Calendar, Event, EventAttendee
 
 User = get_user_model()
 
@@ -72,3 +89,200 @@ class ClientServicesTests(TestCase):
         success2, message2 = delete_client(self.professional, 99999)
         self.assertFalse(success2)
         self.assertIsNotNone(message2)
+
+
+class ClientImportTests(TestCase):
+    def setUp(self):
+        self.professional = mixer.blend(User, email="import-pro@example.com", user_type=User.UserType.PROFESSIONAL)
+
+    def test_import_creates_linked_clients_and_reports_duplicates(self):
+        mixer.blend(User, email="taken@example.com", user_type=User.UserType.PROFESSIONAL)
+        lines = [
+            "email;first_name;last_name;phone_number\n",
+            "Alice@Example.com;Alice;Martin;0600000001\n",
+            "TAKEN@example.com;Bob;Durand;\n",
+            "alice@example.com;Alice;Bis;\n",
+            "pas-un-email;Chloé;Petit;\n",
+        ]
+
+        report = import_clients(self.professional, lines)
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error["line"] for error in report.errors], [3, 4, 5])
+        client = User.objects.get(email="alice@example.com")
+        self.assertEqual(client.linked_professional, self.professional)
+        self.assertEqual(client.user_type, User.UserType.INDIVIDUAL)
+        self.assertFalse(client.has_usable_password())
+
+    def test_broken_file_keeps_and_indexes_the_committed_clients(self):
+        lines = ["email\n"] + [f"partial{index}@example.com\n" for index in range(600)]
+        lines.append('"' + "x" * 200_000 + '"\n')
+
+        with mock.patch("accounts.client_services.invalidate_client_index") as invalidate:
+            report = import_clients(self.professional, lines)
+
+        self.assertEqual(report.created, 500)
+        self.assertTrue(report.error)
+        self.assertEqual(User.objects.filter(linked_professional=self.professional).count(), 500)
+        invalidate.assert_called_once_with(self.professional.pk)
+
+    def test_import_is_denied_for_individual(self):
+        individual = mixer.blend(User, user_type=User.UserType.INDIVIDUAL, linked_professional=self.professional)
+        with self.assertRaises(PermissionError):
+            import_clients(individual, ["email\n", "x@example.com\n"])
+
+    def test_large_import_runs_in_chunked_inserts(self):
+        lines = ["email,first_name\n"] + [f"client{index}@example.com,Client {index}\n" for index in range(2000)]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = import_clients(self.professional, lines)
+
+        self.assertEqual(report.created, 2000)
+        self.assertLess(len(queries), 100)
+        email_lookups = [query["sql"] for query in queries if 'LOWER("users_user"."email") IN' in query["sql"]]
+        self.assertEqual(len(email_lookups), 4)
+
+
+class ClientListPageTests(TestCase):
+    def setUp(self):
+        self.professional = mixer.blend(User, email="list-pro@example.com", user_type=User.UserType.PROFESSIONAL)
+        names = [("Martin", "Zoé"), ("Martin", "Alice"), ("Durand", "Paul"), ("Bernard", "Léa"), ("Martin", "Alice")]
+        self.clients = [
+            User.objects.create_user(
+                email=f"list-{index}@example.com",
+                last_name=last_name,
+                first_name=first_name,
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.professional,
+            )
+            for index, (last_name, first_name) in enumerate(names)
+        ]
+        mixer.blend(User, email="elsewhere@example.com", user_type=User.UserType.INDIVIDUAL, linked_professional=mixer.blend(User, user_type=User.UserType.PROFESSIONAL))
+
+    def test_pages_follow_name_order_with_id_tiebreak(self):
+        first = list_clients_page(self.professional, limit=2)
+        second = list_clients_page(self.professional, cursor=first.next_cursor, limit=2)
+        third = list_clients_page(self.professional, cursor=second.next_cursor, limit=2)
+
+        ids = [row["id"] for page in (first, second, third) for row in page.rows]
+        expected = [self.clients[i].pk for i in (3, 2, 1, 4, 0)]
+        self.assertEqual(ids, expected)
+        self.assertIsNone(third.next_cursor)
+
+    def test_each_page_is_a_single_query(self):
+        first = list_clients_page(self.professional, limit=2)
+
+        with self.assertNumQueries(1):
+            page = list_clients_page(self.professional, cursor=first.next_cursor, limit=2)
+
+        self.assertEqual(
+            set(page.rows[0]),
+            {"id", "full_name", "email", "phone", "activated", "booking_count", "last_booking_at", "total_booked"},
+        )
+        self.assertFalse(page.rows[0]["activated"])
+
+    def test_search_matches_prefixes_of_every_term(self):
+        page = list_clients_page(self.professional, search="mar ali")
+
+        self.assertEqual([row["full_name"] for row in page.rows], ["Alice Martin", "Alice Martin"])
+
+    def test_invalid_cursor_restarts_from_first_page(self):
+        page = list_clients_page(self.professional, cursor="not-a-cursor", limit=1)
+
+        self.assertEqual(page.rows[0]["id"], self.clients[3].pk)
+
+
+class ClientPhoneLookupTests(TestCase):
+    def setUp(self):
+        self.professional = mixer.blend(User, email="phone-pro@example.com", user_type=User.UserType.PROFESSIONAL)
+        self.caller = User.objects.create_user(email="caller@example.com", first_name="Inès", phone_number="06 12 34 56 78", user_type=User.UserType.INDIVIDUAL, linked_professional=self.professional)
+        calendar = Calendar.objects.create(owner=self.professional, name="Cabinet", slug="phone-cabinet")
+        now = timezone.now()
+        self.events = [
+            Event.objects.create(calendar=calendar, title=title, start_at=now + delta, end_at=now + delta + timedelta(hours=1), status=status)
+            for title, delta, status in [("Passé", timedelta(days=-1), "planned"), ("Annulé", timedelta(days=1), "canceled"), ("Suivant", timedelta(days=2), "planned"), ("Plus tard", timedelta(days=9), "planned")]
+        ]
+        for event in self.events:
+            EventAttendee.objects.create(event=event, user=self.caller)
+
+    def test_phone_key_is_e164(self):
+        self.assertEqual(self.caller.phone_key, "+33612345678")
+
+    def test_lookup_ignores_formatting_and_returns_next_appointment(self):
+        for number in ("+33 6 12 34 56 78", "0612345678", "0033-612-345-678"):
+            match = find_client_by_phone(self.professional, number)
+            self.assertEqual(match["client"]["id"], self.caller.pk)
+            self.assertEqual(match["next_appointment"]["id"], self.events[2].pk)
+
+    def test_next_appointment_ignores_other_professionals(self):
+        colleague = mixer.blend(User, email="phone-colleague@example.com", user_type=User.UserType.PROFESSIONAL)
+        calendar = Calendar.objects.create(owner=colleague, name="Autre", slug="phone-colleague")
+        start = timezone.now() + timedelta(hours=2)
+        event = Event.objects.create(calendar=calendar, title="Ailleurs", start_at=start, end_at=start + timedelta(hours=1))
+        EventAttendee.objects.create(event=event, user=self.caller)
+
+        match = find_client_by_phone(self.professional, "0612345678")
+
+        self.assertEqual(match["next_appointment"]["id"], self.events[2].pk)
+
+    def test_lookup_is_scoped_and_indexed(self):
+        other = mixer.blend(User, user_type=User.UserType.PROFESSIONAL)
+        self.assertIsNone(find_client_by_phone(other, "0612345678"))
+        self.assertIsNone(find_client_by_phone(self.professional, "12"))
+        if connection.vendor == "sqlite":
+            plan = User.objects.filter(linked_professional=self.professional, phone_key="+33612345678").explain()
+            self.assertIn("user_phone_lookup_idx", plan)
+
+    def test_phone_update_refreshes_key(self):
+        self.caller.phone_number = "+44 20 7946 0958"
+        self.caller.save(update_fields=["phone_number"])
+        self.assertEqual(User.objects.get(pk=self.caller.pk).phone_key, "+442079460958")
+
+
+class ClientAppointmentHistoryTests(TestCase):
+    def setUp(self):
+        self.professional = mixer.blend(User, email="history-pro@example.com", user_type=User.UserType.PROFESSIONAL)
+        self.client_user = User.objects.create_user(email="history@example.com", user_type=User.UserType.INDIVIDUAL, linked_professional=self.professional)
+        calendar = Calendar.objects.create(owner=self.professional, name="Cabinet", slug="history-cabinet")
+        start = timezone.now().replace(microsecond=0)
+        self.events = [
+            Event.objects.create(calendar=calendar, title=f"Séance {index}", description="Notes privées", start_at=start + offset, end_at=start + offset + timedelta(hours=1))
+            for index, offset in enumerate([timedelta(days=-3), timedelta(days=-1), timedelta(days=-1), timedelta(days=2), timedelta(days=-10)])
+        ]
+        for event in self.events:
+            EventAttendee.objects.create(event=event, user=self.client_user)
+
+    def test_pages_are_newest_first_with_event_id_tiebreak(self):
+        ids = []
+        cursor = None
+        for _ in range(3):
+            page = list_client_appointments(self.professional, self.client_user.pk, cursor=cursor, limit=2)
+            ids.extend(row["event_id"] for row in page.rows)
+            cursor = page.next_cursor
+        expected = [self.events[i].pk for i in (3, 2, 1, 0, 4)]
+        self.assertEqual(ids, expected)
+        self.assertIsNone(cursor)
+
+    def test_description_is_only_selected_on_request(self):
+        with CaptureQueriesContext(connection) as queries:
+            page = list_client_appointments(self.professional, self.client_user.pk)
+        self.assertNotIn("description", queries.captured_queries[-1]["sql"])
+        self.assertNotIn("description", page.rows[0])
+
+        detailed = list_client_appointments(self.professional, self.client_user.pk, with_description=True)
+        self.assertEqual(detailed.rows[0]["description"], "Notes privées")
+
+    def test_other_professionals_clients_are_hidden(self):
+        other = mixer.blend(User, user_type=User.UserType.PROFESSIONAL)
+        self.assertIsNone(list_client_appointments(other, self.client_user.pk))
+
+    def test_appointments_with_other_professionals_are_hidden(self):
+        colleague = mixer.blend(User, email="history-colleague@example.com", user_type=User.UserType.PROFESSIONAL)
+        calendar = Calendar.objects.create(owner=colleague, name="Autre", slug="history-colleague")
+        start = timezone.now().replace(microsecond=0) + timedelta(days=5)
+        event = Event.objects.create(calendar=calendar, title="Ailleurs", start_at=start, end_at=start + timedelta(hours=1))
+        EventAttendee.objects.create(event=event, user=self.client_user)
+
+        page = list_client_appointments(self.professional, self.client_user.pk, limit=10)
+
+        self.assertEqual({row["event_id"] for row in page.rows}, {event.pk for event in self.events})
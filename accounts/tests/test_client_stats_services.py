@@ -0,0 +1,164 @@
+"""Tests for the denormalised per-client appointment aggregates."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.client_services import list_clients_page
+from accounts.client_stats_services import rebuild_client_stats
+from accounts.event_services import bulk_event_operation, create_event, delete_event
+from accounts.models import Calendar, Category, ClientStats, Service
+
+User = get_user_model()
+
+
+class ClientStatsTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="stats-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.client_user = User.objects.create_user(
+            email="stats-client@example.com",
+            last_name="Aubert",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.professional, name="Cabinet", slug="stats-cabinet"
+        )
+        self.service = Service.objects.create(
+            category=Category.objects.create(name="Stats"),
+            name="Massage",
+            price=Decimal("40.00"),
+            duration_minutes=60,
+            created_by=self.professional,
+        )
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def _book(self, days):
+        start = self.start + timedelta(days=days)
+        success, event = create_event(
+            self.professional,
+            self.calendar,
+            start.isoformat(),
+            "",
+            self.service.pk,
+            self.client_user.pk,
+        )
+        self.assertTrue(success)
+        return event
+
+    def _stats(self):
+        return ClientStats.objects.get(
+            professional=self.professional, client=self.client_user
+        )
+
+    def test_bookings_increment_the_aggregates(self):
+        self._book(3)
+        self._book(1)
+
+        stats = self._stats()
+        self.assertEqual(stats.booking_count, 2)
+        self.assertEqual(stats.total_booked, Decimal("80.00"))
+        self.assertEqual(stats.last_booking_at, self.start + timedelta(days=3))
+
+    def test_cancel_and_delete_recompute_the_client(self):
+        first = self._book(1)
+        self._book(5)
+
+        day = timezone.localdate(self.start + timedelta(days=5))
+        bulk_event_operation(self.professional, "cancel", day, day)
+        self.assertEqual(self._stats().last_booking_at, first.start_at)
+
+        delete_event(self.professional, first.pk)
+        self.assertFalse(ClientStats.objects.filter(client=self.client_user).exists())
+
+    def test_rebuild_matches_incremental_maintenance(self):
+        self._book(1)
+        self._book(2)
+        expected = ClientStats.objects.values_list(
+            "booking_count", "last_booking_at", "total_booked"
+        ).get()
+        ClientStats.objects.update(booking_count=0, total_booked=0)
+
+        out = StringIO()
+        call_command(
+            "rebuild_client_stats", professional=self.professional.email, stdout=out
+        )
+
+        self.assertEqual(
+            ClientStats.objects.values_list(
+                "booking_count", "last_booking_at", "total_booked"
+            ).get(),
+            expected,
+        )
+        self.assertIn("1 ligne", out.getvalue())
+        self.assertEqual(rebuild_client_stats(), ClientStats.objects.count())
+
+    def test_client_list_reads_the_aggregates(self):
+        self._book(1)
+        User.objects.create_user(
+            email="stats-new@example.com",
+            last_name="Zola",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+
+        rows = list_clients_page(self.professional).rows
+
+        self.assertEqual(
+            [(row["booking_count"], row["total_booked"]) for row in rows],
+            [(1, Decimal("40.00")), (0, Decimal("0"))],
+        )
+        self.assertIsInstance(rows[0]["last_booking_at"].date(), date)
+
+    def test_client_list_sorts_and_segments_on_the_aggregates(self):
+        self._book(1)
+        big = User.objects.create_user(
+            email="stats-big@example.com",
+            last_name="Martin",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        never = User.objects.create_user(
+            email="stats-never@example.com",
+            last_name="Bernard",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        ClientStats.objects.create(
+            professional=self.professional,
+            client=big,
+            booking_count=3,
+            last_booking_at=self.start - timedelta(days=200),
+            total_booked=Decimal("120.00"),
+        )
+
+        ids = []
+        cursor = None
+        while True:
+            page = list_clients_page(self.professional, sort="total_booked", cursor=cursor, limit=1)
+            ids += [row["id"] for row in page.rows]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(ids, [big.pk, self.client_user.pk, never.pk])
+
+        last = list_clients_page(self.professional, sort="last_booking").rows
+        self.assertEqual([row["id"] for row in last], [self.client_user.pk, big.pk, never.pk])
+
+        def segment(name):
+            return [row["id"] for row in list_clients_page(self.professional, segment=name).rows]
+
+        self.assertEqual(segment("booked"), [self.client_user.pk, big.pk])
+        self.assertEqual(segment("never"), [never.pk])
+        self.assertEqual(segment("dormant"), [big.pk])
@@ -0,0 +1,142 @@
+"""Tests for signed confirmation links and their batched processing."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts import confirmation_services
+from accounts.confirmation_services import (
+    attendance_links,
+    flush_responses,
+    queue_response,
+    read_response_token,
+    make_response_token,
+    responses_due,
+)
+from accounts.models import AttendanceResponse, Calendar, Event, EventAttendee
+
+User = get_user_model()
+
+
+class AttendanceResponseTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="rsvp-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.clients = [
+            User.objects.create_user(
+                email=f"rsvp-{index}@example.com",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.professional,
+            )
+            for index in range(3)
+        ]
+        self.calendar = Calendar.objects.create(owner=self.professional, name="Cabinet", slug="rsvp-cabinet")
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.session = Event.objects.create(
+            calendar=self.calendar, title="Yoga", start_at=start, end_at=start + timedelta(hours=1), capacity=2, attendee_count=2
+        )
+        self.seats = [EventAttendee.objects.create(event=self.session, user=client) for client in self.clients[:2]]
+        self.waiting = EventAttendee.objects.create(event=self.session, user=self.clients[2], is_waitlisted=True)
+        later = start + timedelta(days=1)
+        self.appointment = Event.objects.create(
+            calendar=self.calendar, title="Massage", start_at=later, end_at=later + timedelta(hours=1), attendee_count=1
+        )
+        self.single = EventAttendee.objects.create(event=self.appointment, user=self.clients[0])
+
+    def _token(self, attendee, action):
+        return make_response_token(attendee.pk, attendee.event_id, action)
+
+    def test_tokens_are_signed_and_expire(self):
+        links = attendance_links(self.single.pk, self.appointment.pk)
+        token = links["cancel"].rstrip("/").rsplit("/", 1)[-1]
+
+        self.assertEqual(read_response_token(token), (self.single.pk, self.appointment.pk, "cancel"))
+        self.assertIsNone(read_response_token(token[:-2] + "xx"))
+        with patch.object(confirmation_services, "CONFIRMATION_LINK_MAX_AGE", -1):
+            self.assertIsNone(read_response_token(token))
+
+    def test_stored_confirmations_are_applied_in_one_batch(self):
+        # One INSERT per click and nothing else.
+        with self.assertNumQueries(3):
+            for seat in self.seats:
+                queue_response((seat.pk, self.session.pk, "confirm"))
+            queue_response((self.seats[0].pk, self.session.pk, "confirm"))
+        self.assertEqual(AttendanceResponse.objects.count(), 3)
+
+        # Savepoints, the pending rows, one SELECT, one UPDATE, one counter
+        # recount, the portal versions and the DELETE of the applied rows.
+        with self.assertNumQueries(11):
+            report = flush_responses()
+
+        self.assertEqual((report.confirmed, report.ignored), (2, 0))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.confirmed_count, 2)
+        self.assertFalse(AttendanceResponse.objects.exists())
+        self.assertEqual(flush_responses().confirmed, 0)
+
+    def test_flush_is_due_once_the_oldest_response_waited(self):
+        queue_response((self.seats[0].pk, self.session.pk, "confirm"))
+        self.assertFalse(responses_due())
+
+        AttendanceResponse.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        self.assertTrue(responses_due())
+
+    def test_nothing_is_due_once_a_concurrent_flush_emptied_the_table(self):
+        queue_response((self.seats[0].pk, self.session.pk, "confirm"))
+        flush_responses()
+
+        self.assertFalse(responses_due())
+
+    def test_cancellations_free_seats_and_cancel_appointments(self):
+        queue_response((self.seats[0].pk, self.session.pk, "cancel"))
+        queue_response((self.single.pk, self.appointment.pk, "cancel"))
+        queue_response((self.single.pk + 1000, self.appointment.pk, "confirm"))
+
+        report = flush_responses()
+
+        self.assertEqual((report.canceled, report.ignored), (2, 1))
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.status, "canceled")
+        self.waiting.refresh_from_db()
+        self.assertFalse(self.waiting.is_waitlisted)
+        self.assertFalse(EventAttendee.objects.filter(pk=self.seats[0].pk).exists())
+
+    def test_link_page_confirms_on_post_only(self):
+        url = attendance_links(self.seats[1].pk, self.session.pk)["confirm"]
+
+        response = self.client.get(url)
+        self.assertContains(response, "Confirmer ma présence")
+        self.seats[1].refresh_from_db()
+        self.assertFalse(self.seats[1].is_confirmed)
+
+        with patch.object(confirmation_services, "RESPONSE_FLUSH_SIZE", 1):
+            response = self.client.post(url)
+        self.assertContains(response, "Votre confirmation est enregistrée")
+        self.seats[1].refresh_from_db()
+        self.assertFalse(self.seats[1].is_confirmed)
+        self.assertTrue(AttendanceResponse.objects.filter(attendee_id=self.seats[1].pk).exists())
+        flush_responses()
+        self.seats[1].refresh_from_db()
+        self.assertTrue(self.seats[1].is_confirmed)
+
+        self.assertContains(self.client.get("/rsvp/not-a-token/"), "Lien invalide")
+
+    def test_command_applies_pending_responses(self):
+        queue_response((self.seats[0].pk, self.session.pk, "confirm"))
+        out = StringIO()
+
+        call_command("flush_attendance_responses", "--if-due", stdout=out)
+        self.assertIn("Aucune réponse", out.getvalue())
+
+        call_command("flush_attendance_responses", stdout=out)
+        self.assertIn("1 confirmation(s)", out.getvalue())
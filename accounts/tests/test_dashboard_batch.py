@@ -0,0 +1,153 @@
+"""Tests for the transactional dashboard batch."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.dashboard_batch import run_dashboard_batch
+from accounts.models import Category, Service
+
+User = get_user_model()
+
+
+class RunDashboardBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="batch@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.category = Category.objects.create(name="Retouches")
+        self.services = Service.objects.bulk_create(
+            Service(category=self.category, name=f"Ourlet {index}", created_by=self.user)
+            for index in range(100)
+        )
+
+    def _update(self, service, **overrides):
+        item = {
+            "action": "update_service",
+            "service_id": service.pk,
+            "name": f"{service.name} (révisé)",
+            "category": self.category.pk,
+            "price": "20",
+        }
+        item.update(overrides)
+        return item
+
+    def test_service_updates_run_in_constant_queries(self):
+        actions = [self._update(service) for service in self.services]
+
+        with CaptureQueriesContext(connection) as queries:
+            committed, results = run_dashboard_batch(self.user, actions)
+
+        self.assertTrue(committed)
+        self.assertEqual(len(results), 100)
+        self.assertLess(len(queries), 10)
+        self.assertEqual(
+            Service.objects.filter(name__endswith="(révisé)", price=20).count(), 100
+        )
+
+    def test_failing_action_rolls_back_whole_batch(self):
+        actions = [
+            {"action": "add_service", "name": "Zip", "category": self.category.pk},
+            self._update(self.services[0]),
+            self._update(self.services[1], name=" "),
+        ]
+
+        committed, results = run_dashboard_batch(self.user, actions)
+
+        self.assertFalse(committed)
+        self.assertEqual([result["success"] for result in results], [True, True, False])
+        self.assertIn("name", results[2]["errors"])
+        self.assertFalse(Service.objects.filter(name="Zip").exists())
+        self.assertFalse(Service.objects.filter(name__endswith="(révisé)").exists())
+
+    def test_mixed_actions_keep_order_and_scope(self):
+        other = User.objects.create_user(
+            email="batch-other@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+        committed, results = run_dashboard_batch(
+            other,
+            [{"action": "delete_service", "service_id": self.services[0].pk}],
+        )
+        self.assertFalse(committed)
+
+        committed, results = run_dashboard_batch(
+            self.user,
+            [
+                {"action": "delete_service", "service_id": self.services[0].pk},
+                {"action": "add_client", "email": "lot@example.com"},
+                {"action": "add_service", "name": "Zip", "category": self.category.pk},
+            ],
+        )
+
+        self.assertTrue(committed)
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        self.assertEqual(results[1]["section"], "clients")
+        self.assertTrue(User.objects.filter(email="lot@example.com").exists())
+        self.assertEqual(
+            Service.objects.get(name="Zip").pk, results[2]["data"]["id"]
+        )
+        self.assertFalse(Service.objects.filter(pk=self.services[0].pk).exists())
+
+
+class DashboardBatchApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="batch-api@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.category = Category.objects.create(name="Coiffure")
+        self.url = reverse("dashboard_batch_api")
+        self.client.login(email=self.user.email, password="safe-password")
+
+    def _post(self, payload):
+        return self.client.post(
+            self.url, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_batch_returns_each_touched_fragment_once(self):
+        response = self._post(
+            {
+                "actions": [
+                    {"action": "add_service", "name": "Coupe", "category": self.category.pk},
+                    {"action": "add_service", "name": "Brushing", "category": self.category.pk},
+                ]
+            }
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertTrue(payload["committed"])
+        self.assertEqual(list(payload["fragments"]), ["services"])
+        self.assertIn("Brushing", payload["fragments"]["services"])
+
+    def test_unknown_action_rejects_batch(self):
+        response = self._post(
+            {
+                "actions": [
+                    {"action": "add_service", "name": "Coupe", "category": self.category.pk},
+                    {"action": "drop_tables"},
+                ]
+            }
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["committed"])
+        self.assertFalse(Service.objects.filter(name="Coupe").exists())
+
+    def test_invitations_are_not_batched(self):
+        response = self._post({"actions": [{"action": "invite_client", "client_id": 1}]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("lot", response.json()["results"][0]["message"])
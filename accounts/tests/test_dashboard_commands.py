@@ -0,0 +1,160 @@
+"""Tests for dashboard commands and their JSON endpoint."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.dashboard_commands import run_delete_service, run_update_service
+from accounts.idempotency_services import claim_idempotency_key
+from accounts.models import Category, Service
+
+User = get_user_model()
+
+
+class DashboardCommandsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="commands@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.category = Category.objects.create(name="Onglerie")
+        self.service = Service.objects.create(
+            category=self.category, name="Pose gel", created_by=self.user
+        )
+
+    def test_update_service_returns_form_errors(self):
+        result = run_update_service(
+            self.user,
+            {"service_id": self.service.pk, "name": " ", "category": self.category.pk},
+        )
+
+        self.assertFalse(result.success)
+        self.assertIn("name", result.errors)
+
+    def test_service_commands_are_scoped_to_owner(self):
+        other = User.objects.create_user(
+            email="other-commands@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+        result = run_delete_service(other, {"service_id": self.service.pk})
+
+        self.assertFalse(result.success)
+        self.assertTrue(Service.objects.filter(pk=self.service.pk).exists())
+
+    def test_html_dashboard_runs_the_scoped_commands(self):
+        other = User.objects.create_user(
+            email="other-html@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.client.login(email=other.email, password="safe-password")
+
+        self.client.post(
+            reverse("dashboard"),
+            {"action": "update_service", "service_id": self.service.pk, "name": "Volé", "category": self.category.pk},
+        )
+        self.client.post(reverse("dashboard"), {"action": "delete_service", "service_id": self.service.pk})
+
+        self.service.refresh_from_db()
+        self.assertEqual(self.service.name, "Pose gel")
+
+
+class DashboardActionApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="api-owner@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.url = reverse("dashboard_action_api")
+        self.client.login(email=self.user.email, password="safe-password")
+
+    def test_add_service_returns_services_fragment_only(self):
+        category = Category.objects.create(name="Coiffure")
+
+        response = self.client.post(
+            self.url,
+            {
+                "action": "add_service",
+                "name": "Balayage",
+                "category": str(category.pk),
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertTrue(payload["success"])
+        self.assertEqual(list(payload["fragments"]), ["services"])
+        self.assertIn("Balayage", payload["fragments"]["services"])
+        self.assertNotIn("kitlast-planner", payload["fragments"]["services"])
+
+    def test_invalid_command_returns_errors_without_fragment(self):
+        response = self.client.post(
+            self.url, {"action": "add_client", "first_name": "Sans email"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        payload = response.json()
+        self.assertIn("email", payload["errors"])
+        self.assertNotIn("fragments", payload)
+
+    def test_unknown_action_is_rejected(self):
+        response = self.client.post(self.url, {"action": "drop_tables"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_replayed_key_runs_the_command_once(self):
+        category = Category.objects.create(name="Barbier")
+        payload = {
+            "action": "add_service",
+            "name": "Taille de barbe",
+            "category": str(category.pk),
+            "idempotency_key": "api-key-000001",
+        }
+
+        first = self.client.post(self.url, payload)
+        replay = self.client.post(self.url, payload)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(replay.json()["replayed"])
+        self.assertIn("Taille de barbe", replay.json()["fragments"]["services"])
+        self.assertEqual(Service.objects.filter(name="Taille de barbe").count(), 1)
+
+    def test_pending_or_reused_keys_are_refused_in_json(self):
+        category = Category.objects.create(name="Rasage")
+        service = Service.objects.create(category=category, name="Contour", created_by=self.user)
+        claim_idempotency_key(self.user, "api-key-pending", "add_service")
+        payload = {"action": "add_service", "name": "Rasage", "category": str(category.pk)}
+
+        pending = self.client.post(self.url, {**payload, "idempotency_key": "api-key-pending"})
+        reused = self.client.post(
+            self.url, {"action": "delete_service", "service_id": service.pk, "idempotency_key": "api-key-pending"}
+        )
+
+        self.assertEqual(pending.status_code, 409)
+        self.assertEqual(reused.status_code, 422)
+        self.assertIn("error", reused.json())
+        self.assertFalse(Service.objects.filter(name="Rasage").exists())
+        self.assertTrue(Service.objects.filter(pk=service.pk).exists())
+
+    def test_invite_client_command_sends_the_activation_email(self):
+        client_user = User.objects.create_user(
+            email="api-invitee@example.com",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.user,
+        )
+
+        response = self.client.post(
+            self.url, {"action": "invite_client", "client_id": client_user.pk}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["fragments"]), ["clients"])
+        self.assertEqual(mail.outbox[0].to, ["api-invitee@example.com"])
+        self.assertIn("http://testserver/", mail.outbox[0].body)
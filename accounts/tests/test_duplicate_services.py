@@ -0,0 +1,183 @@
+"""Tests for duplicate-client detection and merging."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+import io
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.client_autocomplete import invalidate_client_index
+from accounts.duplicate_services import (
+    find_duplicate_clients,
+    get_duplicate_report,
+    merge_clients,
+    refresh_duplicate_report,
+)
+from accounts.models import Calendar, Event, EventAttendee
+
+User = get_user_model()
+
+
+class DuplicateClientsTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="dup-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.professional, name="Cabinet", slug="dup-cabinet"
+        )
+
+    def _client(self, email, first_name="", last_name="", phone="", professional=None):
+        return User.objects.create_user(
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone,
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=professional or self.professional,
+        )
+
+    def _event(self, title, *attendees):
+        start = timezone.now() + timedelta(days=1)
+        event = Event.objects.create(
+            calendar=self.calendar,
+            title=title,
+            start_at=start,
+            end_at=start + timedelta(hours=1),
+            attendee_count=len(attendees),
+        )
+        for attendee in attendees:
+            EventAttendee.objects.create(event=event, user=attendee)
+        return event
+
+    def test_groups_clients_sharing_a_blocking_key(self):
+        first = self._client("anne.roux@example.com", "Anne", "Roux")
+        second = self._client("a.roux@work.example", "ANNE", "Roüx")
+        by_phone = self._client("paul@example.com", phone="06 11 11 11 11")
+        named = self._client("p.dupuis@example.com", "Paul", "Dupuis", "+33611111111")
+        self._client("lise@example.com", "Lise", "Martin", "0699999999")
+        self._client("marc@example.com", "Marc", "Martin", "0699999999")
+        self._client("other-pro@example.com", "Anne", "Roux", professional=User.objects.create_user(
+            email="dup-other@example.com", password="safe-password", user_type=User.UserType.PROFESSIONAL
+        ))
+
+        groups = find_duplicate_clients(self.professional)
+
+        self.assertEqual(
+            [[client["id"] for client in group] for group in groups],
+            [[first.pk, second.pk], [by_phone.pk, named.pk]],
+        )
+
+    def test_detection_issues_one_query(self):
+        for index in range(300):
+            self._client(f"bulk-{index}@example.com", "Jean", f"Nom{index % 150}")
+
+        with self.assertNumQueries(1):
+            groups = find_duplicate_clients(self.professional)
+
+        self.assertEqual(len(groups), 150)
+
+    def test_merge_moves_attendances_and_deletes_duplicates(self):
+        primary = self._client("keep@example.com", "Marc")
+        duplicate = self._client("marc.leroy@example.com", "Marc", "Leroy", "0622334455")
+        shared = self._event("Séance commune", primary, duplicate)
+        moved = self._event("Séance du doublon", duplicate)
+
+        success, result = merge_clients(self.professional, {primary.pk: [duplicate.pk]})
+
+        self.assertTrue(success)
+        self.assertEqual(result, {"merged": 1, "moved": 1, "dropped": 1})
+        self.assertFalse(User.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(
+            set(EventAttendee.objects.filter(user=primary).values_list("event_id", flat=True)),
+            {shared.pk, moved.pk},
+        )
+        shared.refresh_from_db()
+        self.assertEqual(shared.attendee_count, 1)
+        primary.refresh_from_db()
+        self.assertEqual((primary.last_name, primary.phone_key), ("Leroy", "+33622334455"))
+
+    def test_merge_rejects_foreign_or_repeated_clients(self):
+        primary = self._client("keep2@example.com", "Léa")
+        stranger = self._client("stranger@example.com", professional=User.objects.create_user(
+            email="dup-stranger@example.com", password="safe-password", user_type=User.UserType.PROFESSIONAL
+        ))
+
+        self.assertEqual(merge_clients(self.professional, {primary.pk: [stranger.pk]}), (False, "Client introuvable."))
+        self.assertFalse(merge_clients(self.professional, {primary.pk: [primary.pk]})[0])
+        self.assertTrue(User.objects.filter(pk=stranger.pk).exists())
+
+    def test_merge_endpoint(self):
+        primary = self._client("keep3@example.com", "Zoé", "Petit")
+        duplicate = self._client("zoe.petit@example.com", "Zoé", "Petit")
+        refresh_duplicate_report(self.professional)
+        self.client.login(email=self.professional.email, password="safe-password")
+
+        listed = self.client.get(reverse("client_duplicates"))
+        response = self.client.post(
+            reverse("clients_merge"),
+            data=json.dumps({"merges": [{"primary": primary.pk, "duplicates": [duplicate.pk]}]}),
+            content_type="application/json",
+        )
+        invalid = self.client.post(reverse("clients_merge"), data="{}", content_type="application/json")
+
+        self.assertEqual(listed.json()["groups"][0][1]["id"], duplicate.pk)
+        self.assertFalse(listed.json()["stale"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["merged"], 1)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertTrue(self.client.get(reverse("client_duplicates")).json()["stale"])
+
+    def test_merge_endpoint_rejects_malformed_ids(self):
+        primary = self._client("keep4@example.com", "Noé")
+        duplicate = self._client("noe@example.com", "Noé")
+        self.client.login(email=self.professional.email, password="safe-password")
+
+        for merges in (
+            [{"primary": primary.pk, "duplicates": str(duplicate.pk)}],
+            [{"primary": primary.pk, "duplicates": [str(duplicate.pk)]}],
+            [{"primary": primary.pk, "duplicates": [True]}],
+            [{"primary": primary.pk}],
+            [str(primary.pk)],
+            {"primary": primary.pk, "duplicates": [duplicate.pk]},
+        ):
+            with self.subTest(merges=merges):
+                response = self.client.post(
+                    reverse("clients_merge"),
+                    data=json.dumps({"merges": merges}),
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertTrue(User.objects.filter(pk=duplicate.pk).exists())
+
+    def test_stored_report_is_paged_and_flagged_stale(self):
+        for index in range(3):
+            self._client(f"twin-{index}-a@example.com", "Jumeau", f"Nom{index}")
+            self._client(f"twin-{index}-b@example.com", "Jumeau", f"Nom{index}")
+
+        self.assertTrue(get_duplicate_report(self.professional)["stale"])
+        call_command("find_client_duplicates", stdout=io.StringIO())
+        first = get_duplicate_report(self.professional, limit=2)
+        last = get_duplicate_report(self.professional, offset=2, limit=2)
+        invalidate_client_index(self.professional.pk)
+
+        self.assertEqual((len(first["groups"]), first["total"], first["next_offset"]), (2, 3, 2))
+        self.assertFalse(first["stale"])
+        self.assertEqual((len(last["groups"]), last["next_offset"]), (1, None))
+        self.assertTrue(get_duplicate_report(self.professional)["stale"])
+
+    def test_command_skips_up_to_date_reports(self):
+        call_command("find_client_duplicates", stdout=io.StringIO())
+        out = io.StringIO()
+
+        call_command("find_client_duplicates", stdout=out)
+
+        self.assertIn("0 professionnel(s)", out.getvalue())
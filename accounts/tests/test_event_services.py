@@ -0,0 +1,260 @@
+"""Tests for accounts.event_services bulk helpers."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.event_services import (
+    bulk_create_events,
+    bulk_event_operation,
+    move_event,
+)
+from accounts.models import Calendar, Category, Event, EventAttendee, Service
+
+User = get_user_model()
+
+
+class BulkCreateEventsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="bulk-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.client_user = User.objects.create_user(
+            email="bulk-client@example.com",
+            password="safe-password",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.user,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.user, name="Agenda", slug="bulk-agenda"
+        )
+        self.service = Service.objects.create(
+            category=Category.objects.create(name="Forfaits"),
+            name="Séance forfait",
+            duration_minutes=45,
+            created_by=self.user,
+        )
+        self.start = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    def _item(self, offset_days: int, **overrides):
+        item = {
+            "start_at": (self.start + timedelta(days=offset_days)).isoformat(),
+            "end_at": "",
+            "service_id": self.service.pk,
+            "client_id": self.client_user.pk,
+        }
+        item.update(overrides)
+        return item
+
+    def test_bulk_create_events_writes_events_and_attendees(self):
+        items = [self._item(day) for day in range(10)]
+
+        created, errors = bulk_create_events(self.user, self.calendar, items)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(created), 10)
+        self.assertEqual(Event.objects.filter(calendar=self.calendar).count(), 10)
+        self.assertEqual(
+            EventAttendee.objects.filter(user=self.client_user).count(), 10
+        )
+        event = Event.objects.filter(calendar=self.calendar).first()
+        self.assertEqual(event.end_at - event.start_at, timedelta(minutes=45))
+        self.assertEqual(event.attendee_count, 1)
+
+    def test_bulk_create_events_reports_invalid_items(self):
+        other_pro = User.objects.create_user(
+            email="other-bulk@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        foreign_service = Service.objects.create(
+            category=self.service.category, name="Autre", created_by=other_pro
+        )
+        items = [
+            self._item(0),
+            self._item(1, start_at="pas une date"),
+            self._item(2, service_id=foreign_service.pk),
+            "not-an-object",
+        ]
+
+        created, errors = bulk_create_events(self.user, self.calendar, items)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual([error["index"] for error in errors], [1, 2, 3])
+
+    def test_bulk_create_events_uses_batched_inserts(self):
+        items = [self._item(day % 30) for day in range(1000)]
+
+        with CaptureQueriesContext(connection) as queries:
+            created, _ = bulk_create_events(self.user, self.calendar, items)
+
+        self.assertEqual(len(created), 1000)
+        # create_event costs four queries per row; batching keeps it at a
+        # few dozen statements for the whole import.
+        self.assertLess(len(queries), len(items) // 20)
+
+
+class BulkEventOperationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="ill-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.user, name="Agenda", slug="ill-agenda"
+        )
+        self.day = timezone.localdate() + timedelta(days=3)
+        start = timezone.make_aware(
+            datetime.combine(self.day, time(hour=9)),
+            timezone.get_current_timezone(),
+        )
+        self.events = [
+            Event.objects.create(
+                calendar=self.calendar,
+                title=f"RDV {index}",
+                start_at=start + timedelta(hours=index),
+                end_at=start + timedelta(hours=index, minutes=45),
+                status=status,
+            )
+            for index, status in enumerate(["planned", "confirmed", "canceled"])
+        ]
+        self.next_day_event = Event.objects.create(
+            calendar=self.calendar,
+            title="Lendemain",
+            start_at=start + timedelta(days=1),
+            end_at=start + timedelta(days=1, hours=1),
+        )
+
+    def test_cancel_range_updates_only_matching_events(self):
+        event_ids = bulk_event_operation(self.user, "cancel", self.day, self.day)
+
+        self.assertCountEqual(event_ids, [self.events[0].pk, self.events[1].pk])
+        self.assertEqual(
+            Event.objects.filter(status="canceled", start_at__date=self.day).count(),
+            3,
+        )
+        self.next_day_event.refresh_from_db()
+        self.assertEqual(self.next_day_event.status, "planned")
+
+    def test_confirm_with_status_filter(self):
+        event_ids = bulk_event_operation(
+            self.user, "confirm", self.day, self.day, status="planned"
+        )
+
+        self.assertEqual(event_ids, [self.events[0].pk])
+        self.events[0].refresh_from_db()
+        self.assertEqual(self.events[0].status, "confirmed")
+
+    def test_delete_is_scoped_to_owner(self):
+        intruder = User.objects.create_user(
+            email="intruder@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+        self.assertEqual(
+            bulk_event_operation(intruder, "delete", self.day, self.day), []
+        )
+        event_ids = bulk_event_operation(
+            self.user, "delete", self.day, self.day + timedelta(days=1)
+        )
+
+        self.assertEqual(len(event_ids), 4)
+        self.assertFalse(Event.objects.filter(calendar=self.calendar).exists())
+
+    def test_writes_only_the_locked_events(self):
+        late_start = self.events[0].start_at + timedelta(minutes=30)
+
+        def insert_late_event(event_ids):
+            Event.objects.create(
+                calendar=self.calendar,
+                title="Arrivé entre-temps",
+                start_at=late_start,
+                end_at=late_start + timedelta(hours=1),
+            )
+            return []
+
+        with mock.patch("accounts.event_services.attendee_ids", insert_late_event):
+            event_ids = bulk_event_operation(self.user, "cancel", self.day, self.day)
+
+        self.assertEqual(len(event_ids), 2)
+        late = Event.objects.get(title="Arrivé entre-temps")
+        self.assertEqual(late.status, "planned")
+
+
+class MoveEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="mover@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.user, name="Agenda", slug="move-agenda"
+        )
+        self.start = timezone.make_aware(
+            datetime.combine(timezone.localdate(), time(hour=9)),
+            timezone.get_current_timezone(),
+        )
+        self.event = Event.objects.create(
+            calendar=self.calendar,
+            title="Soin",
+            start_at=self.start,
+            end_at=self.start + timedelta(hours=1),
+        )
+
+    def test_move_event_keeps_duration_when_end_is_missing(self):
+        new_start = self.start + timedelta(hours=2)
+
+        success, event = move_event(self.user, self.event.pk, new_start.isoformat(), None)
+
+        self.assertTrue(success)
+        event.refresh_from_db()
+        self.assertEqual(event.start_at, new_start)
+        self.assertEqual(event.end_at, new_start + timedelta(hours=1))
+
+    def test_move_event_resizes_and_rejects_inverted_range(self):
+        success, _ = move_event(
+            self.user,
+            self.event.pk,
+            self.start.isoformat(),
+            (self.start + timedelta(minutes=30)).isoformat(),
+        )
+        self.assertTrue(success)
+
+        success, message = move_event(
+            self.user,
+            self.event.pk,
+            self.start.isoformat(),
+            (self.start - timedelta(minutes=30)).isoformat(),
+        )
+        self.assertFalse(success)
+        self.assertIn("fin", message)
+
+    def test_move_event_rejects_overlap_but_ignores_canceled_events(self):
+        blocker = Event.objects.create(
+            calendar=self.calendar,
+            title="Autre",
+            start_at=self.start + timedelta(hours=3),
+            end_at=self.start + timedelta(hours=4),
+        )
+        target = (self.start + timedelta(hours=3, minutes=30)).isoformat()
+
+        success, message = move_event(self.user, self.event.pk, target, None)
+        self.assertFalse(success)
+        self.assertIn("chevauche", message)
+
+        blocker.status = "canceled"
+        blocker.save()
+        success, _ = move_event(self.user, self.event.pk, target, None)
+        self.assertTrue(success)
@@ -0,0 +1,88 @@
+"""Tests for idempotency-key helpers."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, HttpResponseRedirect
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.idempotency_services import (
+    claim_idempotency_key,
+    normalize_idempotency_key,
+    purge_expired_idempotency_keys,
+    record_idempotent_response,
+    replay_idempotent_response,
+)
+from accounts.models import IdempotencyKey
+
+User = get_user_model()
+
+
+class IdempotencyServicesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="idem@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+    def test_normalize_idempotency_key_rejects_malformed_values(self):
+        self.assertEqual(normalize_idempotency_key(" abcdef-1234 "), "abcdef-1234")
+        self.assertIsNone(normalize_idempotency_key("short"))
+        self.assertIsNone(normalize_idempotency_key("bad key with spaces"))
+        self.assertIsNone(normalize_idempotency_key(None))
+
+    def test_claimed_key_is_pending_then_replayed(self):
+        self.assertIsNone(claim_idempotency_key(self.user, "key-000001", "add_client"))
+
+        pending = claim_idempotency_key(self.user, "key-000001", "add_client")
+        self.assertEqual(replay_idempotent_response(pending, "add_client").status_code, 409)
+
+        record_idempotent_response(self.user, "key-000001", HttpResponseRedirect("/?section=clients"))
+
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+        record = claim_idempotency_key(self.user, "key-000001", "add_client")
+        replay = replay_idempotent_response(record, "add_client")
+        self.assertEqual(replay.status_code, 302)
+        self.assertEqual(replay["Location"], "/?section=clients")
+        self.assertGreater(IdempotencyKey.objects.get().expires_at, timezone.now() + timedelta(hours=1))
+
+    def test_key_reused_for_another_action_is_refused(self):
+        claim_idempotency_key(self.user, "key-000003", "add_client")
+        record_idempotent_response(self.user, "key-000003", HttpResponseRedirect("/?section=clients"))
+
+        record = claim_idempotency_key(self.user, "key-000003", "delete_client")
+
+        self.assertEqual(replay_idempotent_response(record, "delete_client").status_code, 422)
+
+    def test_abandoned_claim_expires_quickly(self):
+        claim_idempotency_key(self.user, "key-000004", "add_client")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNone(claim_idempotency_key(self.user, "key-000004", "add_client"))
+
+    def test_non_redirect_outcome_releases_the_claim(self):
+        claim_idempotency_key(self.user, "key-000002", "add_client")
+
+        record_idempotent_response(self.user, "key-000002", HttpResponse("formulaire"))
+
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertIsNone(claim_idempotency_key(self.user, "key-000002", "add_client"))
+
+    def test_expired_keys_are_reclaimed_and_purged(self):
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="key-expired",
+            action="add_event",
+            response_status=302,
+            response_location="/",
+            expires_at=timezone.now() - timedelta(minutes=1),
+        )
+
+        self.assertIsNone(claim_idempotency_key(self.user, "key-expired", "add_client"))
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(purge_expired_idempotency_keys(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
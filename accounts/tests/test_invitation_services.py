@@ -0,0 +1,75 @@
+"""Tests for passwordless clients and their activation links."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.client_services import create_client
+from accounts.invitation_services import build_activation_path, send_client_invitation
+
+User = get_user_model()
+
+
+class ClientInvitationTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="invite-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+            first_name="Inès",
+        )
+        success, self.client_user = create_client(
+            self.professional, {"email": "invitee@example.com", "first_name": "Léa"}
+        )
+        self.assertTrue(success)
+
+    def test_created_client_has_unusable_password(self):
+        self.client_user.refresh_from_db()
+
+        self.assertFalse(self.client_user.has_usable_password())
+
+    def test_invitation_email_contains_activation_link(self):
+        success, _ = send_client_invitation(
+            self.professional, self.client_user.pk, "https://kitlast.test"
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(mail.outbox[0].to, ["invitee@example.com"])
+        self.assertIn("https://kitlast.test/clients/activate/", mail.outbox[0].body)
+
+    def test_invitation_is_scoped_to_linked_professional(self):
+        other = User.objects.create_user(
+            email="invite-other@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+        success, _ = send_client_invitation(other, self.client_user.pk, "")
+
+        self.assertFalse(success)
+        self.assertEqual(mail.outbox, [])
+
+    def test_activation_sets_password_logs_in_and_burns_link(self):
+        path = build_activation_path(self.client_user)
+
+        self.assertContains(self.client.get(path), "Activer mon compte")
+        response = self.client.post(
+            path,
+            {"new_password1": "Un-mot-de-passe-42", "new_password2": "Un-mot-de-passe-42"},
+        )
+
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+        self.client_user.refresh_from_db()
+        self.assertTrue(self.client_user.check_password("Un-mot-de-passe-42"))
+        self.client.logout()
+        self.assertContains(self.client.get(path), "Lien invalide")
+        success, _ = send_client_invitation(self.professional, self.client_user.pk, "")
+        self.assertFalse(success)
+
+    def test_tampered_link_is_rejected(self):
+        path = build_activation_path(self.client_user)[:-3] + "xx/"
+
+        self.assertContains(self.client.get(path), "Lien invalide")
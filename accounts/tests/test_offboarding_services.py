@@ -0,0 +1,150 @@
+"""Tests for the chunked offboarding of professional accounts."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import time, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.attendance_services import join_event
+from accounts.models import (
+    Calendar,
+    Category,
+    ClientStats,
+    Event,
+    EventAttendee,
+    Service,
+    WeekTemplate,
+    WeekTemplateSlot,
+)
+from accounts.offboarding_services import offboard_professional
+from accounts.reassignment_services import reassign_professional
+
+User = get_user_model()
+
+
+class OffboardingTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="closing@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.colleague = User.objects.create_user(
+            email="staying@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.clients = [
+            User.objects.create_user(
+                email=f"offboard-{index}@example.com",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.professional,
+            )
+            for index in range(3)
+        ]
+        calendar = Calendar.objects.create(
+            owner=self.professional, name="Cabinet", slug="offboard-cabinet"
+        )
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        for offset, client in enumerate(self.clients):
+            event = Event.objects.create(
+                calendar=calendar,
+                title="Séance",
+                start_at=start + timedelta(days=offset),
+                end_at=start + timedelta(days=offset, hours=1),
+            )
+            EventAttendee.objects.create(event=event, user=client)
+            ClientStats.objects.create(professional=self.professional, client=client, booking_count=1)
+        Service.objects.create(
+            category=Category.objects.create(name="Offboarding"), name="Massage", created_by=self.professional
+        )
+        template = WeekTemplate.objects.create(owner=self.professional, name="Semaine")
+        WeekTemplateSlot.objects.create(
+            template=template, weekday=0, start_time=time(9), duration_minutes=60, title="Lundi", client=self.clients[0]
+        )
+        self.workshop = Event.objects.create(
+            calendar=Calendar.objects.create(owner=self.colleague, name="Atelier", slug="offboard-atelier"),
+            title="Atelier",
+            start_at=start,
+            end_at=start + timedelta(hours=2),
+            capacity=5,
+            created_by=self.professional,
+        )
+        join_event(self.colleague, self.workshop.pk, self.professional.pk)
+
+    @patch("accounts.offboarding_services.time.sleep")
+    def test_deletes_dependent_rows_in_throttled_chunks(self, sleep):
+        progress = []
+
+        success, report = offboard_professional(
+            self.professional, chunk_size=2, throttle=0.1, on_chunk=lambda r: progress.append(+r.processed)
+        )
+
+        self.assertTrue(success)
+        self.assertTrue(report.completed)
+        self.assertEqual(report.processed["attendees"], 3)
+        self.assertEqual(report.processed["events"], 3)
+        self.assertEqual(report.processed["clients"], 3)
+        self.assertEqual(len(progress), sleep.call_count)
+        self.assertGreater(len(progress), len(report.processed))
+        self.assertFalse(User.objects.filter(pk=self.professional.pk).exists())
+        self.assertEqual(User.objects.filter(pk__in=[c.pk for c in self.clients], linked_professional=None).count(), 3)
+        self.assertFalse(Service.objects.filter(category__name="Offboarding").exists())
+        self.assertFalse(ClientStats.objects.filter(client__in=self.clients).exists())
+        self.workshop.refresh_from_db()
+        self.assertEqual((self.workshop.attendee_count, self.workshop.created_by), (0, None))
+
+    def test_rejects_clients_and_keeps_the_data_on_a_bad_transfer(self):
+        self.assertFalse(offboard_professional(self.clients[0])[0])
+
+        success, message = offboard_professional(self.professional, transfer_to=self.clients[0])
+
+        self.assertFalse(success)
+        self.assertIn("professionnels", message)
+        self.professional.refresh_from_db()
+        self.assertTrue(self.professional.is_active)
+        self.assertEqual(User.objects.filter(linked_professional=self.professional).count(), 3)
+
+    def test_invalid_transfer_targets_leave_the_account_active(self):
+        without_calendar = User.objects.create_user(
+            email="no-calendar@example.com", user_type=User.UserType.PROFESSIONAL
+        )
+
+        for target in (self.professional, without_calendar):
+            with self.subTest(target=target.email):
+                success, _ = offboard_professional(self.professional, transfer_to=target)
+
+                self.assertFalse(success)
+                self.professional.refresh_from_db()
+                self.assertTrue(self.professional.is_active)
+
+    def test_deactivates_before_transfer_and_logs_conflicts(self):
+        def _transfer(source, target, **kwargs):
+            source.refresh_from_db()
+            self.assertFalse(source.is_active)
+            return reassign_professional(source, target, **kwargs)
+
+        with patch("accounts.offboarding_services.reassign_professional", side_effect=_transfer):
+            with self.assertLogs("accounts.offboarding_services", "WARNING") as logs:
+                success, report = offboard_professional(self.professional, transfer_to=self.colleague)
+
+        self.assertTrue(success)
+        self.assertEqual(len(logs.output), len(report.reassignment.conflicts))
+        self.assertIn("will be deleted", logs.output[0])
+
+    def test_command_transfers_clients_first(self):
+        out = StringIO()
+
+        call_command("offboard_professional", "CLOSING@example.com", transfer_to=self.colleague.email, stdout=out)
+
+        self.assertIn("3 client(s) et 2 rendez-vous transféré(s)", out.getvalue())
+        self.assertIn("Conflit", out.getvalue())
+        self.assertIn("clôturé", out.getvalue())
+        self.assertEqual(User.objects.filter(linked_professional=self.colleague).count(), 3)
+        self.assertEqual(Event.objects.filter(calendar__owner=self.colleague).count(), 3)
@@ -0,0 +1,99 @@
+"""Tests for the client self-service portal."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.attendance_services import join_event, leave_event
+from accounts.cache_versions import bump_versions
+from accounts.models import Calendar, Event, EventAttendee
+from accounts.portal_services import client_portal
+
+User = get_user_model()
+
+
+class ClientPortalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.professionals = [
+            User.objects.create_user(
+                email=f"portal-pro-{index}@example.com",
+                first_name=f"Pro{index}",
+                user_type=User.UserType.PROFESSIONAL,
+            )
+            for index in range(2)
+        ]
+        self.client_user = User.objects.create_user(
+            email="portal-client@example.com",
+            password="safe-password",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professionals[1],
+        )
+        self.calendars = [
+            Calendar.objects.create(owner=pro, name="Cabinet", slug=f"portal-{pro.pk}")
+            for pro in self.professionals
+        ]
+        now = timezone.now().replace(microsecond=0)
+        self.soon = self._event(self.calendars[1], now + timedelta(days=1), "Massage")
+        self.later = self._event(self.calendars[0], now + timedelta(days=7), "Yoga")
+        self.past = self._event(self.calendars[0], now - timedelta(days=7), "Bilan")
+        for event in (self.soon, self.later, self.past):
+            EventAttendee.objects.create(event=event, user=self.client_user)
+
+    def _event(self, calendar, start, title, attendees=1):
+        return Event.objects.create(
+            calendar=calendar,
+            title=title,
+            start_at=start,
+            end_at=start + timedelta(hours=1),
+            capacity=3,
+            attendee_count=attendees,
+        )
+
+    def test_lists_appointments_across_professionals_from_one_cached_query(self):
+        # The shared version, then the appointments.
+        with self.assertNumQueries(2):
+            portal = client_portal(self.client_user)
+        with self.assertNumQueries(1):
+            client_portal(self.client_user)
+
+        self.assertEqual([row["title"] for row in portal.upcoming], ["Massage", "Yoga"])
+        self.assertEqual([row["professional"] for row in portal.upcoming], ["Pro1", "Pro0"])
+        self.assertEqual([row["event_id"] for row in portal.past], [self.past.pk])
+
+    def test_attendee_changes_invalidate_the_cache(self):
+        client_portal(self.client_user)
+        extra = self._event(self.calendars[1], self.later.start_at + timedelta(days=1), "Pilates", attendees=0)
+
+        join_event(self.professionals[1], extra.pk, self.client_user.pk)
+        self.assertIn("Pilates", [row["title"] for row in client_portal(self.client_user).upcoming])
+
+        leave_event(self.professionals[1], self.soon.pk, self.client_user.pk)
+        self.assertEqual([row["title"] for row in client_portal(self.client_user).upcoming], ["Yoga", "Pilates"])
+
+    def test_a_write_committed_by_another_worker_retires_the_cached_rows(self):
+        client_portal(self.client_user)
+        # Another worker moved an appointment and bumped the shared version;
+        # this worker's cache was not told.
+        Event.objects.filter(pk=self.later.pk).update(title="Pilates")
+        bump_versions([f"client-portal:{self.client_user.pk}"])
+
+        titles = [row["title"] for row in client_portal(self.client_user).upcoming]
+        self.assertEqual(titles, ["Massage", "Pilates"])
+
+    def test_portal_page_requires_login_and_renders(self):
+        response = self.client.get(reverse("client_portal"))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.login(email=self.client_user.email, password="safe-password")
+        response = self.client.get(reverse("client_portal"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Massage")
+        self.assertContains(response, "Bilan")
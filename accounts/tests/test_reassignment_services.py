@@ -0,0 +1,103 @@
+"""Tests for reassigning clients and appointments between professionals."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Calendar, ClientStats, Event, EventAttendee
+from accounts.reassignment_services import reassign_professional
+
+User = get_user_model()
+
+
+class ReassignmentTests(TestCase):
+    def setUp(self):
+        self.source = User.objects.create_user(
+            email="leaving@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.target = User.objects.create_user(
+            email="colleague@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.source_calendar = Calendar.objects.create(
+            owner=self.source, name="Départ", slug="reassign-source"
+        )
+        self.target_calendar = Calendar.objects.create(
+            owner=self.target, name="Reprise", slug="reassign-target"
+        )
+        self.clients = [
+            User.objects.create_user(
+                email=f"reassign-{index}@example.com",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.source,
+            )
+            for index in range(3)
+        ]
+        tomorrow = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.past = self._event(self.source_calendar, tomorrow - timedelta(days=10))
+        self.future = [
+            self._event(self.source_calendar, tomorrow + timedelta(days=offset))
+            for offset in range(3)
+        ]
+        self.busy = self._event(self.target_calendar, self.future[1].start_at + timedelta(minutes=30))
+        for event, client in zip([self.past, *self.future], [*self.clients, self.clients[0]]):
+            EventAttendee.objects.create(event=event, user=client)
+
+    def _event(self, calendar, start):
+        return Event.objects.create(
+            calendar=calendar, title="Séance", start_at=start, end_at=start + timedelta(hours=1)
+        )
+
+    def test_moves_clients_and_future_events_with_set_based_updates(self):
+        # Calendar, savepoints, client update, event list, one range query per
+        # day, one move, attendee ids, stats refresh (savepoints, delete, select,
+        # insert), the portal versions and both autocomplete versions
+        # (insert-or-ignore, bump each).
+        with self.assertNumQueries(1 + 2 + 1 + 1 + 3 + 1 + 1 + 5 + 2 + 4):
+            success, report = reassign_professional(self.source, self.target)
+
+        self.assertTrue(success)
+        self.assertEqual((report.clients, report.events_moved), (3, 2))
+        self.assertEqual([conflict["id"] for conflict in report.conflicts], [self.future[1].pk])
+        self.assertEqual(User.objects.filter(linked_professional=self.target).count(), 3)
+        self.assertEqual(
+            set(Event.objects.filter(calendar=self.target_calendar).values_list("pk", flat=True)),
+            {self.busy.pk, self.future[0].pk, self.future[2].pk},
+        )
+        self.past.refresh_from_db()
+        self.assertEqual(self.past.calendar, self.source_calendar)
+        self.assertTrue(ClientStats.objects.filter(professional=self.target, client=self.clients[0]).exists())
+
+    def test_dry_run_changes_nothing(self):
+        success, report = reassign_professional(self.source, self.target, dry_run=True)
+
+        self.assertTrue(success)
+        self.assertEqual(report.events_moved, 2)
+        self.assertEqual(User.objects.filter(linked_professional=self.source).count(), 3)
+        self.assertFalse(Event.objects.filter(calendar=self.target_calendar).exclude(pk=self.busy.pk).exists())
+
+    def test_rejects_invalid_targets(self):
+        self.assertFalse(reassign_professional(self.source, self.source)[0])
+        self.assertFalse(reassign_professional(self.source, self.clients[0])[0])
+        self.target_calendar.delete()
+        self.assertEqual(
+            reassign_professional(self.source, self.target),
+            (False, "Le professionnel cible n'a pas de calendrier."),
+        )
+
+    def test_command_reports_conflicts(self):
+        out = StringIO()
+
+        call_command("reassign_clients", "LEAVING@example.com", self.target.email, stdout=out)
+
+        self.assertIn("Conflit", out.getvalue())
+        self.assertIn("3 client(s) et 2 rendez-vous", out.getvalue())
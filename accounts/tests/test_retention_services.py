@@ -0,0 +1,105 @@
+"""Tests for the anonymisation of inactive clients."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.client_autocomplete import autocomplete_clients
+from accounts.client_services import list_clients_page
+from accounts.invitation_services import send_client_invitation
+from accounts.models import Calendar, Event, EventAttendee
+from accounts.retention_services import run_retention
+
+User = get_user_model()
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.professional = User.objects.create_user(
+            email="retention-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        long_ago = timezone.now() - timedelta(days=5 * 365)
+        self.dormant = [
+            self._client(f"dormant-{index}@example.com", long_ago) for index in range(3)
+        ]
+        self.logged_in = self._client("recent-login@example.com", long_ago)
+        User.objects.filter(pk=self.logged_in.pk).update(last_login=timezone.now())
+        self.booked = self._client("recent-visit@example.com", long_ago)
+        calendar = Calendar.objects.create(
+            owner=self.professional, name="Cabinet", slug="retention-cabinet"
+        )
+        start = timezone.now() - timedelta(days=30)
+        self.old_visit = Event.objects.create(
+            calendar=calendar, title="Séance", start_at=long_ago, end_at=long_ago + timedelta(hours=1)
+        )
+        EventAttendee.objects.create(event=self.old_visit, user=self.dormant[0])
+        recent = Event.objects.create(
+            calendar=calendar, title="Séance", start_at=start, end_at=start + timedelta(hours=1)
+        )
+        EventAttendee.objects.create(event=recent, user=self.booked)
+        self.newcomer = self._client("newcomer@example.com", timezone.now())
+
+    def _client(self, email, joined):
+        client = User.objects.create_user(
+            email=email,
+            first_name="Jeanne",
+            last_name="Durand",
+            phone_number="0611223344",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        User.objects.filter(pk=client.pk).update(date_joined=joined)
+        return client
+
+    def test_dry_run_reports_without_writing(self):
+        report = run_retention(years=3, dry_run=True)
+
+        self.assertEqual(report.per_professional[self.professional.pk], 3)
+        self.assertEqual(report.anonymized, 0)
+        self.assertFalse(User.objects.filter(anonymized_at__isnull=False).exists())
+
+    @patch("accounts.retention_services.time.sleep")
+    def test_inactive_clients_are_anonymised_in_throttled_chunks(self, sleep):
+        report = run_retention(years=3, chunk_size=2, throttle=0.5)
+
+        self.assertEqual(report.anonymized, 3)
+        self.assertEqual(sleep.call_count, 2)
+        anonymised = User.objects.get(pk=self.dormant[0].pk)
+        self.assertEqual(anonymised.email, f"anonyme-{anonymised.pk}@anonyme.invalid")
+        self.assertEqual((anonymised.first_name, anonymised.phone_key), ("", ""))
+        self.assertFalse(anonymised.is_active or anonymised.has_usable_password())
+        self.assertTrue(EventAttendee.objects.filter(event=self.old_visit, user=anonymised).exists())
+        for active in (self.logged_in, self.booked, self.newcomer, self.professional):
+            active.refresh_from_db()
+            self.assertIsNone(active.anonymized_at)
+            self.assertNotIn("anonyme", active.email)
+
+        self.assertEqual(run_retention(years=3).anonymized, 0)
+
+    def test_command_prints_dry_run_report(self):
+        out = StringIO()
+
+        call_command("anonymize_inactive_clients", dry_run=True, stdout=out)
+
+        self.assertIn("retention-pro@example.com : 3 client(s)", out.getvalue())
+        self.assertIn("Simulation", out.getvalue())
+
+    def test_anonymised_clients_are_hidden_from_the_professional(self):
+        run_retention(years=3)
+
+        listed = {client["id"] for client in list_clients_page(self.professional).rows}
+        suggested = {match["id"] for match in autocomplete_clients(self.professional, "anonyme")}
+        invited = send_client_invitation(self.professional, self.dormant[1].pk, "http://testserver")
+
+        self.assertEqual(listed, {self.logged_in.pk, self.booked.pk, self.newcomer.pk})
+        self.assertEqual(suggested, set())
+        self.assertEqual(invited, (False, "Client introuvable ou non autorisé."))
@@ -2,17 +2,23 @@
 
 # pylint: disable=missing-class-docstring,missing-function-docstring,no-member
 
+import threading
 from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from accounts.constants import PLANNER_HOURS
-from accounts.models import Calendar, Category, Event, EventAttendee, Service, Workshop
+from accounts.dashboard_commands import DASHBOARD_COMMANDS, CommandResult
+from accounts.idempotency_services import IDEMPOTENCY_PENDING, claim_idempotency_key
+from accounts.models import Calendar, Category, Event, EventAttendee, IdempotencyKey, Service, Workshop
 
 User = get_user_model()
 
@@ -68,13 +74,12 @@ class DashboardViewTests(TestCase):
         self.assertFalse(response.context["show_category_form"])
         self.assertFalse(response.context["show_service_form"])
         self.assertEqual(response.context["planner_hours"], PLANNER_HOURS)
-        self.assertIn("clients", response.context)
-        self.assertEqual(len(response.context["clients"]), 1)
-        self.assertEqual(
-            response.context["clients"][0]["email"], self.client_user.email
-        )
-        self.assertIn("client_options", response.context)
-        self.assertEqual(len(response.context["client_options"]), 1)
+        # The client list and the booking options wait for their section.
+        self.assertEqual(response.context["clients"], [])
+        self.assertTrue(response.context["clients_deferred"])
+        self.assertEqual(response.context["client_options"], [])
+        self.assertTrue(response.context["planning_deferred"])
+        self.assertContains(response, "data-section-deferred", count=2)
         planning_days = response.context["planning_days"]
         self.assertIsInstance(planning_days, list)
         self.assertGreaterEqual(len(planning_days), 1)
@@ -134,6 +139,89 @@ class DashboardViewTests(TestCase):
         self.assertEqual(clients[0]["email"], self.client_user.email)
         self.assertTrue(response.context["is_professional"])
 
+    def test_dashboard_clients_search_filters_and_paginates(self):
+        self.login()
+        for index in range(60):
+            User.objects.create_user(
+                email=f"bulk-{index}@example.com",
+                last_name=f"Zed{index:02d}",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=self.user,
+            )
+
+        response = self.client.get(self.url, {"section": "clients"})
+
+        self.assertEqual(len(response.context["clients"]), 50)
+        self.assertContains(response, "Clients suivants")
+        response = self.client.get(
+            self.url,
+            {"section": "clients", "after": response.context["client_next_cursor"]},
+        )
+        self.assertEqual(len(response.context["clients"]), 11)
+        self.assertIsNone(response.context["client_next_cursor"])
+
+        response = self.client.get(self.url, {"section": "clients", "q": "clara"})
+        self.assertEqual(
+            [client["email"] for client in response.context["clients"]],
+            [self.client_user.email],
+        )
+
+        response = self.client.get(
+            self.url, {"section": "clients", "sort": "total_booked", "segment": "never"}
+        )
+        self.assertContains(response, '<option value="total_booked" selected>')
+        self.assertContains(response, "sort=total_booked&amp;segment=never&amp;after=")
+
+    def test_clients_page_endpoint_returns_json_page(self):
+        self.login()
+
+        response = self.client.get(reverse("clients_page"), {"q": "cli"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["clients"][0]["id"], self.client_user.pk)
+        self.assertIsNone(response.json()["next"])
+
+    def test_phone_lookup_endpoint_identifies_caller(self):
+        self.login()
+        self.client_user.phone_number = "07 11 22 33 44"
+        self.client_user.save()
+
+        response = self.client.get(reverse("client_phone_lookup"), {"phone": "+33711223344"})
+        missing = self.client.get(reverse("client_phone_lookup"), {"phone": "0700000000"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["client"]["id"], self.client_user.pk)
+        self.assertIsNone(response.json()["next_appointment"])
+        self.assertEqual(missing.status_code, 404)
+
+    def test_client_history_endpoint_returns_appointments(self):
+        self.login()
+        start = timezone.now()
+        event = Event.objects.create(
+            calendar=self.calendar, title="Bilan", start_at=start, end_at=start + timedelta(hours=1)
+        )
+        EventAttendee.objects.create(event=event, user=self.client_user)
+
+        response = self.client.get(reverse("client_history", args=[self.client_user.pk]))
+        missing = self.client.get(reverse("client_history", args=[self.user.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["appointments"][0]["title"], "Bilan")
+        self.assertEqual(missing.status_code, 404)
+
+    def test_dashboard_loads_clients_only_for_their_sections(self):
+        self.login()
+
+        clients = self.client.get(self.url, {"section": "clients"})
+        planning = self.client.get(self.url, {"section": "planning"})
+
+        self.assertEqual(clients.context["clients"][0]["email"], self.client_user.email)
+        self.assertFalse(clients.context["clients_deferred"])
+        self.assertEqual(clients.context["client_options"], [])
+        self.assertEqual(planning.context["clients"], [])
+        self.assertEqual(len(planning.context["client_options"]), 1)
+        self.assertFalse(planning.context["planning_deferred"])
+
     def test_dashboard_clients_section_handles_empty_state(self):
         self.login()
         self.client_user.delete()
@@ -162,6 +250,49 @@ class DashboardViewTests(TestCase):
         self.assertEqual(created.linked_professional, self.user)
         self.assertEqual(created.user_type, User.UserType.INDIVIDUAL)
 
+    def test_dashboard_post_replayed_idempotency_key_does_not_duplicate(self):
+        self.login()
+        payload = {
+            "action": "add_client",
+            "first_name": "Ida",
+            "email": "ida@example.com",
+            "idempotency_key": "3f1c2a9e-idem-key",
+        }
+
+        first = self.client.post(self.url, payload)
+        replay = self.client.post(self.url, payload)
+
+        self.assertRedirects(first, f"{self.url}?section=clients")
+        self.assertRedirects(replay, f"{self.url}?section=clients")
+        self.assertEqual(User.objects.filter(email="ida@example.com").count(), 1)
+
+    def test_dashboard_post_with_a_pending_key_is_a_conflict(self):
+        self.login()
+        claim_idempotency_key(self.user, "3f1c2a9e-pending", "add_client")
+
+        response = self.client.post(
+            self.url,
+            {"action": "add_client", "email": "eve@example.com", "idempotency_key": "3f1c2a9e-pending"},
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(User.objects.filter(email="eve@example.com").exists())
+
+    def test_dashboard_post_with_a_key_of_another_action_is_refused(self):
+        self.login()
+        self.client.post(
+            self.url,
+            {"action": "add_client", "email": "una@example.com", "idempotency_key": "3f1c2a9e-reused"},
+        )
+
+        response = self.client.post(
+            self.url,
+            {"action": "delete_client", "client_id": self.client_user.pk, "idempotency_key": "3f1c2a9e-reused"},
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertTrue(User.objects.filter(pk=self.client_user.pk).exists())
+
     def test_dashboard_post_add_event_creates_event(self):
         self.login()
         service = Service.objects.create(
@@ -225,6 +356,196 @@ class DashboardViewTests(TestCase):
         self.assertRedirects(response, f"{self.url}?section=planning")
         self.assertFalse(Event.objects.filter(pk=event.pk).exists())
 
+    def test_bulk_create_events_endpoint_returns_created_ids(self):
+        self.login()
+        service = Service.objects.create(
+            category=Category.objects.create(name="Cures"),
+            name="Cure 10 séances",
+            duration_minutes=30,
+            created_by=self.user,
+        )
+        start_at = timezone.now().replace(minute=0, second=0, microsecond=0)
+        payload = {
+            "events": [
+                {
+                    "start_at": (start_at + timedelta(days=day)).isoformat(),
+                    "service_id": service.pk,
+                    "client_id": self.client_user.pk,
+                }
+                for day in range(3)
+            ]
+        }
+
+        response = self.client.post(
+            reverse("events_bulk_create"), payload, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["created"]), 3)
+        self.assertEqual(response.json()["errors"], [])
+
+    def test_bulk_create_events_endpoint_rejects_malformed_body(self):
+        self.login()
+
+        response = self.client.post(
+            reverse("events_bulk_create"), "nope", content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_invite_client_action_sends_activation_email(self):
+        self.client_user.set_unusable_password()
+        self.client_user.save()
+        self.login()
+
+        response = self.client.post(
+            self.url, {"action": "invite_client", "client_id": self.client_user.pk}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("/clients/activate/", mail.outbox[0].body)
+
+    def test_import_clients_endpoint_reports_existing_email(self):
+        self.login()
+        upload = SimpleUploadedFile(
+            "clients.csv", b"email;first_name\nnew@example.com;Nina\nclient@example.com;Clara\n"
+        )
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["created"], 1)
+        self.assertEqual(payload["errors"][0]["line"], 3)
+        self.assertTrue(
+            User.objects.filter(
+                email="new@example.com", linked_professional=self.user
+            ).exists()
+        )
+
+    def test_bulk_event_operation_endpoint_cancels_day(self):
+        self.login()
+        start_at = timezone.now().replace(minute=0, second=0, microsecond=0)
+        event = Event.objects.create(
+            calendar=self.calendar,
+            title="Soin",
+            start_at=start_at,
+            end_at=start_at + timedelta(hours=1),
+            created_by=self.user,
+        )
+        day = timezone.localtime(start_at).date().isoformat()
+
+        response = self.client.post(
+            reverse("events_bulk_operation"),
+            {"operation": "cancel", "date_from": day, "date_to": day},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["event_ids"], [event.pk])
+        event.refresh_from_db()
+        self.assertEqual(event.status, "canceled")
+
+    def test_move_event_endpoint_returns_recomputed_block(self):
+        self.login()
+        start_at = timezone.now().replace(minute=0, second=0, microsecond=0)
+        event = Event.objects.create(
+            calendar=self.calendar,
+            title="Massage",
+            start_at=start_at,
+            end_at=start_at + timedelta(hours=1),
+            created_by=self.user,
+        )
+        EventAttendee.objects.create(event=event, user=self.client_user)
+        new_start = start_at + timedelta(hours=2)
+
+        response = self.client.post(
+            reverse("event_move", args=[event.pk]),
+            {"start_at": new_start.isoformat(), "end_at": None},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        block = response.json()["event"]
+        self.assertEqual(block["event_id"], event.pk)
+        self.assertEqual(block["client"], "Clara Client")
+        self.assertEqual(
+            block["time"],
+            f"{timezone.localtime(new_start):%H:%M} – "
+            f"{timezone.localtime(new_start + timedelta(hours=1)):%H:%M}",
+        )
+
+    def test_dashboard_post_add_attendee_fills_group_session(self):
+        self.login()
+        start_at = timezone.now().replace(minute=0, second=0, microsecond=0)
+        event = Event.objects.create(
+            calendar=self.calendar,
+            title="Pilates",
+            start_at=start_at,
+            end_at=start_at + timedelta(hours=1),
+            created_by=self.user,
+            capacity=10,
+        )
+
+        response = self.client.post(
+            f"{self.url}?section=planning",
+            {
+                "action": "add_attendee",
+                "event_id": str(event.pk),
+                "client_id": str(self.client_user.pk),
+            },
+        )
+
+        self.assertRedirects(response, f"{self.url}?section=planning")
+        event.refresh_from_db()
+        self.assertEqual(event.attendee_count, 1)
+        self.assertTrue(
+            EventAttendee.objects.filter(event=event, user=self.client_user).exists()
+        )
+
+
+class DashboardIdempotencyClaimTests(TransactionTestCase):
+    def test_claim_is_visible_to_concurrent_requests_while_the_command_runs(self):
+        user = User.objects.create_user(
+            email="claim-pro@example.com", password="safe-password", user_type=User.UserType.PROFESSIONAL
+        )
+        self.client.login(email=user.email, password="safe-password")
+        seen = []
+
+        def _read_from_another_connection():
+            try:
+                seen.append(IdempotencyKey.objects.values_list("response_status", flat=True).first())
+            finally:
+                connections.close_all()
+
+        def _command(user, data):
+            reader = threading.Thread(target=_read_from_another_connection)
+            reader.start()
+            reader.join()
+            return CommandResult(success=True, section="clients")
+
+        with patch.dict(DASHBOARD_COMMANDS, {"add_client": _command}):
+            response = self.client.post(
+                reverse("dashboard"), {"action": "add_client", "idempotency_key": "3f1c2a9e-concurrent"}
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(seen, [IDEMPOTENCY_PENDING])
+        self.assertEqual(IdempotencyKey.objects.get().response_status, 302)
+
+    def test_crashing_command_releases_the_key(self):
+        user = User.objects.create_user(
+            email="crash-pro@example.com", password="safe-password", user_type=User.UserType.PROFESSIONAL
+        )
+        self.client.login(email=user.email, password="safe-password")
+
+        with patch.dict(DASHBOARD_COMMANDS, {"add_client": MagicMock(side_effect=RuntimeError)}):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse("dashboard"), {"action": "add_client", "idempotency_key": "3f1c2a9e-crashing"})
+
+        self.assertFalse(IdempotencyKey.objects.exists())
+
 
 class DashboardViewIndividualTests(TestCase):
     def setUp(self):
@@ -245,6 +566,14 @@ class DashboardViewIndividualTests(TestCase):
         logged_in = self.client.login(email=self.user.email, password="safe-password")
         self.assertTrue(logged_in)
 
+    def test_import_clients_endpoint_is_denied(self):
+        self.login()
+        upload = SimpleUploadedFile("clients.csv", b"email\nx@example.com\n")
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        self.assertEqual(response.status_code, 403)
+
     def test_add_client_denied_for_individuals(self):
         self.login()
 
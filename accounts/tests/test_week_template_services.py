@@ -0,0 +1,177 @@
+"""Tests for week templates."""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,no-member
+
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Calendar, Event, EventAttendee, WeekTemplate
+from accounts.planning import week_start_for_offset
+from accounts.week_template_services import apply_week_template, capture_week_template
+
+User = get_user_model()
+
+
+class WeekTemplateServicesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="template-pro@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.client_user = User.objects.create_user(
+            email="template-client@example.com",
+            password="safe-password",
+            user_type=User.UserType.INDIVIDUAL,
+            linked_professional=self.user,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.user, name="Agenda", slug="template-agenda"
+        )
+        self.week = week_start_for_offset(0)
+        monday_nine = self._at(self.week, 9)
+        private = Event.objects.create(
+            calendar=self.calendar,
+            title="Coaching",
+            start_at=monday_nine,
+            end_at=monday_nine + timedelta(minutes=45),
+            price=Decimal("60.00"),
+        )
+        EventAttendee.objects.create(event=private, user=self.client_user)
+        Event.objects.create(
+            calendar=self.calendar,
+            title="Cours collectif",
+            start_at=self._at(self.week + timedelta(days=2), 18),
+            end_at=self._at(self.week + timedelta(days=2), 19),
+            capacity=8,
+        )
+
+    @staticmethod
+    def _at(day, hour):
+        return timezone.make_aware(
+            datetime.combine(day, time(hour=hour)), timezone.get_current_timezone()
+        )
+
+    def test_capture_stores_local_slots(self):
+        success, template = capture_week_template(
+            self.user, self.calendar, self.week, "Semaine type"
+        )
+
+        self.assertTrue(success)
+        coaching, group = template.slots.all()
+        self.assertEqual((coaching.weekday, coaching.start_time), (0, time(9)))
+        self.assertEqual(coaching.duration_minutes, 45)
+        self.assertEqual(coaching.client, self.client_user)
+        self.assertEqual(coaching.price, Decimal("60.00"))
+        self.assertEqual((group.weekday, group.capacity, group.client), (2, 8, None))
+
+        success, message = capture_week_template(
+            self.user, self.calendar, self.week, "Semaine type"
+        )
+        self.assertFalse(success)
+        self.assertIn("nom", message)
+
+    def test_apply_creates_events_and_skips_conflicts(self):
+        _, template = capture_week_template(
+            self.user, self.calendar, self.week, "Semaine type"
+        )
+        next_week = self.week + timedelta(weeks=1)
+        Event.objects.create(
+            calendar=self.calendar,
+            title="Déjà pris",
+            start_at=self._at(next_week, 9),
+            end_at=self._at(next_week, 10),
+        )
+
+        # Template, clients, one window query per week, the inserts, then
+        # the client stats refresh and the portal versions.
+        with self.assertNumQueries(3 + 12 + 4 + 5 + 2):
+            success, result = apply_week_template(
+                self.user, self.calendar, template.pk, next_week, 12
+            )
+
+        self.assertTrue(success)
+        self.assertEqual(len(result["created"]), 23)
+        self.assertEqual(len(result["skipped"]), 1)
+        created = Event.objects.filter(pk__in=result["created"])
+        self.assertEqual(
+            EventAttendee.objects.filter(
+                event__in=created, user=self.client_user
+            ).count(),
+            11,
+        )
+        self.assertEqual(created.filter(price=Decimal("60.00")).count(), 11)
+        self.assertEqual(created.filter(capacity=8, attendee_count=0).count(), 12)
+
+    def test_apply_is_scoped_to_owner(self):
+        template = WeekTemplate.objects.create(owner=self.user, name="Privé")
+        other = User.objects.create_user(
+            email="template-other@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+
+        success, _ = apply_week_template(
+            other, self.calendar, template.pk, self.week, 1
+        )
+
+        self.assertFalse(success)
+
+
+class WeekTemplateViewsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="template-view@example.com",
+            password="safe-password",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        self.calendar = Calendar.objects.create(
+            owner=self.user, name="Agenda", slug="template-view-agenda"
+        )
+        start = timezone.make_aware(
+            datetime.combine(week_start_for_offset(0), time(hour=10)),
+            timezone.get_current_timezone(),
+        )
+        Event.objects.create(
+            calendar=self.calendar,
+            title="Bloc",
+            start_at=start,
+            end_at=start + timedelta(hours=1),
+        )
+        self.client.login(email=self.user.email, password="safe-password")
+
+    def _post(self, url, payload):
+        return self.client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def test_capture_then_apply(self):
+        response = self._post(
+            reverse("week_template_capture"), {"name": "Type", "week_offset": 0}
+        )
+        self.assertEqual(response.status_code, 201)
+        template_id = response.json()["id"]
+
+        response = self._post(
+            reverse("week_template_apply", args=[template_id]),
+            {"week_offset": 1, "weeks": 4},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["created"]), 4)
+
+    def test_apply_rejects_current_week(self):
+        template = WeekTemplate.objects.create(owner=self.user, name="Type")
+
+        response = self._post(
+            reverse("week_template_apply", args=[template.pk]),
+            {"week_offset": 0, "weeks": 4},
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -7,5 +7,59 @@ from . import views
 urlpatterns = [
     path("", views.dashboard, name="dashboard"),
     path("logout/", views.logout_view, name="logout"),
+    path("dashboard/actions/", views.dashboard_action_api, name="dashboard_action_api"),
+    path("dashboard/batch/", views.dashboard_batch_api, name="dashboard_batch_api"),
+    path("services/import/", views.import_services_view, name="services_import"),
+    path("clients/", views.clients_page_view, name="clients_page"),
+    path(
+        "clients/autocomplete/",
+        views.client_autocomplete_view,
+        name="client_autocomplete",
+    ),
+    path(
+        "clients/<int:pk>/history/",
+        views.client_history_view,
+        name="client_history",
+    ),
+    path(
+        "clients/lookup/",
+        views.client_phone_lookup_view,
+        name="client_phone_lookup",
+    ),
+    path(
+        "clients/duplicates/",
+        views.client_duplicates_view,
+        name="client_duplicates",
+    ),
+    path("clients/merge/", views.merge_clients_view, name="clients_merge"),
+    path("clients/import/", views.import_clients_view, name="clients_import"),
+    path(
+        "clients/activate/<uidb64>/<token>/",
+        views.client_activate,
+        name="client_activate",
+    ),
+    path("portal/", views.client_portal_view, name="client_portal"),
+    path(
+        "rsvp/<str:token>/",
+        views.attendance_response_view,
+        name="attendance_response",
+    ),
+    path("events/bulk/", views.bulk_create_events_view, name="events_bulk_create"),
+    path("events/<int:pk>/move/", views.move_event_view, name="event_move"),
+    path(
+        "events/bulk-operation/",
+        views.bulk_event_operation_view,
+        name="events_bulk_operation",
+    ),
+    path(
+        "planning/templates/",
+        views.capture_week_template_view,
+        name="week_template_capture",
+    ),
+    path(
+        "planning/templates/<int:pk>/apply/",
+        views.apply_week_template_view,
+        name="week_template_apply",
+    ),
     path("workshops/<int:pk>/", views.workshop_detail, name="workshop_detail"),
 ]
@@ -1,25 +1,68 @@
 """Views for the accounts application."""
 
+import io
+import json
+from urllib.parse import parse_qs, urlsplit
+
 from django.contrib import messages
-from django.contrib.auth import logout
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
+from django.contrib.auth.forms import SetPasswordForm
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-
-from .client_services import create_client, update_client
-from .client_services import delete_client as service_delete_client
-from .dashboard_services import build_dashboard_context, initialize_dashboard_state
-from .event_services import create_event, delete_event
-from .forms import CategoryForm, ClientForm, EventForm, ServiceForm
-from .models import Workshop
-from .services import (
-    delete_service,
-    prepare_service_form,
-    save_category_form,
-    save_service_form,
+from django.views.decorators.http import require_POST
+
+from .catalogue_services import import_service_catalogue
+from .client_autocomplete import autocomplete_clients
+from .client_services import (
+    find_client_by_phone,
+    import_clients,
+    list_client_appointments,
+    list_clients_page,
+)
+from .confirmation_services import (
+    ACTION_CANCEL,
+    attendance_links,
+    queue_response,
+    resolve_response,
+)
+from .dashboard_batch import BATCH_MAX_ACTIONS, run_dashboard_batch
+from .dashboard_commands import DASHBOARD_COMMANDS, CommandResult, run_invite_client
+from .dashboard_services import (
+    DASHBOARD_FRAGMENT_TEMPLATES,
+    build_dashboard_context,
+    initialize_dashboard_state,
+    render_dashboard_fragment,
+)
+from .duplicate_services import get_duplicate_report, merge_clients
+from .event_services import (
+    bulk_create_events,
+    bulk_event_operation,
+    move_event,
 )
+from .forms import (
+    BulkEventActionForm,
+    CsvImportForm,
+    WeekTemplateApplyForm,
+    WeekTemplateCaptureForm,
+)
+from .idempotency_services import (
+    claim_idempotency_key,
+    idempotency_conflict,
+    normalize_idempotency_key,
+    record_idempotent_response,
+    replay_idempotent_response,
+)
+from .invitation_services import resolve_activation_client
+from .models import Workshop
+from .planning import build_event_view, week_start_for_offset
+from .portal_services import client_portal
 from .utils import ensure_user_calendar
+from .week_template_services import apply_week_template, capture_week_template
+
+BULK_EVENTS_MAX_ITEMS = 5000
 
 
 def _safe_int(value: str | None) -> int | None:
@@ -30,203 +73,530 @@ def _safe_int(value: str | None) -> int | None:
         return None
 
 
-def _handle_add_category(request, state):
-    """Process category creation and toggle modal visibility."""
-    state["section"] = "services"
-    state["show_category_form"] = True
-    form = CategoryForm(request.POST)
-    success, form = save_category_form(form)
-    state["category_form"] = form
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=services")
-    return None
+def _json_body(request) -> dict | None:
+    """Decode a JSON object request body, or return None when malformed."""
+    try:
+        payload = json.loads(request.body or b"{}")
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
 
 
-def _handle_add_service(request, state):
-    """Persist a new service and reopen the modal when invalid."""
-    state["section"] = "services"
-    state["show_service_form"] = True
-    form = ServiceForm(request.POST)
-    success, form = save_service_form(form, user=request.user)
-    state["service_form"] = form
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=services")
-    return None
+def _json_error(message: str, status: int = 400) -> JsonResponse:
+    """Return a JSON error payload with the given HTTP status."""
+    return JsonResponse({"error": message}, status=status)
 
 
-def _handle_update_service(request, state):
-    """Update an existing service with submitted data."""
-    state["section"] = "services"
-    state["show_service_form"] = True
-    service_id = _safe_int(request.POST.get("service_id"))
-    form, _ = prepare_service_form(service_id, data=request.POST)
-    success, form = save_service_form(form)
-    state["service_form"] = form
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=services")
-    return None
+# Modal re-opened with its bound form when a command fails validation:
+# action -> (state flag, state key of the form).
+DASHBOARD_FORM_STATE = {
+    "add_category": ("show_category_form", "category_form"),
+    "add_service": ("show_service_form", "service_form"),
+    "update_service": ("show_service_form", "service_form"),
+    "add_client": ("show_client_modal", "client_form"),
+    "update_client": ("show_client_modal", "client_form"),
+}
 
 
-def _handle_delete_service(request, state):
-    """Remove a service and refresh the services section."""
-    state["section"] = "services"
-    service_id = _safe_int(request.POST.get("service_id"))
-    if service_id:
-        delete_service(service_id)
-    return redirect(f"{reverse('dashboard')}?section=services")
-
-
-def _handle_add_client(request, state):
-    """Create a new client for the professional, enforcing permissions."""
-    state["section"] = "clients"
-    state["show_client_modal"] = True
-    success, result = create_client(request.user, request.POST)
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=clients")
-    # result is a bound form with errors
-    state["client_form"] = result if result is not None else ClientForm(request.POST)
-    return None
+def _dashboard_redirect(section: str) -> HttpResponse:
+    """Redirect to the dashboard on ``section``."""
+    return redirect(f"{reverse('dashboard')}?section={section}")
 
 
-def _handle_update_client(request, state):
-    """Update an existing client linked to the professional."""
-    state["section"] = "clients"
-    client_id = _safe_int(request.POST.get("client_id"))
-    if not client_id:
-        messages.error(request, "Client introuvable.")
-        return None
-    success, result = update_client(request.user, client_id, request.POST)
-    state["show_client_modal"] = True
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=clients")
-    # result may be None (not found/authorized) or a bound form with errors
-    if result is None:
-        messages.error(request, "Client introuvable ou non autorisé.")
+def _run_dashboard_command(request, action: str) -> CommandResult:
+    """Run the dashboard command of ``action`` for the current user."""
+    if action == "invite_client":
+        base_url = f"{request.scheme}://{request.get_host()}"
+        return run_invite_client(request.user, request.POST, base_url=base_url)
+    return DASHBOARD_COMMANDS[action](request.user, request.POST)
+
+
+def _idempotent_command(request, action: str, replay):
+    """Run ``action`` once per ``idempotency_key``.
+
+    The key is claimed in its own committed transaction before the command
+    runs; a key already claimed for this user returns ``replay(record)``
+    instead. The command and the record of its outcome share one
+    transaction: successful commands record the dashboard redirect of their
+    section, so the HTML and JSON endpoints replay each other's keys, and a
+    failing or crashing command releases the key. Returns the result, or
+    the replayed response.
+    """
+    key = normalize_idempotency_key(request.POST.get("idempotency_key"))
+    if key:
+        record = claim_idempotency_key(request.user, key, action)
+        if record is not None:
+            return replay(record)
+    try:
+        with transaction.atomic():
+            result = _run_dashboard_command(request, action)
+            if key:
+                record_idempotent_response(
+                    request.user,
+                    key,
+                    _dashboard_redirect(result.section) if result.success else None,
+                )
+    except Exception:
+        if key:
+            record_idempotent_response(request.user, key, None)
+        raise
+    return result
+
+
+def _dispatch_dashboard_action(request, state) -> HttpResponse | None:
+    """Run the command of the submitted dashboard action and render its result.
+
+    Success redirects to the affected section with the command's message;
+    a validation failure re-opens the modal with the bound form, any other
+    failure is shown as an error message.
+    """
+    action = request.POST.get("action")
+    if action not in DASHBOARD_COMMANDS:
         return None
-    state["client_form"] = result
+    outcome = _idempotent_command(
+        request, action, lambda record: replay_idempotent_response(record, action)
+    )
+    if isinstance(outcome, HttpResponse):
+        return outcome
+    state["section"] = outcome.section
+    if outcome.success:
+        if outcome.message:
+            messages.add_message(request, outcome.level, outcome.message)
+        return _dashboard_redirect(outcome.section)
+    flag, form_key = DASHBOARD_FORM_STATE.get(action, (None, None))
+    if flag and outcome.form is not None:
+        state[flag] = True
+        state[form_key] = outcome.form
+    else:
+        messages.error(request, outcome.message or "Action impossible.")
     return None
 
 
-def _handle_delete_client(request, state):
-    """Delete a client linked to the professional."""
-    state["section"] = "clients"
-    client_id = _safe_int(request.POST.get("client_id"))
-    if not client_id:
-        messages.error(request, "Client introuvable.")
-        return None
-    success, message = service_delete_client(request.user, client_id)
-    if not success:
-        messages.error(request, message or "Client introuvable ou non autorisé.")
-        return None
-    messages.success(request, "Le client a été supprimé.")
-    return redirect(f"{reverse('dashboard')}?section=clients")
+@login_required
+def dashboard(request):
+    """Render the dashboard and handle service/category management."""
+    state = initialize_dashboard_state(request)
+    if request.method == "POST":
+        response = _dispatch_dashboard_action(request, state)
+        if response:
+            return response
+    week_offset = _safe_int(request.GET.get("week_offset"))
+    if week_offset is None:
+        week_offset = 0
+    context = build_dashboard_context(request.user, state, week_offset)
+    return render(request, "accounts/dashboard.html", context)
 
 
-def _handle_add_event(request, state):
-    """Create a calendar event from the planning modal."""
-    state["section"] = "planning"
-    if not request.user.is_authenticated:
-        return redirect("login")
+@login_required
+@require_POST
+def dashboard_action_api(request):
+    """JSON variant of the dashboard dispatcher.
+
+    Accepts the same form fields as the dashboard modals, runs the matching
+    command and answers with its result plus the re-rendered fragment of the
+    affected section only, instead of redirecting to a full dashboard render.
+    An ``idempotency_key`` is honoured as on the HTML dashboard: a replay
+    returns the section's fresh fragment, a key still being processed by a
+    concurrent request a 409 and a key used for another action a 422.
+    """
+    action = request.POST.get("action")
+    if action not in DASHBOARD_COMMANDS:
+        return _json_error("Action inconnue.")
+    week_offset = _safe_int(request.POST.get("week_offset")) or 0
+
+    def _replay(record):
+        conflict = idempotency_conflict(record, action)
+        if conflict is not None:
+            status, message = conflict
+            return _json_error(message, status)
+        section = parse_qs(urlsplit(record.response_location).query).get(
+            "section", [""]
+        )[0]
+        if section not in DASHBOARD_FRAGMENT_TEMPLATES:
+            return JsonResponse({"action": action, "success": True, "replayed": True})
+        return JsonResponse(
+            {
+                "action": action,
+                "success": True,
+                "section": section,
+                "replayed": True,
+                "fragments": {
+                    section: render_dashboard_fragment(request, section, week_offset)
+                },
+            }
+        )
+
+    outcome = _idempotent_command(request, action, _replay)
+    if isinstance(outcome, HttpResponse):
+        return outcome
+    payload = {"action": action, **outcome.as_json()}
+    if not outcome.success:
+        return JsonResponse(payload, status=400)
+    payload["fragments"] = {
+        outcome.section: render_dashboard_fragment(
+            request, outcome.section, week_offset
+        )
+    }
+    return JsonResponse(payload)
+
+
+@login_required
+@require_POST
+def dashboard_batch_api(request):
+    """Run a list of dashboard actions in one transaction.
+
+    Expects ``{"actions": [{"action": "update_service", ...}, ...]}`` and
+    returns per-action results. When every action succeeds the fragments of
+    the touched sections are rendered once each.
+    """
+    payload = _json_body(request)
+    actions = payload.get("actions") if payload else None
+    if not isinstance(actions, list) or not actions:
+        return _json_error("Le corps doit contenir une liste « actions ».")
+    if len(actions) > BATCH_MAX_ACTIONS:
+        return _json_error(f"Un lot ne peut pas dépasser {BATCH_MAX_ACTIONS} actions.")
+
+    committed, results = run_dashboard_batch(request.user, actions)
+    response = {"committed": committed, "results": results}
+    if not committed:
+        return JsonResponse(response, status=400)
+    week_offset = _safe_int(str(payload.get("week_offset", 0))) or 0
+    sections = {result["section"] for result in results}
+    response["fragments"] = {
+        section: render_dashboard_fragment(request, section, week_offset)
+        for section in sorted(sections)
+    }
+    return JsonResponse(response)
+
+
+@login_required
+@require_POST
+def bulk_create_events_view(request):
+    """Create a batch of appointments from a JSON payload.
+
+    Expects ``{"events": [{"start_at", "end_at", "service_id", "client_id"}]}``.
+    Batches are capped at ``BULK_EVENTS_MAX_ITEMS`` to bound request time, and
+    the response only carries created IDs and per-item errors.
+    """
     if not request.user.is_professional:
-        messages.error(
-            request,
-            "Vous devez être un professionnel pour planifier un rendez-vous.",
+        return _json_error(
+            "Vous devez être un professionnel pour planifier un rendez-vous.", 403
+        )
+    payload = _json_body(request)
+    items = payload.get("events") if payload else None
+    if not isinstance(items, list):
+        return _json_error("Le corps doit contenir une liste « events ».")
+    if len(items) > BULK_EVENTS_MAX_ITEMS:
+        return _json_error(
+            f"Un lot ne peut pas dépasser {BULK_EVENTS_MAX_ITEMS} rendez-vous."
         )
-        return None
 
     calendar = ensure_user_calendar(request.user)
-    state["calendar"] = calendar
-    form = EventForm(request.POST)
-    if not form.is_valid():
-        messages.error(
-            request,
-            "Veuillez sélectionner un horaire, une prestation et un client.",
-        )
-        return None
+    created, errors = bulk_create_events(request.user, calendar, items)
+    return JsonResponse(
+        {"created": [event.pk for event in created], "errors": errors},
+        status=201 if created else 400,
+    )
+
 
-    success, result = create_event(
+@login_required
+def clients_page_view(request):
+    """Return one page of the professional's clients as JSON.
+
+    Accepts ``q`` (prefix search over the professional's clients, not
+    indexed), ``sort`` and ``segment`` (see ``list_clients_page``) and
+    ``after`` (cursor returned as ``next`` by the previous page).
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour consulter vos clients.", 403
+        )
+    page = list_clients_page(
         request.user,
-        calendar,
-        form.cleaned_data["start_at"],
-        form.cleaned_data["end_at"],
-        form.cleaned_data["service_id"],
-        form.cleaned_data["client_id"],
+        search=request.GET.get("q", "").strip()[:100],
+        cursor=request.GET.get("after") or None,
+        sort=request.GET.get("sort", "name"),
+        segment=request.GET.get("segment", ""),
     )
-    if success:
-        return redirect(f"{reverse('dashboard')}?section=planning")
+    return JsonResponse({"clients": page.rows, "next": page.next_cursor})
 
-    messages.error(
-        request,
-        result
-        or "Impossible de créer le rendez-vous. Vérifiez les informations fournies.",
+
+@login_required
+def client_autocomplete_view(request):
+    """Return the professional's clients matching the typed prefix ``q``.
+
+    Lookups are served from the worker's in-memory index, without a query
+    once the index is built.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour consulter vos clients.", 403
+        )
+    query = request.GET.get("q", "").strip()[:100]
+    return JsonResponse({"results": autocomplete_clients(request.user, query)})
+
+
+@login_required
+def client_history_view(request, pk):
+    """Return one page of a client's appointments as JSON, newest first.
+
+    Accepts ``after`` (cursor returned as ``next``) and ``details=1`` to
+    include the event descriptions.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour consulter vos clients.", 403
+        )
+    page = list_client_appointments(
+        request.user,
+        pk,
+        cursor=request.GET.get("after") or None,
+        with_description=request.GET.get("details") == "1",
     )
-    return None
+    if page is None:
+        return _json_error("Client introuvable.", 404)
+    return JsonResponse({"appointments": page.rows, "next": page.next_cursor})
 
 
-def _handle_delete_event(request, state):
-    """Delete an existing event owned by the professional."""
-    state["section"] = "planning"
-    if not request.user.is_authenticated:
-        return redirect("login")
+@login_required
+def client_phone_lookup_view(request):
+    """Identify an incoming caller from the ``phone`` query parameter.
+
+    Returns the matching client and their next appointment, or 404.
+    """
     if not request.user.is_professional:
-        messages.error(
-            request, "Vous devez être un professionnel pour gérer vos rendez-vous."
+        return _json_error(
+            "Vous devez être un professionnel pour consulter vos clients.", 403
         )
-        return None
+    match = find_client_by_phone(request.user, request.GET.get("phone", "")[:30])
+    if match is None:
+        return _json_error("Aucun client ne correspond à ce numéro.", 404)
+    return JsonResponse(match)
+
+
+@login_required
+def client_duplicates_view(request):
+    """Return one page of the stored groups of clients that look alike.
 
-    event_id = _safe_int(request.POST.get("event_id"))
-    if not event_id:
-        messages.error(request, "Rendez-vous introuvable.")
+    The groups are computed offline by the ``find_client_duplicates``
+    command; ``offset`` pages through them and ``stale`` tells whether a
+    client was written since the last scan.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour consulter vos clients.", 403
+        )
+    offset = max(_safe_int(request.GET.get("offset")) or 0, 0)
+    return JsonResponse(get_duplicate_report(request.user, offset=offset))
+
+
+def _parse_merges(merges) -> dict[int, list[int]] | None:
+    """Return the target -> duplicates mapping of a merge payload, or None."""
+    if not isinstance(merges, list):
         return None
 
-    success, message = delete_event(request.user, event_id)
+    mapping: dict[int, list[int]] = {}
+    for item in merges:
+        if not isinstance(item, dict):
+            return None
+        primary, duplicates = item.get("primary"), item.get("duplicates")
+        if not isinstance(primary, int) or not isinstance(duplicates, list):
+            return None
+        # JSON booleans are ints in Python; ids must be plain numbers.
+        ids = [primary, *duplicates]
+        if any(not isinstance(pk, int) or isinstance(pk, bool) for pk in ids):
+            return None
+        mapping[primary] = duplicates
+    return mapping
+
+
+@login_required
+@require_POST
+def merge_clients_view(request):
+    """Merge duplicate clients in one transaction.
+
+    Expects ``{"merges": [{"primary": id, "duplicates": [id, ...]}, ...]}``
+    with integer ids; any other shape is answered with a 400.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour gérer vos clients.", 403
+        )
+    payload = _json_body(request)
+    mapping = _parse_merges(payload.get("merges") if payload is not None else None)
+    if mapping is None:
+        return _json_error("Requête de fusion invalide.")
+    success, result = merge_clients(request.user, mapping)
     if not success:
-        messages.error(
-            request,
-            message
-            or "Vous ne pouvez supprimer que les rendez-vous appartenant à votre agenda.",
+        return _json_error(result)
+    return JsonResponse(result)
+
+
+def _run_csv_import(request, importer) -> JsonResponse:
+    """Validate the uploaded CSV and stream it through ``importer``.
+
+    A missing column is answered with a 400 error. A file that cannot be
+    decoded or parsed is answered with a 400 carrying the error and the
+    counts of the rows already committed.
+    """
+    form = CsvImportForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    lines = io.TextIOWrapper(form.cleaned_data["file"], encoding="utf-8-sig")
+    try:
+        report = importer(request.user, lines)
+    except ValueError as exc:
+        return _json_error(str(exc))
+    # A file unreadable part-way still reports the rows committed before.
+    return JsonResponse(report.as_json(), status=400 if report.error else 200)
+
+
+@login_required
+@require_POST
+def import_services_view(request):
+    """Import the professional's service catalogue from an uploaded CSV.
+
+    The file is read line by line and written in chunks; the response
+    reports created/updated counts and the errors of rejected lines.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour importer des prestations.", 403
         )
-        return None
+    return _run_csv_import(request, import_service_catalogue)
 
-    messages.success(request, "Le rendez-vous a été supprimé.")
-    return redirect(f"{reverse('dashboard')}?section=planning")
 
+@login_required
+@require_POST
+def import_clients_view(request):
+    """Import clients linked to the professional from an uploaded CSV.
 
-def _dispatch_dashboard_action(request, state) -> HttpResponse | None:
-    """Invoke the handler that matches the submitted dashboard action."""
-    action = request.POST.get("action")
-    handler = DASHBOARD_ACTION_HANDLERS.get(action)
-    if handler:
-        return handler(request, state)
-    return None
+    Emails already registered, or repeated in the file, are reported as
+    errors; valid rows are inserted in chunks.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour importer des clients.", 403
+        )
+    return _run_csv_import(request, import_clients)
 
 
-DASHBOARD_ACTION_HANDLERS = {
-    "add_category": _handle_add_category,
-    "add_service": _handle_add_service,
-    "update_service": _handle_update_service,
-    "delete_service": _handle_delete_service,
-    "add_client": _handle_add_client,
-    "update_client": _handle_update_client,
-    "delete_client": _handle_delete_client,
-    "add_event": _handle_add_event,
-    "delete_event": _handle_delete_event,
-}
+@login_required
+@require_POST
+def bulk_event_operation_view(request):
+    """Confirm, cancel or delete every event matching a range in one request.
+
+    Expects a JSON object validated by ``BulkEventActionForm`` and returns the
+    IDs of the affected events so the caller can notify clients.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour gérer vos rendez-vous.", 403
+        )
+    payload = _json_body(request)
+    if payload is None:
+        return _json_error("Corps JSON invalide.")
+    form = BulkEventActionForm(payload)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    data = form.cleaned_data
+    event_ids = bulk_event_operation(
+        request.user,
+        data["operation"],
+        data["date_from"],
+        data["date_to"],
+        calendar_id=data["calendar_id"],
+        status=data["status"] or None,
+    )
+    return JsonResponse({"operation": data["operation"], "event_ids": event_ids})
 
 
 @login_required
-def dashboard(request):
-    """Render the dashboard and handle service/category management."""
-    state = initialize_dashboard_state(request)
-    if request.method == "POST":
-        response = _dispatch_dashboard_action(request, state)
-        if response:
-            return response
-    week_offset = _safe_int(request.GET.get("week_offset"))
-    if week_offset is None:
-        week_offset = 0
-    context = build_dashboard_context(request.user, state, week_offset)
-    return render(request, "accounts/dashboard.html", context)
+@require_POST
+def capture_week_template_view(request):
+    """Save the planner week at ``week_offset`` as a named template.
+
+    Expects ``{"name": str, "week_offset": int}``.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour gérer vos rendez-vous.", 403
+        )
+    payload = _json_body(request)
+    if payload is None:
+        return _json_error("Corps JSON invalide.")
+    form = WeekTemplateCaptureForm(payload)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    success, result = capture_week_template(
+        request.user,
+        ensure_user_calendar(request.user),
+        week_start_for_offset(form.cleaned_data["week_offset"] or 0),
+        form.cleaned_data["name"],
+    )
+    if not success:
+        return _json_error(result)
+    return JsonResponse(
+        {"id": result.pk, "name": result.name, "slots": result.slots.count()},
+        status=201,
+    )
+
+
+@login_required
+@require_POST
+def apply_week_template_view(request, pk):
+    """Apply a week template to consecutive future weeks in one request.
+
+    Expects ``{"week_offset": first_week >= 1, "weeks": n}`` and returns the
+    created event IDs and the skipped slots.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour gérer vos rendez-vous.", 403
+        )
+    payload = _json_body(request)
+    if payload is None:
+        return _json_error("Corps JSON invalide.")
+    form = WeekTemplateApplyForm(payload)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    success, result = apply_week_template(
+        request.user,
+        ensure_user_calendar(request.user),
+        pk,
+        week_start_for_offset(form.cleaned_data["week_offset"]),
+        form.cleaned_data["weeks"],
+    )
+    if not success:
+        return _json_error(result, 404)
+    return JsonResponse(result, status=201)
+
+
+@login_required
+@require_POST
+def move_event_view(request, pk):
+    """Move or resize an event and return its recomputed planner block.
+
+    Expects ``{"start_at": iso, "end_at": iso | null}``. Only the touched
+    block is returned so the planner can update in place.
+    """
+    if not request.user.is_professional:
+        return _json_error(
+            "Vous devez être un professionnel pour gérer vos rendez-vous.", 403
+        )
+    payload = _json_body(request)
+    if payload is None:
+        return _json_error("Corps JSON invalide.")
+    success, result = move_event(
+        request.user, pk, payload.get("start_at"), payload.get("end_at")
+    )
+    if not success:
+        return _json_error(result)
+    return JsonResponse({"event": build_event_view(result)._asdict()})
 
 
 @login_required
@@ -238,6 +608,65 @@ def logout_view(request):
     return redirect("dashboard")
 
 
+def client_activate(request, uidb64, token):
+    """Let an invited client choose a password, then log them in.
+
+    The link stops being valid once a password is set, so it works once.
+    """
+    client = resolve_activation_client(uidb64, token)
+    if client is None:
+        return render(
+            request, "registration/client_activate.html", {"validlink": False}
+        )
+    form = SetPasswordForm(client, request.POST or None)
+    if request.method == "POST" and form.is_valid():
+        form.save()
+        login(request, client)
+        messages.success(request, "Votre compte est activé.")
+        return redirect("dashboard")
+    return render(
+        request,
+        "registration/client_activate.html",
+        {"validlink": True, "form": form, "client": client},
+    )
+
+
+@login_required
+def client_portal_view(request):
+    """List the signed-in client's appointments across every professional."""
+    portal = client_portal(request.user)
+    for appointment in portal.upcoming:
+        if appointment["status"] != "canceled" and not appointment["is_waitlisted"]:
+            appointment["links"] = attendance_links(
+                appointment["id"], appointment["event_id"]
+            )
+    return render(request, "accounts/client_portal.html", {"portal": portal})
+
+
+def attendance_response_view(request, token):
+    """Confirm or cancel an appointment from a signed link, without login.
+
+    GET only shows the appointment and a button, so mail scanners following
+    links do not answer for the client. POST only stores the response; it is
+    applied by the next ``flush_attendance_responses`` run.
+    """
+    resolved = resolve_response(token)
+    if resolved is None:
+        return render(
+            request, "registration/attendance_response.html", {"validlink": False}
+        )
+    response, attendee = resolved
+    context = {
+        "validlink": True,
+        "attendee": attendee,
+        "cancel": response[2] == ACTION_CANCEL,
+    }
+    if request.method == "POST":
+        queue_response(response)
+        context["recorded"] = True
+    return render(request, "registration/attendance_response.html", context)
+
+
 def workshop_detail(request, pk):
     """Display workshop details grouped by service category."""
     workshop = get_object_or_404(
@@ -0,0 +1,193 @@
+"""Week templates: capture a planner week and stamp it onto future weeks.
+
+Slots are stored in local wall-clock time (weekday + start time + duration)
+so a template keeps its hours across daylight-saving changes. Applying a
+template builds every event in memory, drops the slots that collide with
+existing appointments (one range query per target week) and writes the rest
+with ``bulk_create``.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from users.models import User
+
+from .client_stats_services import refresh_client_stats
+from .event_services import BULK_CREATE_BATCH_SIZE
+from .models import Event, EventAttendee, WeekTemplate, WeekTemplateSlot
+from .portal_services import invalidate_client_portal
+
+WEEK_TEMPLATE_MAX_WEEKS = 52
+
+
+def _week_bounds(week_start: date) -> tuple[datetime, datetime]:
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(week_start, time.min), tz)
+    end = timezone.make_aware(
+        datetime.combine(week_start + timedelta(days=7), time.min), tz
+    )
+    return start, end
+
+
+def capture_week_template(
+    user: User, calendar, week_start: date, name: str
+) -> tuple[bool, WeekTemplate | str]:
+    """Save the non-canceled events of a calendar week as a template.
+
+    Individual appointments keep their client; group sessions keep their
+    capacity but not their attendees. Every slot keeps the event's price.
+
+    Returns (True, template) on success or (False, message) on failure.
+    """
+    window_start, window_end = _week_bounds(week_start)
+    events = list(
+        Event.objects.filter(
+            calendar=calendar, start_at__gte=window_start, start_at__lt=window_end
+        )
+        .exclude(status="canceled")
+        .only("start_at", "end_at", "title", "description", "capacity", "price")
+        .order_by("start_at")
+    )
+    if not events:
+        return False, "Aucun rendez-vous à enregistrer pour cette semaine."
+
+    clients: dict[int, int] = {}
+    for event_id, client_id in (
+        EventAttendee.objects.filter(
+            event__in=[event for event in events if event.capacity is None]
+        )
+        .order_by("-pk")
+        .values_list("event_id", "user_id")
+    ):
+        clients[event_id] = client_id
+
+    try:
+        with transaction.atomic():
+            template = WeekTemplate.objects.create(owner=user, name=name)
+            slots = []
+            for event in events:
+                local_start = timezone.localtime(event.start_at)
+                slots.append(
+                    WeekTemplateSlot(
+                        template=template,
+                        weekday=local_start.weekday(),
+                        start_time=local_start.time().replace(microsecond=0),
+                        duration_minutes=max(
+                            int((event.end_at - event.start_at).total_seconds() // 60),
+                            1,
+                        ),
+                        title=event.title,
+                        description=event.description,
+                        capacity=event.capacity,
+                        price=event.price,
+                        client_id=clients.get(event.pk),
+                    )
+                )
+            WeekTemplateSlot.objects.bulk_create(slots)
+    except IntegrityError:
+        return False, "Un modèle porte déjà ce nom."
+    return True, template
+
+
+def _overlaps(start: datetime, end: datetime, busy: list[tuple[datetime, datetime]]):
+    return any(start < busy_end and end > busy_start for busy_start, busy_end in busy)
+
+
+def apply_week_template(
+    user: User, calendar, template_id, first_week: date, weeks: int
+) -> tuple[bool, dict | str]:
+    """Create the template's events on ``weeks`` consecutive weeks.
+
+    Slots overlapping a non-canceled event of the calendar are skipped, as
+    are slots whose client is no longer linked to ``user``.
+
+    Returns (True, {"created": [ids], "skipped": [...]}) on success or
+    (False, message) on failure.
+    """
+    template = WeekTemplate.objects.filter(pk=template_id, owner=user).first()
+    if template is None:
+        return False, "Modèle de semaine introuvable."
+    if not 1 <= weeks <= WEEK_TEMPLATE_MAX_WEEKS:
+        return (
+            False,
+            f"Le nombre de semaines doit être compris entre 1 et {WEEK_TEMPLATE_MAX_WEEKS}.",
+        )
+
+    slots = list(template.slots.all())
+    client_ids = {slot.client_id for slot in slots if slot.client_id}
+    linked_clients = set(
+        User.objects.filter(
+            pk__in=client_ids,
+            linked_professional=user,
+            user_type=User.UserType.INDIVIDUAL,
+        ).values_list("pk", flat=True)
+    )
+
+    tz = timezone.get_current_timezone()
+    events: list[Event] = []
+    event_clients: list[int | None] = []
+    skipped: list[dict] = []
+    for week in range(weeks):
+        week_start = first_week + timedelta(weeks=week)
+        window_start, window_end = _week_bounds(week_start)
+        busy = list(
+            Event.objects.filter(
+                calendar=calendar,
+                start_at__lt=window_end,
+                end_at__gt=window_start,
+            )
+            .exclude(status="canceled")
+            .values_list("start_at", "end_at")
+        )
+        for slot in slots:
+            start_at = timezone.make_aware(
+                datetime.combine(
+                    week_start + timedelta(days=slot.weekday), slot.start_time
+                ),
+                tz,
+            )
+            end_at = start_at + timedelta(minutes=slot.duration_minutes)
+            if slot.client_id and slot.client_id not in linked_clients:
+                skipped.append(
+                    {"start_at": start_at.isoformat(), "reason": "Client introuvable."}
+                )
+                continue
+            if _overlaps(start_at, end_at, busy):
+                skipped.append(
+                    {"start_at": start_at.isoformat(), "reason": "Créneau déjà occupé."}
+                )
+                continue
+            events.append(
+                Event(
+                    calendar=calendar,
+                    title=slot.title,
+                    description=slot.description,
+                    start_at=start_at,
+                    end_at=end_at,
+                    created_by=user,
+                    status="planned",
+                    capacity=slot.capacity,
+                    price=slot.price,
+                    attendee_count=1 if slot.client_id else 0,
+                )
+            )
+            event_clients.append(slot.client_id)
+
+    with transaction.atomic():
+        created = Event.objects.bulk_create(events, batch_size=BULK_CREATE_BATCH_SIZE)
+        EventAttendee.objects.bulk_create(
+            [
+                EventAttendee(event=event, user_id=client_id)
+                for event, client_id in zip(created, event_clients, strict=True)
+                if client_id
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        booked = [client_id for client_id in event_clients if client_id]
+        refresh_client_stats(booked)
+        invalidate_client_portal(booked)
+    return True, {"created": [event.pk for event in created], "skipped": skipped}
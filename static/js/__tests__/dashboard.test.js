@@ -363,3 +363,80 @@ describe('dashboard.js planner interactions', () => {
     submitSpy.mockRestore();
   });
 });
+
+describe('dashboard.js actions endpoint', () => {
+  const flushPromises = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+  const buildActionDom = () => {
+    document.body.innerHTML = `
+      <div class="kitlast-dashboard-content"
+        data-active-section="services"
+        data-week-offset="2"
+        data-action-url="/dashboard/actions/">
+        <section class="kitlast-content-section" data-section="services">
+          <div class="kitlast-category-board"><p>Ancien</p></div>
+          <div class="kitlast-modal" data-category-modal>
+            <form method="post" action="/dashboard/?section=services">
+              <input type="hidden" name="csrfmiddlewaretoken" value="csrf-token" />
+              <input type="hidden" name="action" value="add_category" />
+              <input type="text" name="name" value="Spa" />
+            </form>
+          </div>
+        </section>
+      </div>
+    `;
+  };
+
+  const submit = (form) => form.dispatchEvent(new Event('submit', { bubbles: true, cancelable: true }));
+
+  afterEach(() => {
+    delete global.fetch;
+  });
+
+  test('submits action forms to the endpoint and swaps the section fragment', async () => {
+    buildActionDom();
+    global.fetch = jest.fn().mockResolvedValue({
+      ok: true,
+      json: () =>
+        Promise.resolve({
+          success: true,
+          fragments: { services: '<div class="kitlast-category-board"><p>Spa</p></div>' },
+        }),
+    });
+    initializeDashboard();
+    const form = document.querySelector('[data-category-modal] form');
+    const key = form.querySelector('input[name="idempotency_key"]').value;
+
+    submit(form);
+    await flushPromises();
+
+    const [url, options] = global.fetch.mock.calls[0];
+    expect(url).toBe('/dashboard/actions/');
+    expect(options.headers['X-CSRFToken']).toBe('csrf-token');
+    expect(options.body.get('action')).toBe('add_category');
+    expect(options.body.get('idempotency_key')).toBe(key);
+    expect(options.body.get('week_offset')).toBe('2');
+    expect(document.querySelector('.kitlast-category-board').textContent).toBe('Spa');
+    expect(document.querySelector('[data-category-modal]').hasAttribute('hidden')).toBe(true);
+    expect(form.querySelector('input[name="idempotency_key"]').value).not.toBe(key);
+  });
+
+  test('keeps the modal open and reports validation errors', async () => {
+    buildActionDom();
+    global.fetch = jest.fn().mockResolvedValue({
+      ok: false,
+      json: () => Promise.resolve({ success: false, errors: { name: [{ message: 'Ce champ est obligatoire.' }] } }),
+    });
+    const alertSpy = jest.spyOn(window, 'alert').mockImplementation(() => {});
+    initializeDashboard();
+    const form = document.querySelector('[data-category-modal] form');
+
+    submit(form);
+    await flushPromises();
+
+    expect(alertSpy).toHaveBeenCalledWith('Ce champ est obligatoire.');
+    expect(document.querySelector('[data-category-modal]').hasAttribute('hidden')).toBe(false);
+    expect(document.querySelector('.kitlast-category-board').textContent).toBe('Ancien');
+    alertSpy.mockRestore();
+  });
+});
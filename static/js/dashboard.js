@@ -26,6 +26,7 @@ const initializeDashboard = () => {
       status: eventModal.querySelector('[data-event-field="status"]'),
       created_by: eventModal.querySelector('[data-event-field="created_by"]'),
       client: eventModal.querySelector('[data-event-field="client"]'),
+      occupancy: eventModal.querySelector('[data-event-field="occupancy"]'),
       eventId: eventModal.querySelector('[data-event-field="event-id"]'),
       description: eventModal.querySelector('[data-event-field="description"]'),
       deleteButton: eventModal.querySelector('[data-event-delete]'),
@@ -57,7 +58,7 @@ const initializeDashboard = () => {
     }
     : null;
   const plannerColumnsContainer = document.querySelector('.kitlast-planner__columns');
-  const plannerColumns = plannerColumnsContainer ? Array.from(plannerColumnsContainer.querySelectorAll('[data-planner-column]')) : [];
+  let plannerColumns = plannerColumnsContainer ? Array.from(plannerColumnsContainer.querySelectorAll('[data-planner-column]')) : [];
   const plannerButtons = document.querySelectorAll('[data-planner-action]');
   const todayButton = document.querySelector('[data-planner-action="today"]');
   const dayButton = document.querySelector('[data-planner-action="day"]');
@@ -170,6 +171,15 @@ const initializeDashboard = () => {
 
   const setActiveSection = (sectionName) => {
     if (!sectionContainer) return;
+    const target = Array.from(sections).find((section) => section.dataset.section === sectionName);
+    if (target && target.hasAttribute('data-section-deferred')) {
+      /* The server skipped this section's client queries; load the page on it. */
+      const url = new URL(window.location);
+      url.searchParams.set('section', sectionName);
+      url.searchParams.delete('show');
+      window.location.href = url.toString();
+      return;
+    }
     currentSection = sectionName;
     sectionContainer.setAttribute('data-active-section', sectionName);
     sections.forEach((section) => {
@@ -206,37 +216,40 @@ const initializeDashboard = () => {
     });
   });
 
-  // Open client modal in edit mode directly from table buttons
-  document.querySelectorAll('[data-open-client-detail]').forEach((button) => {
-    button.addEventListener('click', (event) => {
-      event.preventDefault();
-      const btn = event.currentTarget;
-      if (!clientModal) return;
-      const form = clientModal.querySelector('[data-client-form]');
-      if (!form) return;
+  /* Table buttons are delegated: the clients table is re-rendered after each action. */
+  const delegatedTarget = (event, selector) =>
+    event.target instanceof Element ? event.target.closest(selector) : null;
 
-      const firstName = form.querySelector('input[name="first_name"]');
-      const lastName = form.querySelector('input[name="last_name"]');
-      const email = form.querySelector('input[name="email"]');
-      const phone = form.querySelector('input[name="phone_number"]');
-      const actionInput = form.querySelector('[data-client-form-action]');
-      const clientIdInput = form.querySelector('[data-client-form-id]');
-
-      // populate fields from data attributes on the button
-      const fullName = btn.dataset.clientFullName || '';
-      const [first, ...rest] = fullName.trim().split(' ');
-      const last = rest.join(' ');
-      if (firstName) firstName.value = first || '';
-      if (lastName) lastName.value = last || '';
-      if (email) email.value = btn.dataset.clientEmail || '';
-      if (phone) phone.value = btn.dataset.clientPhone && btn.dataset.clientPhone !== '—' ? btn.dataset.clientPhone : '';
-      if (actionInput) actionInput.value = 'update_client';
-      if (clientIdInput) clientIdInput.value = btn.dataset.clientId || '';
-      if (clientModalTitle) clientModalTitle.textContent = 'Modifier un client';
-
-      // open the client modal (edit mode)
-      clientModalHandlers?.open();
-    });
+  // Open client modal in edit mode directly from table buttons
+  document.addEventListener('click', (event) => {
+    const btn = delegatedTarget(event, '[data-open-client-detail]');
+    if (!btn) return;
+    event.preventDefault();
+    if (!clientModal) return;
+    const form = clientModal.querySelector('[data-client-form]');
+    if (!form) return;
+
+    const firstName = form.querySelector('input[name="first_name"]');
+    const lastName = form.querySelector('input[name="last_name"]');
+    const email = form.querySelector('input[name="email"]');
+    const phone = form.querySelector('input[name="phone_number"]');
+    const actionInput = form.querySelector('[data-client-form-action]');
+    const clientIdInput = form.querySelector('[data-client-form-id]');
+
+    // populate fields from data attributes on the button
+    const fullName = btn.dataset.clientFullName || '';
+    const [first, ...rest] = fullName.trim().split(' ');
+    const last = rest.join(' ');
+    if (firstName) firstName.value = first || '';
+    if (lastName) lastName.value = last || '';
+    if (email) email.value = btn.dataset.clientEmail || '';
+    if (phone) phone.value = btn.dataset.clientPhone && btn.dataset.clientPhone !== '—' ? btn.dataset.clientPhone : '';
+    if (actionInput) actionInput.value = 'update_client';
+    if (clientIdInput) clientIdInput.value = btn.dataset.clientId || '';
+    if (clientModalTitle) clientModalTitle.textContent = 'Modifier un client';
+
+    // open the client modal (edit mode)
+    clientModalHandlers?.open();
   });
 
   // Wire up Edit button inside client detail modal (opens clientModal in edit mode)
@@ -280,15 +293,15 @@ const initializeDashboard = () => {
   const clientDeleteName = clientDeleteModal ? clientDeleteModal.querySelector('[data-client-delete-name]') : null;
   const clientDeleteIdInput = clientDeleteModal ? clientDeleteModal.querySelector('[data-client-delete-id]') : null;
 
-  document.querySelectorAll('[data-client-delete]').forEach((btn) => {
-    btn.addEventListener('click', (evt) => {
-      evt.preventDefault();
-      const id = btn.dataset.clientId;
-      const name = btn.dataset.clientFullName || '';
-      if (clientDeleteName) clientDeleteName.textContent = name;
-      if (clientDeleteIdInput) clientDeleteIdInput.value = id || '';
-      clientDeleteModalHandlers?.open();
-    });
+  document.addEventListener('click', (evt) => {
+    const btn = delegatedTarget(evt, '[data-client-delete]');
+    if (!btn) return;
+    evt.preventDefault();
+    const id = btn.dataset.clientId;
+    const name = btn.dataset.clientFullName || '';
+    if (clientDeleteName) clientDeleteName.textContent = name;
+    if (clientDeleteIdInput) clientDeleteIdInput.value = id || '';
+    clientDeleteModalHandlers?.open();
   });
 
   document.addEventListener('keydown', (event) => {
@@ -384,6 +397,9 @@ const initializeDashboard = () => {
     if (eventFieldMap.client) {
       eventFieldMap.client.textContent = data.client || fallback;
     }
+    if (eventFieldMap.occupancy) {
+      eventFieldMap.occupancy.textContent = data.occupancy || fallback;
+    }
     if (eventFieldMap.eventId) {
       eventFieldMap.eventId.value = data.event_id || '';
     }
@@ -606,6 +622,7 @@ const initializeDashboard = () => {
           status: card.dataset.eventStatus,
           created_by: card.dataset.eventCreatedBy,
           client: card.dataset.eventClient,
+          occupancy: card.dataset.eventOccupancy,
           event_id: card.dataset.eventId,
           start: card.dataset.eventStart,
           end: card.dataset.eventEnd,
@@ -652,6 +669,148 @@ const initializeDashboard = () => {
     });
   }
 
+  /* Drag-and-drop rescheduling: the server answers with the recomputed block only. */
+  const PLANNER_START_MINUTES = 8 * 60;
+  const PLANNER_SPAN_MINUTES = 12 * 60;
+  let draggedCard = null;
+  let dragOffsetMinutes = 0;
+  let resizeState = null;
+  let suppressNextCardClick = false;
+
+  const getCsrfToken = () => document.querySelector('input[name="csrfmiddlewaretoken"]')?.value || '';
+
+  const minutesFromTimelineY = (timeline, clientY) => {
+    const rect = timeline.getBoundingClientRect();
+    const clampedY = Math.min(Math.max(clientY, rect.top), rect.bottom);
+    const ratio = rect.height ? (clampedY - rect.top) / rect.height : 0;
+    return PLANNER_START_MINUTES + Math.round((ratio * PLANNER_SPAN_MINUTES) / SLOT_INTERVAL) * SLOT_INTERVAL;
+  };
+
+  const buildColumnDateTime = (column, minutes) => {
+    const date = parseColumnDate(column.dataset.plannerDate);
+    date.setHours(Math.floor(minutes / 60), minutes % 60, 0, 0);
+    return date;
+  };
+
+  const applyEventView = (card, view) => {
+    card.dataset.eventLabel = view.label;
+    card.dataset.eventDate = view.date;
+    card.dataset.eventTime = view.time;
+    card.dataset.eventStatus = view.status;
+    card.dataset.eventOccupancy = view.occupancy || '';
+    card.dataset.eventStart = view.start;
+    card.dataset.eventEnd = view.end;
+    card.style.top = `${view.top_pct}%`;
+    card.style.height = `${view.height_pct}%`;
+    const targetColumn = plannerColumns.find((column) => column.dataset.plannerDate === view.date);
+    const targetTimeline = targetColumn ? targetColumn.querySelector('.kitlast-planner__timeline') : null;
+    if (!targetTimeline) {
+      /* Moved outside the displayed week. */
+      card.remove();
+      return;
+    }
+    if (card.parentElement !== targetTimeline) {
+      targetTimeline.appendChild(card);
+    }
+  };
+
+  const submitEventMove = async (card, startDate, endDate) => {
+    const url = card.dataset.eventMoveUrl;
+    if (!url || typeof fetch !== 'function') return;
+    try {
+      const response = await fetch(url, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCsrfToken() },
+        body: JSON.stringify({
+          start_at: formatLocalDateTime(startDate),
+          end_at: endDate ? formatLocalDateTime(endDate) : null,
+        }),
+      });
+      const payload = await response.json();
+      if (!response.ok) {
+        window.alert(payload.error || 'Impossible de déplacer le rendez-vous.');
+        return;
+      }
+      applyEventView(card, payload.event);
+    } catch (error) {
+      window.alert('Impossible de déplacer le rendez-vous.');
+    }
+  };
+
+  if (plannerColumnsContainer) {
+    plannerColumnsContainer.addEventListener('dragstart', (evt) => {
+      const card = evt.target.closest ? evt.target.closest('[data-planner-event][data-event-move-url]') : null;
+      const timeline = card ? card.closest('.kitlast-planner__timeline') : null;
+      if (!card || !timeline || resizeState) {
+        if (resizeState) evt.preventDefault();
+        return;
+      }
+      draggedCard = card;
+      dragOffsetMinutes =
+        minutesFromTimelineY(timeline, evt.clientY) - minutesFromTimelineY(timeline, card.getBoundingClientRect().top);
+      if (evt.dataTransfer) {
+        evt.dataTransfer.effectAllowed = 'move';
+        evt.dataTransfer.setData('text/plain', card.dataset.eventId || '');
+      }
+    });
+
+    plannerColumnsContainer.addEventListener('dragover', (evt) => {
+      if (draggedCard && evt.target.closest('.kitlast-planner__timeline')) {
+        evt.preventDefault();
+      }
+    });
+
+    plannerColumnsContainer.addEventListener('drop', (evt) => {
+      const timeline = evt.target.closest('.kitlast-planner__timeline');
+      const column = evt.target.closest('[data-planner-column]');
+      if (!draggedCard || !timeline || !column) return;
+      evt.preventDefault();
+      const startMinutes = Math.max(
+        PLANNER_START_MINUTES,
+        minutesFromTimelineY(timeline, evt.clientY) - dragOffsetMinutes
+      );
+      submitEventMove(draggedCard, buildColumnDateTime(column, startMinutes), null);
+      draggedCard = null;
+    });
+
+    plannerColumnsContainer.addEventListener('dragend', () => {
+      draggedCard = null;
+    });
+
+    plannerColumnsContainer.addEventListener('pointerdown', (evt) => {
+      const handle = evt.target.closest('[data-planner-event-resize]');
+      if (!handle) return;
+      const card = handle.closest('[data-planner-event]');
+      const timeline = card ? card.closest('.kitlast-planner__timeline') : null;
+      const column = card ? card.closest('[data-planner-column]') : null;
+      if (!card || !timeline || !column) return;
+      evt.preventDefault();
+      resizeState = { card, timeline, column };
+    });
+
+    document.addEventListener('pointerup', (evt) => {
+      if (!resizeState) return;
+      const { card, timeline, column } = resizeState;
+      resizeState = null;
+      suppressNextCardClick = true;
+      const startMinutes = minutesFromTimelineY(timeline, card.getBoundingClientRect().top);
+      const endMinutes = Math.max(startMinutes + SLOT_INTERVAL, minutesFromTimelineY(timeline, evt.clientY));
+      submitEventMove(card, buildColumnDateTime(column, startMinutes), buildColumnDateTime(column, endMinutes));
+    });
+
+    plannerColumnsContainer.addEventListener(
+      'click',
+      (evt) => {
+        if (suppressNextCardClick) {
+          suppressNextCardClick = false;
+          evt.stopPropagation();
+        }
+      },
+      true
+    );
+  }
+
   if (newEventForm) {
     newEventForm.addEventListener('submit', () => {
       newEventModalHandlers?.close();
@@ -712,7 +871,225 @@ const initializeDashboard = () => {
       if (!eventFieldMap.eventId?.value) {
         return;
       }
-      eventDeleteForm.submit();
+      if (sendsThroughEndpoint(eventDeleteForm)) {
+        sendDashboardForm(eventDeleteForm);
+      } else {
+        eventDeleteForm.submit();
+      }
+    });
+  }
+
+  /* Client history: keyset-paginated list of a client's appointments, newest first. */
+  const clientHistoryModal = document.querySelector('[data-client-history-modal]');
+  const clientHistoryModalHandlers = attachModalHandlers(clientHistoryModal);
+  if (clientHistoryModal && window.fetch) {
+    const historyList = clientHistoryModal.querySelector('[data-client-history-list]');
+    const historyEmpty = clientHistoryModal.querySelector('[data-client-history-empty]');
+    const historyMore = clientHistoryModal.querySelector('[data-client-history-more]');
+    const historyName = clientHistoryModal.querySelector('[data-client-history-name]');
+    const historyDateFormat = new Intl.DateTimeFormat('fr-FR', { dateStyle: 'medium', timeStyle: 'short' });
+    let historyUrl = '';
+    let historyCursor = null;
+
+    const loadHistory = () => {
+      const url = historyCursor ? `${historyUrl}?after=${encodeURIComponent(historyCursor)}` : historyUrl;
+      fetch(url, { headers: { Accept: 'application/json' }, credentials: 'same-origin' })
+        .then((response) => (response.ok ? response.json() : { appointments: [], next: null }))
+        .then((payload) => {
+          (payload.appointments || []).forEach((appointment) => {
+            const item = document.createElement('li');
+            const status = appointment.status === 'canceled' ? ' (annulé)' : '';
+            item.textContent = `${historyDateFormat.format(new Date(appointment.start_at))} · ${appointment.title}${status}`;
+            historyList.appendChild(item);
+          });
+          historyCursor = payload.next || null;
+          if (historyMore) historyMore.hidden = !historyCursor;
+          if (historyEmpty) historyEmpty.hidden = historyList.children.length > 0;
+        })
+        .catch(() => {});
+    };
+
+    document.addEventListener('click', (event) => {
+      const button = delegatedTarget(event, '[data-client-history]');
+      if (!button) return;
+      event.preventDefault();
+      historyUrl = button.dataset.historyUrl || '';
+      historyCursor = null;
+      historyList.innerHTML = '';
+      if (historyName) historyName.textContent = button.dataset.clientFullName || '—';
+      if (historyMore) historyMore.hidden = true;
+      if (historyEmpty) historyEmpty.hidden = true;
+      clientHistoryModalHandlers?.open();
+      loadHistory();
+    });
+
+    historyMore?.addEventListener('click', (event) => {
+      event.preventDefault();
+      loadHistory();
+    });
+  }
+
+  /* Client autocomplete: refill the booking select from the server-side prefix index. */
+  const clientAutocompleteInput = newEventModal
+    ? newEventModal.querySelector('[data-client-autocomplete]')
+    : null;
+  const clientSelect = newEventFieldMap?.client;
+  if (clientAutocompleteInput && clientSelect && window.fetch) {
+    const initialOptions = Array.from(clientSelect.options).map((option) => option.cloneNode(true));
+    let autocompleteTimer = null;
+    let autocompleteRequest = 0;
+
+    const replaceClientOptions = (options) => {
+      const placeholder = initialOptions[0] ? initialOptions[0].cloneNode(true) : null;
+      clientSelect.innerHTML = '';
+      if (placeholder) clientSelect.appendChild(placeholder);
+      options.forEach((option) => clientSelect.appendChild(option));
+      clientSelect.disabled = clientSelect.options.length <= 1;
+      if (options.length === 1) {
+        clientSelect.value = options[0].value;
+      }
+      updateNewEventSubmitState();
+    };
+
+    const searchClients = (query) => {
+      const requestId = ++autocompleteRequest;
+      const url = `${clientAutocompleteInput.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`;
+      fetch(url, { headers: { Accept: 'application/json' }, credentials: 'same-origin' })
+        .then((response) => (response.ok ? response.json() : { results: [] }))
+        .then((payload) => {
+          if (requestId !== autocompleteRequest) return;
+          replaceClientOptions(
+            (payload.results || []).map((client) => {
+              const option = document.createElement('option');
+              option.value = client.id;
+              option.textContent = client.label;
+              return option;
+            }),
+          );
+        })
+        .catch(() => {});
+    };
+
+    clientAutocompleteInput.addEventListener('input', () => {
+      window.clearTimeout(autocompleteTimer);
+      const query = clientAutocompleteInput.value.trim();
+      if (!query) {
+        autocompleteRequest += 1;
+        replaceClientOptions(initialOptions.slice(1).map((option) => option.cloneNode(true)));
+        return;
+      }
+      autocompleteTimer = window.setTimeout(() => searchClients(query), 150);
+    });
+  }
+
+  /* Tag every dashboard write with a token so double submits are replayed server-side. */
+  const generateIdempotencyKey = () => {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+      return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+  };
+
+  const ensureIdempotencyKey = (form) => {
+    if (!form.querySelector('input[name="action"]') || form.querySelector('input[name="idempotency_key"]')) {
+      return;
+    }
+    const keyInput = document.createElement('input');
+    keyInput.type = 'hidden';
+    keyInput.name = 'idempotency_key';
+    keyInput.value = generateIdempotencyKey();
+    form.appendChild(keyInput);
+  };
+
+  document.querySelectorAll('form[method="post"]').forEach(ensureIdempotencyKey);
+
+  /* Dashboard actions go through the JSON endpoint, which answers with the affected section only. */
+  const actionUrl = sectionContainer ? sectionContainer.dataset.actionUrl : '';
+  const FRAGMENT_ROOTS = {
+    services: '.kitlast-category-board',
+    clients: '.kitlast-table-wrapper',
+    planning: '.kitlast-planner__columns',
+  };
+
+  const replaceFragment = (section, html) => {
+    const root = document.querySelector(FRAGMENT_ROOTS[section]);
+    if (!root) return;
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    const fresh = template.content.firstElementChild;
+    if (!fresh) return;
+    /* Keep the root element so listeners bound on it (planner drag and drop) survive. */
+    root.replaceChildren(...fresh.childNodes);
+    root.querySelectorAll('form[method="post"]').forEach(ensureIdempotencyKey);
+    if (section === 'planning') {
+      plannerColumns = Array.from(root.querySelectorAll('[data-planner-column]'));
+      if (currentViewMode === 'week' || !currentSingleColumn) {
+        showWeekView();
+      } else {
+        const date = currentSingleColumn.dataset.plannerDate;
+        showSingleDay(plannerColumns.find((column) => column.dataset.plannerDate === date), currentViewMode);
+      }
+    }
+  };
+
+  const describeFailure = (payload) => {
+    if (payload.message || payload.error) return payload.message || payload.error;
+    const errors = Object.values(payload.errors || {}).flat();
+    return errors.map((error) => error.message).filter(Boolean).join('\n') || 'Action impossible.';
+  };
+
+  const submitDashboardAction = async (form) => {
+    const body = new FormData(form);
+    body.set('week_offset', readWeekOffset().toString());
+    const response = await fetch(actionUrl, {
+      method: 'POST',
+      credentials: 'same-origin',
+      headers: { Accept: 'application/json', 'X-CSRFToken': getCsrfToken() },
+      body,
+    });
+    const payload = await response.json();
+    if (!response.ok) {
+      window.alert(describeFailure(payload));
+      return;
+    }
+    Object.entries(payload.fragments || {}).forEach(([section, html]) => replaceFragment(section, html));
+    const modal = form.closest('.kitlast-modal');
+    if (modal) {
+      closeModal(modal);
+      form.reset();
+    }
+    /* A new write needs a new key; the old one would replay this one. */
+    const keyInput = form.querySelector('input[name="idempotency_key"]');
+    if (keyInput) keyInput.value = generateIdempotencyKey();
+  };
+
+  /* Also used by the event delete button above, once initialisation has finished. */
+  const sendsThroughEndpoint = (form) =>
+    Boolean(
+      actionUrl &&
+        typeof fetch === 'function' &&
+        sectionContainer &&
+        sectionContainer.contains(form) &&
+        form.method.toLowerCase() === 'post' &&
+        form.querySelector('input[name="action"]')
+    );
+
+  const sendDashboardForm = (form) => {
+    ensureIdempotencyKey(form);
+    submitDashboardAction(form).catch(() => {
+      /* Fall back to the regular page submission; the key makes it safe. */
+      form.submit();
+    });
+  };
+
+  if (sectionContainer) {
+    sectionContainer.addEventListener('submit', (event) => {
+      const form = event.target;
+      if (event.defaultPrevented || !(form instanceof HTMLFormElement) || !sendsThroughEndpoint(form)) {
+        return;
+      }
+      event.preventDefault();
+      sendDashboardForm(form);
     });
   }
 
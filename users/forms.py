@@ -0,0 +1,17 @@
+"""Forms for the users app."""
+
+from django.contrib.auth.forms import PasswordResetForm
+
+from .models import User
+
+
+class EmailPasswordResetForm(PasswordResetForm):
+    """Password reset matching the address through the email index."""
+
+    def get_users(self, email):
+        """Return the active users with a usable password for ``email``."""
+        return (
+            user
+            for user in User.objects.filter_email(email).filter(is_active=True)
+            if user.has_usable_password()
+        )
@@ -0,0 +1,99 @@
+"""Compare partial-save validation against a full ``full_clean``.
+
+Runs inside a transaction that is rolled back, so it can be pointed at any
+database without leaving rows behind.
+"""
+
+import time
+from collections.abc import Callable
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from users.models import User
+
+
+def _full_clean_save(user: User, update_fields: list[str]) -> None:
+    """Save the way ``User.save`` did before the partial-save fast path."""
+    user.full_clean()
+    super(User, user).save(update_fields=update_fields)
+
+
+def _fast_save(user: User, update_fields: list[str]) -> None:
+    user.save(update_fields=update_fields)
+
+
+class Command(BaseCommand):
+    """Measure login and bulk-update throughput of ``User.save``."""
+
+    help = (
+        "Mesure le coût des sauvegardes partielles d'utilisateurs "
+        "(connexion, mise à jour en masse) avec et sans validation complète."
+    )
+
+    def add_arguments(self, parser):
+        """Register the number of users to benchmark."""
+        parser.add_argument("--users", type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        """Run each scenario with both strategies and print the results."""
+        with transaction.atomic():
+            clients = self._create_clients(options["users"])
+            scenarios: list[tuple[str, Callable[[User, int], list[str]]]] = [
+                ("connexion (last_login)", self._touch_last_login),
+                ("mise à jour (first_name)", self._rename),
+            ]
+            for label, mutate in scenarios:
+                for strategy, save in (
+                    ("full_clean", _full_clean_save),
+                    ("partielle", _fast_save),
+                ):
+                    queries, elapsed = self._run(clients, mutate, save)
+                    self.stdout.write(
+                        f"{label:<26} {strategy:<10} "
+                        f"{queries / len(clients):5.2f} requêtes/sauvegarde  "
+                        f"{len(clients) / elapsed:9.0f} sauvegardes/s"
+                    )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _create_clients(count: int) -> list[User]:
+        professional = User(
+            email="benchmark-pro@example.invalid",
+            user_type=User.UserType.PROFESSIONAL,
+        )
+        professional.set_unusable_password()
+        professional.save()
+        clients = [
+            User(
+                email=f"benchmark-{index}@example.invalid",
+                user_type=User.UserType.INDIVIDUAL,
+                linked_professional=professional,
+                password=professional.password,
+            )
+            for index in range(count)
+        ]
+        User.objects.bulk_create(clients)
+        # Reload without the cached professional, as a request would.
+        return list(User.objects.filter(linked_professional=professional))
+
+    @staticmethod
+    def _touch_last_login(user: User, index: int) -> list[str]:
+        user.last_login = timezone.now()
+        return ["last_login"]
+
+    @staticmethod
+    def _rename(user: User, index: int) -> list[str]:
+        user.first_name = f"Client {index}"
+        return ["first_name"]
+
+    @staticmethod
+    def _run(clients, mutate, save) -> tuple[int, float]:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for index, client in enumerate(clients):
+                save(client, mutate(client, index))
+            elapsed = time.perf_counter() - started
+        return len(queries), elapsed
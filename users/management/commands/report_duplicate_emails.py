@@ -0,0 +1,36 @@
+"""List the accounts whose emails only differ by case."""
+
+from django.core.management.base import BaseCommand
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    """Report the case variants blocking the unique ``Lower(email)`` index."""
+
+    help = (
+        "Liste les comptes dont les adresses e-mail ne diffèrent que par la "
+        "casse ; ils doivent être fusionnés avant la migration "
+        "users.0009_user_email_lower_unique."
+    )
+
+    def handle(self, *args, **options) -> None:
+        """Print each duplicated address with its accounts."""
+        duplicates = list(
+            User.objects.duplicate_emails().values_list("email_lower", flat=True)
+        )
+        if not duplicates:
+            self.stdout.write(self.style.SUCCESS("Aucune adresse en double."))
+            return
+        for email in duplicates:
+            accounts = User.objects.filter_email(email).order_by("pk")
+            self.stdout.write(
+                f"{email} : "
+                + ", ".join(
+                    f"#{user.pk} {user.email} ({user.get_user_type_display()})"
+                    for user in accounts
+                )
+            )
+        self.stdout.write(
+            self.style.WARNING(f"{len(duplicates)} adresse(s) en double.")
+        )
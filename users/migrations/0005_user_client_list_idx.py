@@ -0,0 +1,25 @@
+# pylint: disable=invalid-name
+"""Index the professional's client list for keyset pagination."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration adding the client list index."""
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0004_user_phone_number"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["linked_professional", "last_name", "first_name", "id"],
+                name="user_client_list_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# pylint: disable=invalid-name
+"""Index user emails on Lower(email) for case-insensitive lookups.
+
+The unique constraint on the same expression is only added by
+``0009_user_email_lower_unique``, once existing case variants have been
+lower-cased and duplicates resolved.
+"""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:31
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Index Lower(email) without enforcing uniqueness yet."""
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0005_user_client_list_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="user_email_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# pylint: disable=invalid-name
+"""Add the normalised phone key used for caller lookups."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add User.phone_key and its per-professional index."""
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0006_user_email_lower_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="phone_key",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["linked_professional", "phone_key"],
+                name="user_phone_lookup_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# pylint: disable=invalid-name
+"""Record when a client was anonymised by the retention command."""
+
+# Generated by Django 5.2.6 on 2026-10-19 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add User.anonymized_at."""
+
+    dependencies = [
+        ("users", "0007_user_phone_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="anonymized_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# pylint: disable=invalid-name
+"""Enforce case-insensitive email uniqueness once the data is clean.
+
+Apply the previous migrations, run ``python manage.py run_backfill
+user_email_lowercase`` and resolve the accounts listed by ``python manage.py
+report_duplicate_emails`` before this one: it stops with that list instead
+of failing halfway through the index build.
+"""
+
+# Generated by Django 5.2.6 on 2026-10-19 05:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_no_duplicate_emails(apps, schema_editor):
+    """Refuse to build the unique index while case variants remain."""
+    user_model = apps.get_model("users", "User")
+    duplicates = list(
+        user_model.objects.values(email_lower=Lower("email"))
+        .annotate(accounts=Count("pk"))
+        .filter(accounts__gt=1)
+        .values_list("email_lower", flat=True)[:10]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Adresses e-mail en double (à la casse près) : "
+            f"{', '.join(duplicates)}. Lancez `python manage.py "
+            "report_duplicate_emails` et fusionnez ces comptes avant de migrer."
+        )
+
+
+class Migration(migrations.Migration):
+    """Swap the Lower(email) index for the unique constraint."""
+
+    dependencies = [
+        ("users", "0008_user_anonymized_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_duplicate_emails, migrations.RunPython.noop),
+        migrations.RemoveIndex(model_name="user", name="user_email_lower_idx"),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="user_email_lower_unique",
+                violation_error_message="Un utilisateur avec cet email existe déjà.",
+            ),
+        ),
+    ]
@@ -4,14 +4,75 @@ from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+DEFAULT_PHONE_COUNTRY_CODE = "33"
+
+
+def email_key(email: str) -> str:
+    """Return the case-insensitive form of ``email`` used for lookups."""
+    return (email or "").strip().lower()
+
+
+def normalize_phone(number: str, country_code: str = DEFAULT_PHONE_COUNTRY_CODE) -> str:
+    """Return ``number`` in E.164 form (``+33612345678``), or "" if unusable.
+
+    National numbers (leading ``0`` or no prefix) get ``country_code``;
+    ``00`` and ``+`` prefixes are kept as international.
+    """
+    raw = (number or "").strip().replace("(0)", "")
+    digits = "".join(char for char in raw if char.isdigit())
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        digits = country_code + digits.removeprefix("0")
+    if not 8 <= len(digits) <= 15:
+        return ""
+    return f"+{digits}"
+
 
 class UserManager(BaseUserManager):
     """Custom manager to support email-based authentication."""
 
     use_in_migrations = True
 
+    @classmethod
+    def normalize_email(cls, email):
+        """Store addresses lower-cased so lookups match the stored value."""
+        return email_key(super().normalize_email(email))
+
+    def filter_email(self, email):
+        """Return users whose email matches ``email`` regardless of case.
+
+        The filter compares ``Lower("email")`` so the database answers it
+        with the ``Lower(email)`` index (``user_email_lower_unique``, or
+        ``user_email_lower_idx`` before migration 0009) instead of a scan.
+        """
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=email_key(email)
+        )
+
+    def duplicate_emails(self):
+        """Return the lower-cased emails shared by several accounts.
+
+        Each row holds ``email_lower`` and the number of ``accounts``; the
+        unique ``Lower(email)`` constraint cannot be added while any remain.
+        """
+        return (
+            self.values(email_lower=Lower("email"))
+            .annotate(accounts=Count("pk"))
+            .filter(accounts__gt=1)
+            .order_by("email_lower")
+        )
+
+    def get_by_natural_key(self, username):
+        """Resolve logins case-insensitively through the email index."""
+        return self.filter_email(username).get()
+
     def _create_user(self, email, password, **extra_fields):
         """Create and persist a user with the given credentials."""
         if not email:
@@ -35,6 +96,11 @@ class UserManager(BaseUserManager):
         return self._create_user(email, password, **extra_fields)
 
 
+# Fields whose update requires the database-backed validation steps.
+UNIQUE_CHECKED_FIELDS = frozenset({"email"})
+RELATIONSHIP_FIELDS = frozenset({"user_type", "linked_professional"})
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     """Application user based on email as the primary identifier."""
 
@@ -49,9 +115,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     first_name = models.CharField(max_length=150, blank=True)
     last_name = models.CharField(max_length=150, blank=True)
     phone_number = models.CharField(max_length=30, blank=True)
+    # E.164 form of phone_number, kept in sync by save() for caller lookups.
+    phone_key = models.CharField(max_length=16, blank=True, editable=False)
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     date_joined = models.DateTimeField(default=timezone.now)
+    # Set by the retention command once personal fields have been erased.
+    anonymized_at = models.DateTimeField(null=True, blank=True, editable=False)
     user_type = models.CharField(
         max_length=20,
         choices=UserType.choices,
@@ -71,6 +141,30 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    class Meta:
+        """Indexes backing email lookups and the professional's client list."""
+
+        constraints = [
+            # Case-insensitive uniqueness; also serves every email lookup.
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_lower_unique",
+                violation_error_message="Un utilisateur avec cet email existe déjà.",
+            )
+        ]
+        indexes = [
+            # Keyset pagination of a professional's clients.
+            models.Index(
+                fields=["linked_professional", "last_name", "first_name", "id"],
+                name="user_client_list_idx",
+            ),
+            # Caller identification by normalised phone number.
+            models.Index(
+                fields=["linked_professional", "phone_key"],
+                name="user_phone_lookup_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return a string representation of the user."""
         return str(self.email)
@@ -106,7 +200,42 @@ class User(AbstractBaseUser, PermissionsMixin):
                 {"linked_professional": "Le compte associé doit être professionnel."}
             )
 
+    def clean_update_fields(self, update_fields) -> None:
+        """Validate only what a partial save can change.
+
+        Field validators run for the updated fields. The email uniqueness
+        queries and the professional-link checks in ``clean`` only run when
+        one of the fields they depend on is updated, so frequent writes such
+        as ``last_login`` on login stay free of validation queries.
+        """
+        names = {self._meta.get_field(field).name for field in update_fields}
+        exclude = {
+            field.name
+            for field in self._meta.concrete_fields
+            if field.name not in names
+        }
+        self.clean_fields(exclude=exclude)
+        if names & UNIQUE_CHECKED_FIELDS:
+            self.validate_unique(exclude=exclude)
+            self.validate_constraints(exclude=exclude)
+        if names & RELATIONSHIP_FIELDS:
+            self.clean()
+
     def save(self, *args, **kwargs):
-        """Validate the user before saving."""
-        self.full_clean()
+        """Validate the user before saving.
+
+        Full saves run ``full_clean``; saves limited by ``update_fields`` run
+        ``clean_update_fields`` instead. ``phone_key`` is recomputed from
+        ``phone_number`` on every save.
+        """
+        self.phone_key = normalize_phone(self.phone_number)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.full_clean()
+        else:
+            update_fields = set(update_fields)
+            if "phone_number" in update_fields:
+                update_fields.add("phone_key")
+                kwargs["update_fields"] = update_fields
+            self.clean_update_fields(update_fields)
         return super().save(*args, **kwargs)
@@ -1,8 +1,15 @@
 """Tests for the users application."""
 
-from django.contrib.auth import get_user_model
+from io import StringIO
+
+from django.contrib.auth import authenticate, get_user_model
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.backfill import BACKFILLS, run_backfill
 
 
 class UserLinkedProfessionalTests(TestCase):
@@ -56,3 +63,112 @@ class UserLinkedProfessionalTests(TestCase):
         other_pro.linked_professional = client
         with self.assertRaises(ValidationError):
             other_pro.save()
+
+
+class UserPartialSaveTests(TestCase):
+    """Ensure partial saves only validate the fields they write."""
+
+    def setUp(self):
+        """Create a professional and a linked client."""
+        self.user_model = get_user_model()
+        self.professional = self.user_model.objects.create_user(
+            email="partial-pro@example.com",
+            password="safe-password",
+            user_type=self.user_model.UserType.PROFESSIONAL,
+        )
+        self.client_user = self.user_model.objects.create_user(
+            email="partial-client@example.com",
+            password="safe-password",
+            user_type=self.user_model.UserType.INDIVIDUAL,
+            linked_professional=self.professional,
+        )
+        self.client_user = self.user_model.objects.get(pk=self.client_user.pk)
+
+    def test_last_login_update_runs_a_single_query(self):
+        """Logging in only writes ``last_login`` without validation queries."""
+        self.client_user.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            self.client_user.save(update_fields=["last_login"])
+
+    def test_updated_fields_are_still_validated(self):
+        """Field validators still apply to the updated fields."""
+        self.client_user.first_name = "x" * 200
+        with self.assertRaises(ValidationError):
+            self.client_user.save(update_fields=["first_name"])
+
+    def test_email_update_checks_uniqueness(self):
+        """Updating the email keeps the uniqueness check."""
+        self.client_user.email = self.professional.email
+        with self.assertRaises(ValidationError):
+            self.client_user.save(update_fields=["email"])
+
+    def test_relationship_update_runs_clean(self):
+        """Updating the professional link keeps the relationship rules."""
+        self.client_user.linked_professional = None
+        with self.assertRaises(ValidationError):
+            self.client_user.save(update_fields=["linked_professional_id"])
+
+
+class UserEmailCaseTests(TestCase):
+    """Ensure emails are unique and looked up regardless of case."""
+
+    def setUp(self):
+        """Create a professional with a mixed-case stored email."""
+        self.user_model = get_user_model()
+        self.professional = self.user_model.objects.create_user(
+            email="case-pro@example.com",
+            password="safe-password",
+            user_type=self.user_model.UserType.PROFESSIONAL,
+        )
+        self.user_model.objects.filter(pk=self.professional.pk).update(
+            email="Case-Pro@Example.com"
+        )
+
+    def test_create_user_stores_lowercase_email(self):
+        """New accounts store the lookup form of their address."""
+        user = self.user_model.objects.create_user(
+            email="New.Pro@Example.COM",
+            password="safe-password",
+            user_type=self.user_model.UserType.PROFESSIONAL,
+        )
+        self.assertEqual(user.email, "new.pro@example.com")
+
+    def test_case_variant_is_rejected(self):
+        """An address differing only by case counts as a duplicate."""
+        with self.assertRaises(ValidationError):
+            self.user_model.objects.create_user(
+                email="CASE-PRO@example.com",
+                password="safe-password",
+                user_type=self.user_model.UserType.PROFESSIONAL,
+            )
+
+    def test_login_ignores_case(self):
+        """Authentication resolves the account whatever the typed case."""
+        self.assertEqual(
+            authenticate(email="CASE-pro@EXAMPLE.com", password="safe-password"),
+            self.professional,
+        )
+
+    def test_lookup_uses_the_lower_email_index(self):
+        """Email lookups are index seeks on ``Lower(email)``."""
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan format is SQLite-specific.")
+        plan = self.user_model.objects.filter_email("case-pro@example.com").explain()
+        self.assertIn("user_email_lower_unique", plan)
+
+    def test_backfill_lowercases_stored_emails(self):
+        """The chunked backfill rewrites the remaining mixed-case emails."""
+        checkpoint = run_backfill(BACKFILLS["user_email_lowercase"], chunk_size=1)
+
+        self.professional.refresh_from_db()
+        self.assertEqual(self.professional.email, "case-pro@example.com")
+        self.assertEqual(checkpoint.processed, 1)
+
+    def test_duplicate_report_is_empty_on_clean_data(self):
+        """The report lists nothing once every address is unique."""
+        out = StringIO()
+
+        call_command("report_duplicate_emails", stdout=out)
+
+        self.assertFalse(self.user_model.objects.duplicate_emails().exists())
+        self.assertIn("Aucune adresse en double", out.getvalue())